@@ -0,0 +1,49 @@
+"""
+Compare two saved benchmark results, e.g. from before and after a change.
+
+Usage: python -m backend.bench.compare results/search-closed-abc123-....json results/search-closed-def456-....json
+"""
+
+import argparse
+import json
+
+METRICS = [
+    ("throughput_rps", ("throughput_rps",), True),
+    ("goodput_rps", ("goodput_rps",), True),
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p95 ms", ("latency_ms", "p95"), False),
+    ("p99 ms", ("latency_ms", "p99"), False),
+    ("embedding hit ratio", ("cache_hit_ratio", "embeddings"), True),
+]
+
+
+def lookup(result: dict, path: tuple):
+    for key in path:
+        result = (result or {}).get(key)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark results")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{'':22}{baseline['revision']:>12}{candidate['revision']:>12}{'change':>10}")
+    for name, path, higher_is_better in METRICS:
+        before, after = lookup(baseline, path), lookup(candidate, path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        marker = "✅" if better or change == 0 else "⚠️"
+        print(f"{name:22}{before:12.2f}{after:12.2f}{change:+9.1f}% {marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Local stand-ins for the OpenAI and Pinecone endpoints the backend calls, with
+configurable latency distributions and error rates.
+
+Point the real clients at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1
+    PINECONE_HOST_URL=http://127.0.0.1:9100
+    PINECONE_CONTROLLER_HOST=http://127.0.0.1:9100
+
+Usage: python -m backend.bench.fake_upstreams --port 9100 --chat-ms 900
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+
+import numpy as np
+import uvicorn
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from common.load_tickers import load_ticker_metadata
+
+CORPUS_SIZE = 5000
+ANSWER = (
+    "- Management highlighted steady demand across regions.\n"
+    "- Spending stayed disciplined, with capital returned through buybacks.\n"
+    "- Guidance for next quarter was reiterated."
+)
+ROLES = [("CEO", "executive"), ("CFO", "executive"), ("Analyst", "analyst")]
+
+
+class Upstream:
+    """Lognormal latency around a median, plus a random error rate."""
+
+    def __init__(self, median_ms: float, sigma: float, error_rate: float):
+        self.median_s = median_ms / 1000
+        self.sigma = sigma
+        self.error_rate = error_rate
+
+    async def delay(self):
+        if self.median_s > 0:
+            await asyncio.sleep(self.median_s * random.lognormvariate(0, self.sigma))
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def vector_for(text: str, dims: int) -> np.ndarray:
+    """Deterministic unit vector per input, so repeated queries look identical."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    v = np.random.default_rng(seed).standard_normal(dims).astype("<f4")
+    return v / np.linalg.norm(v)
+
+
+def build_corpus() -> list[tuple[str, dict]]:
+    tickers = sorted(load_ticker_metadata())
+    rng = random.Random(0)
+    corpus = []
+    for i in range(CORPUS_SIZE):
+        company = rng.choice(tickers).lower()
+        quarter, year = f"q{rng.randint(1, 4)}", str(rng.randint(2021, 2025))
+        section = rng.choice(["prepared_remarks", "qa"])
+        names = [f"Speaker {rng.randint(1, 400)}" for _ in range(rng.randint(1, 3))]
+        roles = [rng.choice(ROLES) for _ in names]
+        chunk_id = f"{company}-{quarter}-{year}-{section}-{i}"
+        corpus.append(
+            (
+                chunk_id,
+                {
+                    "url": f"https://www.fool.com/earnings/{company}-{quarter}-{year}/",
+                    "section": section,
+                    "company": company,
+                    "quarter": quarter,
+                    "year": year,
+                    "call_ts": f"{year}-0{rng.randint(1, 9)}-15T17:00:00-04:00",
+                    "snippet": " ".join(["Lorem ipsum dolor sit amet."] * 15),
+                    "primary_names": names[:1],
+                    "primary_roles": [roles[0][0]],
+                    "primary_types": [roles[0][1]],
+                    "participant_names": names,
+                    "participant_roles": [r for r, _ in roles],
+                    "participant_types": [t for _, t in roles],
+                    "start_token": i * 200,
+                    "end_token": i * 200 + 180,
+                },
+            )
+        )
+    return corpus
+
+
+def create_app(
+    embeddings: Upstream, chat: Upstream, query: Upstream, dims: int = 1536
+) -> FastAPI:
+    app = FastAPI()
+    corpus = build_corpus()
+    lookup = dict(corpus)
+    stats = {
+        "embeddings": 0,
+        "chat": 0,
+        "chat_streamed_tokens": 0,
+        "query": 0,
+        "fetch": 0,
+    }
+
+    def error(status: int = 500):
+        return JSONResponse(
+            status_code=status, content={"error": {"message": "injected failure"}}
+        )
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    @app.post("/v1/embeddings")
+    async def create_embeddings(request: Request):
+        body = await request.json()
+        stats["embeddings"] += 1
+        await embeddings.delay()
+        if embeddings.should_fail():
+            return error(429)
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        width = body.get("dimensions") or dims
+        data = []
+        for i, text in enumerate(inputs):
+            v = vector_for(text, width)
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(v.tobytes()).decode("ascii")
+            else:
+                embedding = v.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        tokens = sum(len(t) // 4 + 1 for t in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body["model"],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.post("/v1/chat/completions")
+    async def create_chat_completion(request: Request):
+        body = await request.json()
+        stats["chat"] += 1
+        if body.get("stream"):
+            if chat.should_fail():
+                return error()
+            return StreamingResponse(
+                stream_completion(body["model"]), media_type="text/event-stream"
+            )
+        await chat.delay()
+        if chat.should_fail():
+            return error()
+        return {
+            "id": f"chatcmpl-{stats['chat']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": ANSWER},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 1500,
+                "completion_tokens": len(ANSWER.split()),
+                "total_tokens": 1500 + len(ANSWER.split()),
+            },
+        }
+
+    async def stream_completion(model: str):
+        # The median latency is spread over the tokens, like a real stream
+        tokens = [f" {word}" for word in ANSWER.split(" ")]
+        total = chat.median_s * random.lognormvariate(0, chat.sigma)
+        for i, token in enumerate(tokens):
+            await asyncio.sleep(total / len(tokens))
+            stats["chat_streamed_tokens"] += 1
+            chunk = {
+                "id": f"chatcmpl-{stats['chat']}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": token},
+                        "finish_reason": "stop" if i == len(tokens) - 1 else None,
+                    }
+                ],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.get("/indexes")
+    def list_indexes(request: Request):
+        host = f"{request.url.hostname}:{request.url.port}"
+        return {
+            "indexes": [
+                {
+                    "name": name,
+                    "dimension": dims,
+                    "metric": "cosine",
+                    "host": host,
+                    "spec": {"serverless": {"cloud": "aws", "region": "us-east-1"}},
+                    "status": {"ready": True, "state": "Ready"},
+                    "vector_type": "dense",
+                    "deletion_protection": "disabled",
+                }
+                for name in ("transcripts-v2", f"transcripts-v2-{dims}d")
+            ]
+        }
+
+    @app.post("/query")
+    async def query_vectors(request: Request):
+        body = await request.json()
+        stats["query"] += 1
+        await query.delay()
+        if query.should_fail():
+            return error()
+        seed = body.get("id") or str(body.get("vector", [])[:4])
+        rng = random.Random(seed)
+        picks = rng.sample(corpus, body.get("topK", 8))
+        matches = []
+        for rank, (chunk_id, metadata) in enumerate(picks):
+            match = {"id": chunk_id, "score": 0.9 - rank * 0.01}
+            if body.get("includeMetadata"):
+                match["metadata"] = metadata
+            if body.get("includeValues"):
+                match["values"] = vector_for(chunk_id, dims).tolist()
+            matches.append(match)
+        return {"matches": matches, "namespace": "", "usage": {"readUnits": 5}}
+
+    @app.get("/vectors/fetch")
+    async def fetch_vectors(request: Request):
+        stats["fetch"] += 1
+        await query.delay()
+        if query.should_fail():
+            return error()
+        ids = request.query_params.getlist("ids")
+        return {
+            "vectors": {
+                i: {
+                    "id": i,
+                    "values": vector_for(i, dims).tolist(),
+                    "metadata": lookup[i],
+                }
+                for i in ids
+                if i in lookup
+            },
+            "namespace": "",
+            "usage": {"readUnits": 1},
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI + Pinecone upstreams")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--embed-ms", type=float, default=80, help="Median latency")
+    parser.add_argument("--chat-ms", type=float, default=900, help="Median latency")
+    parser.add_argument("--query-ms", type=float, default=40, help="Median latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chat-error-rate", type=float, default=None)
+    args = parser.parse_args()
+
+    chat_error_rate = (
+        args.error_rate if args.chat_error_rate is None else args.chat_error_rate
+    )
+    app = create_app(
+        Upstream(args.embed_ms, args.sigma, args.error_rate),
+        Upstream(args.chat_ms, args.sigma, chat_error_rate),
+        Upstream(args.query_ms, args.sigma, args.error_rate),
+        dims=args.dims,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
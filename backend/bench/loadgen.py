@@ -0,0 +1,207 @@
+"""
+Load generator for the /search endpoint.
+
+Closed loop: `--concurrency` users each send the next request as soon as the
+previous one finishes. Open loop: requests arrive as a Poisson process at
+`--rate` per second regardless of how fast the server answers, which is what
+exposes queueing collapse under overload.
+
+Queries are drawn from the golden query set with a Zipf-like popularity skew;
+`--unique-ratio` of requests get a random suffix so they miss every cache.
+Throughput, latency percentiles, status codes and the server-side embedding
+cache hit ratio (from /metrics) are written as JSON to `backend/bench/results/`.
+
+Usage: python -m backend.bench.loadgen --url http://127.0.0.1:8000 --mode open --rate 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+
+import httpx
+
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+GOLDEN_QUERIES = REPO_ROOT / "scraper" / "scripts" / "golden_queries.json"
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float) -> dict:
+    ok = sorted(latency for latency, status in latencies if status == 200)
+    all_latencies = sorted(latency for latency, _ in latencies)
+    return {
+        "requests": len(latencies),
+        "duration_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "goodput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "latency_ms": {
+            f"p{q}": (percentile(all_latencies, q) or 0) * 1000 for q in (50, 95, 99)
+        },
+        "ok_latency_ms": {
+            f"p{q}": (percentile(ok, q) or 0) * 1000 for q in (50, 95, 99)
+        },
+    }
+
+
+class QueryMix:
+    def __init__(self, queries: list[str], unique_ratio: float, seed: int = 0):
+        self.queries = queries
+        self.unique_ratio = unique_ratio
+        self.rng = random.Random(seed)
+        self.weights = [1 / (rank + 1) for rank in range(len(queries))]
+
+    def next(self) -> str:
+        query = self.rng.choices(self.queries, weights=self.weights)[0]
+        if self.rng.random() < self.unique_ratio:
+            query = f"{query} ({self.rng.randint(0, 10**9)})"
+        return query
+
+
+async def send(client: httpx.AsyncClient, url: str, query: str, results: list):
+    start = time.perf_counter()
+    try:
+        resp = await client.post(f"{url}/search", json={"query": query})
+        status = resp.status_code
+    except httpx.HTTPError:
+        status = 0
+    results.append((time.perf_counter() - start, status))
+
+
+async def closed_loop(client, url, mix: QueryMix, concurrency: int, duration: float):
+    results = []
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await send(client, url, mix.next(), results)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return results
+
+
+async def open_loop(client, url, mix: QueryMix, rate: float, duration: float):
+    results = []
+    tasks = []
+    rng = random.Random(1)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        tasks.append(asyncio.create_task(send(client, url, mix.next(), results)))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    return results
+
+
+async def cache_counters(client: httpx.AsyncClient, url: str) -> Counter:
+    try:
+        counters = (await client.get(f"{url}/metrics")).json()["counters"]
+    except (httpx.HTTPError, KeyError, ValueError):
+        return Counter()
+    return Counter({k: v for k, v in counters.items() if k.startswith("cache.")})
+
+
+def hit_ratio(delta: Counter, name: str) -> float | None:
+    hits, misses = delta[f"cache.{name}.hit"], delta[f"cache.{name}.miss"]
+    return hits / (hits + misses) if hits + misses else None
+
+
+def git_revision() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True
+            ).strip()
+            or "unknown"
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_load(
+    url: str,
+    mode: str,
+    duration: float,
+    concurrency: int = 16,
+    rate: float = 20.0,
+    unique_ratio: float = 0.3,
+    timeout: float = 30.0,
+) -> dict:
+    with open(GOLDEN_QUERIES, "r", encoding="utf-8") as f:
+        mix = QueryMix(json.load(f), unique_ratio)
+    limits = httpx.Limits(max_connections=max(concurrency, 256))
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        before = await cache_counters(client, url)
+        start = time.perf_counter()
+        if mode == "closed":
+            results = await closed_loop(client, url, mix, concurrency, duration)
+        else:
+            results = await open_loop(client, url, mix, rate, duration)
+        elapsed = time.perf_counter() - start
+        after = await cache_counters(client, url)
+
+    delta = after - before
+    summary = summarize(results, Counter(status for _, status in results), elapsed)
+    summary["cache_hit_ratio"] = {
+        "embeddings": hit_ratio(delta, "embeddings"),
+        "llm": hit_ratio(delta, "llm"),
+    }
+    summary["config"] = {
+        "mode": mode,
+        "duration_s": duration,
+        "concurrency": concurrency if mode == "closed" else None,
+        "rate_rps": rate if mode == "open" else None,
+        "unique_ratio": unique_ratio,
+    }
+    return summary
+
+
+def save_results(summary: dict, label: str) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    revision = git_revision()
+    ts = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H-%M-%S")
+    path = RESULTS_DIR / f"{label}-{revision}-{ts}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"revision": revision, "label": label, **summary}, f, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for /search")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mode", choices=["open", "closed"], default="closed")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=20, help="Open-loop req/s")
+    parser.add_argument("--unique-ratio", type=float, default=0.3)
+    parser.add_argument("--label", default="search")
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        run_load(
+            args.url,
+            args.mode,
+            args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            unique_ratio=args.unique_ratio,
+        )
+    )
+    print(json.dumps(summary, indent=2))
+    print(f"📝 Saved results to {save_results(summary, args.label)}")
+
+
+if __name__ == "__main__":
+    main()
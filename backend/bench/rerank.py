@@ -0,0 +1,53 @@
+"""
+Micro-benchmark for the MMR re-rank on a realistic overfetch: 40 candidates
+at the configured embedding width, spread over a few transcripts, picked
+down to 8. Exits non-zero if the median exceeds the budget.
+
+Usage (from the repo root): python -m backend.bench.rerank --candidates 40
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from common.embedding import EMBEDDING_DIMENSIONS
+from backend.src.services.rerank import mmr
+
+BUDGET_MS = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MMR re-rank micro-benchmark")
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--dims", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--transcripts", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dims).astype(np.float32)
+    candidates = rng.standard_normal((args.candidates, args.dims)).astype(np.float32)
+    groups = [f"t{i % args.transcripts}" for i in range(args.candidates)]
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        mmr(query, candidates, args.k, groups=groups)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(
+        f"mmr {args.candidates}x{args.dims} -> {args.k}: "
+        f"p50 {p50:.3f} ms, p99 {p99:.3f} ms (budget {BUDGET_MS} ms)"
+    )
+    if p50 > BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+End-to-end benchmark: starts the fake upstreams and the real backend (pointed at
+them), runs closed- and open-loop load, and saves one JSON result per run to
+`backend/bench/results/` for comparison between commits.
+
+Usage (from the repo root): python -m backend.bench.run_bench --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from contextlib import contextmanager
+from pathlib import Path
+
+from .loadgen import run_load, save_results
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+@contextmanager
+def process(args: list[str], env: dict, ready_url: str):
+    proc = subprocess.Popen(args, cwd=REPO_ROOT, env=env)
+    try:
+        wait_for(ready_url)
+        yield proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def upstream_env(upstream_port: int) -> dict:
+    upstream = f"http://127.0.0.1:{upstream_port}"
+    return {
+        **os.environ,
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{upstream}/v1",
+        "PINECONE_DEFAULT_API_KEY": "bench",
+        "PINECONE_HOST_URL": upstream,
+        "PINECONE_CONTROLLER_HOST": upstream,
+    }
+
+
+@contextmanager
+def fake_upstreams(port: int, extra_args: list[str]):
+    args = [sys.executable, "-m", "backend.bench.fake_upstreams", "--port", str(port)]
+    with process(args + extra_args, dict(os.environ), f"http://127.0.0.1:{port}/stats"):
+        yield
+
+
+@contextmanager
+def backend(port: int, upstream_port: int, workers: int = 1, env: dict = None):
+    args = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.src.main:app",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+    ]
+    env = {
+        **upstream_env(upstream_port),
+        "NEEDLE_WORKERS": str(workers),
+        **(env or {}),
+    }
+    with process(args, env, f"http://127.0.0.1:{port}/healthz"):
+        yield f"http://127.0.0.1:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run /search benchmarks")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, default=40)
+    parser.add_argument("--unique-ratio", type=float, default=0.3)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--upstream-arg",
+        action="append",
+        default=[],
+        help="Extra fake_upstreams flag, e.g. --upstream-arg=--chat-ms=1500",
+    )
+    args = parser.parse_args()
+
+    with fake_upstreams(args.upstream_port, args.upstream_arg):
+        with backend(args.port, args.upstream_port) as url:
+            for mode in ("closed", "open"):
+                summary = asyncio.run(
+                    run_load(
+                        url,
+                        mode,
+                        args.duration,
+                        concurrency=args.concurrency,
+                        rate=args.rate,
+                        unique_ratio=args.unique_ratio,
+                    )
+                )
+                path = save_results(summary, f"search-{mode}")
+                print(
+                    f"{mode:>6}: {summary['throughput_rps']:.1f} req/s, "
+                    f"p50={summary['latency_ms']['p50']:.0f}ms "
+                    f"p95={summary['latency_ms']['p95']:.0f}ms "
+                    f"p99={summary['latency_ms']['p99']:.0f}ms, "
+                    f"status={summary['status_codes']}, "
+                    f"embedding hit ratio={summary['cache_hit_ratio']['embeddings']}"
+                )
+                print(f"        saved {path}")
+
+
+if __name__ == "__main__":
+    main()
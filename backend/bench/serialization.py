@@ -0,0 +1,109 @@
+"""
+Bytes on the wire and serialization time for a typical /search response
+(an answer and 8 excerpts), comparing FastAPI's default encoding with
+`ModelResponse`, a sparse `fields=` selection and gzip.
+
+Usage (from the repo root): python -m backend.bench.serialization --runs 2000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.src.model.searchQuery import Filter
+from backend.src.model.searchResponse import SearchResponse, Snippet
+from backend.src.responses import GZIP_LEVEL, ModelResponse, parse_fields
+
+# What the results list renders before an excerpt is expanded
+CARD_FIELDS = "answer,snippets.chunk_id,snippets.company,snippets.quarter,snippets.year,snippets.text"
+# Varied enough that gzip sees text like real excerpts, not a repeated phrase
+WORDS = (
+    "we saw strong revenue growth in services this quarter driven by record "
+    "installed base and double digit gains across emerging markets while "
+    "gross margin expanded on favorable mix offset partly by foreign exchange "
+    "headwinds and we expect june quarter revenue to grow low single digits "
+    "year over year with supply constraints easing as demand for iphone "
+    "remained resilient and our ai roadmap continues to progress"
+).split()
+
+
+def sample_response() -> SearchResponse:
+    rng = random.Random(0)
+    snippets = [
+        Snippet(
+            chunk_id=f"aapl-q{n % 4 + 1}-2024-qa-{n}",
+            company="aapl",
+            quarter=f"q{n % 4 + 1}",
+            year="2024",
+            url="https://www.fool.com/earnings/call-transcripts/2024/05/02/apple-aapl-q2-2024-earnings-call-transcript/",
+            participants={
+                "Tim Cook": "CEO",
+                "Luca Maestri": "CFO",
+                "Suhasini Chandramouli": "Investor Relations",
+                "Erik Woodring": "Analyst",
+                "Operator": "Operator",
+            },
+            section="qa",
+            text=" ".join(rng.choice(WORDS) for _ in range(90))[:500],
+        )
+        for n in range(8)
+    ]
+    return SearchResponse(
+        answer=" ".join(rng.choice(WORDS) for _ in range(50)),
+        snippets=snippets,
+        inferred_filters=Filter(company="aapl", year="2024"),
+    )
+
+
+def fastapi_default(response: SearchResponse) -> bytes:
+    # What FastAPI does for a returned model: validate, encode, json.dumps
+    validated = SearchResponse.model_validate(response.model_dump())
+    return json.dumps(
+        jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def timed(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response encoding benchmark")
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    response = sample_response()
+    include = parse_fields(CARD_FIELDS, SearchResponse)
+    encoders = {
+        "fastapi default": lambda: fastapi_default(response),
+        "ModelResponse": lambda: ModelResponse(response).body,
+        "ModelResponse, fields=cards": lambda: ModelResponse(response, include).body,
+    }
+    print(f"{'encoding':<30} {'bytes':>7} {'gzip':>7} {'encode us':>10} {'gzip us':>8}")
+    for name, encode in encoders.items():
+        body = encode()
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        encode_us = timed(encode, args.runs)
+        gzip_us = timed(
+            lambda: gzip.compress(body, compresslevel=GZIP_LEVEL), args.runs
+        )
+        print(
+            f"{name:<30} {len(body):>7} {len(compressed):>7} "
+            f"{encode_us:>10.1f} {gzip_us:>8.1f}"
+        )
+    body = encoders["ModelResponse"]()
+    for level in (1, 6, 9):
+        size = len(gzip.compress(body, compresslevel=level))
+        us = timed(lambda: gzip.compress(body, compresslevel=level), args.runs)
+        print(f"gzip level {level}: {size} bytes, {us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
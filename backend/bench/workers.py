@@ -0,0 +1,71 @@
+"""
+Single- vs multi-worker throughput. Upstreams are fast and rate limits are
+lifted so the backend's own CPU work is the bottleneck; each worker count gets
+a closed-loop run saved as `workers-<n>` in `backend/bench/results/`.
+
+The embedding cache hit ratio comes from whichever worker answers /metrics, so
+with several workers it is only a sample.
+
+Usage (from the repo root): python -m backend.bench.workers --workers 1 4
+"""
+
+import argparse
+import asyncio
+import os
+
+from .loadgen import run_load, save_results
+from .run_bench import backend, fake_upstreams
+
+FAST_UPSTREAMS = ["--embed-ms=5", "--chat-ms=20", "--query-ms=5"]
+UNLIMITED = {
+    "OPENAI_EMBEDDING_RPM": "1000000000",
+    "OPENAI_EMBEDDING_TPM": "1000000000",
+    "OPENAI_CHAT_RPM": "1000000000",
+    "OPENAI_CHAT_TPM": "1000000000",
+    "OPENAI_EMBEDDING_CONCURRENCY": "256",
+    "OPENAI_CHAT_CONCURRENCY": "256",
+    "PINECONE_CONCURRENCY": "256",
+    "ADMISSION_MAX_QUEUE": "1024",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare worker counts")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1]
+    )
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--unique-ratio", type=float, default=0.3)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--cache-backend", default="shm", choices=["shm", "lru"])
+    args = parser.parse_args()
+
+    env = {**UNLIMITED, "EMBEDDING_CACHE_BACKEND": args.cache_backend}
+    with fake_upstreams(args.upstream_port, FAST_UPSTREAMS):
+        for workers in args.workers:
+            with backend(args.port, args.upstream_port, workers, env) as url:
+                summary = asyncio.run(
+                    run_load(
+                        url,
+                        "closed",
+                        args.duration,
+                        concurrency=args.concurrency,
+                        unique_ratio=args.unique_ratio,
+                    )
+                )
+            summary["config"]["workers"] = workers
+            summary["config"]["cache_backend"] = args.cache_backend
+            path = save_results(summary, f"workers-{workers}")
+            print(
+                f"{workers:>3} workers: {summary['throughput_rps']:.1f} req/s, "
+                f"p50={summary['latency_ms']['p50']:.0f}ms "
+                f"p99={summary['latency_ms']['p99']:.0f}ms, "
+                f"status={summary['status_codes']}"
+            )
+            print(f"             saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import metrics
+
+# Requests whose query embedding is already cached jump ahead of cold ones
+PRIORITY_CACHED = 0
+PRIORITY_DEFAULT = 1
+
+# Defaults match OpenAI usage tier 1 for the models we call; override per deploy
+OPENAI_EMBEDDING_RPM = int(os.getenv("OPENAI_EMBEDDING_RPM", "3000"))
+OPENAI_EMBEDDING_TPM = int(os.getenv("OPENAI_EMBEDDING_TPM", "1000000"))
+OPENAI_CHAT_RPM = int(os.getenv("OPENAI_CHAT_RPM", "500"))
+OPENAI_CHAT_TPM = int(os.getenv("OPENAI_CHAT_TPM", "200000"))
+OPENAI_EMBEDDING_CONCURRENCY = int(os.getenv("OPENAI_EMBEDDING_CONCURRENCY", "16"))
+OPENAI_CHAT_CONCURRENCY = int(os.getenv("OPENAI_CHAT_CONCURRENCY", "8"))
+PINECONE_CONCURRENCY = int(os.getenv("PINECONE_CONCURRENCY", "16"))
+PINECONE_QPS = float(os.getenv("PINECONE_QPS", "0"))  # 0 disables rate limiting
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_MAX_WAIT_S = float(os.getenv("ADMISSION_MAX_WAIT_S", "5"))
+# Set by `serve.py`; the limits above are per deploy, so each worker gets a share
+NEEDLE_WORKERS = int(os.getenv("NEEDLE_WORKERS", "1"))
+
+
+class OverloadedError(Exception):
+    """Raised when an upstream's wait queue is full or the wait would be too long."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} is overloaded, retry after {retry_after:.1f}s")
+        self.upstream = upstream
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for rate budgeting
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking: `reserve`
+    deducts immediately (the balance may go negative) and returns how long the
+    caller must wait before its tokens are actually available.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, n: float = 1) -> float:
+        self._refill()
+        self.tokens -= n
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self, n: float = 1):
+        self.tokens = min(self.capacity, self.tokens + n)
+
+
+class UpstreamLimiter:
+    """
+    Per-upstream admission control for the event loop: at most
+    `max_concurrency` calls in flight, optional request/token rate limits, and a
+    bounded priority wait queue. Callers that cannot be admitted within
+    `max_wait` seconds (or find the queue full) get an OverloadedError right away
+    instead of piling onto a struggling upstream.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_wait: float = ADMISSION_MAX_WAIT_S,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.requests = TokenBucket(rpm / 60, max(1, rpm / 60)) if rpm else None
+        self.tokens = TokenBucket(tpm / 60, tpm / 60) if tpm else None
+        self.in_flight = 0
+        self.queued = 0
+        self.avg_service_time = 0.5  # seconds, EWMA of slot hold times
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        metrics.register_gauge(f"admission.{name}.in_flight", lambda: self.in_flight)
+        metrics.register_gauge(f"admission.{name}.queue_depth", lambda: self.queued)
+
+    def retry_after(self) -> float:
+        backlog = self.queued + self.in_flight
+        return backlog * self.avg_service_time / self.max_concurrency
+
+    def _reject(self, reason: str, retry_after: float):
+        metrics.incr(f"admission.{self.name}.rejected.{reason}")
+        raise OverloadedError(self.name, retry_after)
+
+    async def _acquire_slot(self, priority: int):
+        if self.in_flight < self.max_concurrency and not self.queued:
+            self.in_flight += 1
+            return
+        if self.queued >= self.max_queue:
+            self._reject("queue_full", self.retry_after())
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.queued += 1
+        try:
+            await asyncio.wait_for(fut, timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed to us just as we gave up; pass it on
+                self.release()
+            else:
+                fut.cancel()
+                self.queued -= 1
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject("timeout", self.retry_after())
+
+    def _reserve_rate(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > self.max_wait:
+            if self.requests:
+                self.requests.refund(1)
+            if self.tokens and tokens:
+                self.tokens.refund(tokens)
+            self.release()
+            self._reject("rate_limited", wait)
+        return wait
+
+    async def acquire(self, priority: int = PRIORITY_DEFAULT, tokens: int = 0):
+        await self._acquire_slot(priority)
+        wait = self._reserve_rate(tokens)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+        metrics.incr(f"admission.{self.name}.admitted")
+
+    def release(self):
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            # Hand the slot straight to the next waiter; in_flight is unchanged
+            self.queued -= 1
+            fut.set_result(None)
+            return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_DEFAULT, tokens: int = 0):
+        await self.acquire(priority, tokens)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * elapsed
+            self.release()
+
+
+def build_limiters(workers: int = NEEDLE_WORKERS) -> Dict[str, UpstreamLimiter]:
+    def share(limit: float) -> float:
+        return limit / workers
+
+    def share_concurrency(limit: int) -> int:
+        return max(1, math.ceil(limit / workers))
+
+    return {
+        "openai_embeddings": UpstreamLimiter(
+            "openai_embeddings",
+            share_concurrency(OPENAI_EMBEDDING_CONCURRENCY),
+            rpm=share(OPENAI_EMBEDDING_RPM),
+            tpm=share(OPENAI_EMBEDDING_TPM),
+        ),
+        "openai_chat": UpstreamLimiter(
+            "openai_chat",
+            share_concurrency(OPENAI_CHAT_CONCURRENCY),
+            rpm=share(OPENAI_CHAT_RPM),
+            tpm=share(OPENAI_CHAT_TPM),
+        ),
+        "pinecone": UpstreamLimiter(
+            "pinecone",
+            share_concurrency(PINECONE_CONCURRENCY),
+            rpm=share(PINECONE_QPS * 60) if PINECONE_QPS else None,
+        ),
+    }
@@ -0,0 +1,160 @@
+import math
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .metrics import metrics
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RECOVERY_TIMEOUT_S = float(os.getenv("BREAKER_RECOVERY_TIMEOUT_S", "30"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker. After `failure_threshold` consecutive failures
+    (or calls slower than `slow_call_threshold` seconds) the circuit opens and
+    calls fail immediately. Once `recovery_timeout` has passed, up to
+    `half_open_max_calls` probe calls are let through: a success closes the
+    circuit again, a failure re-opens it.
+
+    Used from both the event loop and threadpool workers, so state changes are
+    guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = BREAKER_RECOVERY_TIMEOUT_S,
+        half_open_max_calls: int = 1,
+        slow_call_threshold: Optional[float] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_threshold = slow_call_threshold
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        metrics.register_gauge(f"breaker.{name}.state", lambda: STATE_CODES[self.state])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(HALF_OPEN)
+            self._probes = 0
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        self._state = state
+        metrics.incr(f"breaker.{self.name}.{state}")
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+
+    def _retry_after(self) -> float:
+        return self._opened_at + self.recovery_timeout - time.monotonic()
+
+    def check(self):
+        """Fail fast if the circuit is open, without reserving a probe."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN:
+                metrics.incr(f"breaker.{self.name}.short_circuited")
+                raise CircuitOpenError(self.name, self._retry_after())
+
+    def _before_call(self):
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN or (
+                self._state == HALF_OPEN and self._probes >= self.half_open_max_calls
+            ):
+                metrics.incr(f"breaker.{self.name}.short_circuited")
+                raise CircuitOpenError(self.name, max(self._retry_after(), 1))
+            if self._state == HALF_OPEN:
+                self._probes += 1
+
+    def record_success(self, elapsed: float = 0.0):
+        if self.slow_call_threshold is not None and elapsed > self.slow_call_threshold:
+            metrics.incr(f"breaker.{self.name}.slow_calls")
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            metrics.incr(f"breaker.{self.name}.failures")
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def _release_probe(self):
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one upstream call. Exceptions count as failures and are re-raised;
+        cancellation counts as neither and just frees a half-open probe.
+        """
+        self._before_call()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self.record_success(time.monotonic() - start)
+
+
+def build_breakers() -> Dict[str, CircuitBreaker]:
+    return {
+        "openai_embeddings": CircuitBreaker(
+            "openai_embeddings",
+            slow_call_threshold=float(os.getenv("BREAKER_SLOW_EMBEDDING_S", "5")),
+        ),
+        "pinecone": CircuitBreaker(
+            "pinecone",
+            slow_call_threshold=float(os.getenv("BREAKER_SLOW_PINECONE_S", "3")),
+        ),
+        "openai_chat": CircuitBreaker(
+            "openai_chat",
+            slow_call_threshold=float(os.getenv("BREAKER_SLOW_CHAT_S", "15")),
+        ),
+    }
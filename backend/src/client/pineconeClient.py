@@ -1,16 +1,66 @@
 import os
 import time
 
+from typing import Dict, List, Optional
+
 from dotenv import load_dotenv
 from logging import Logger
 from pinecone import Pinecone, ServerlessSpec
 
+from common.embedding import EMBEDDING_DIMENSIONS, index_name_for
+from common.periods import fiscal_ordinal, parse_quarter, range_bound
 from ..model.pineconeQueryResponse import PineconeSearchResult
+from ..model.searchQuery import Filter
 
 load_dotenv()
 
+# PINECONE_HOST_URL must point at the index matching EMBEDDING_DIMENSIONS
 HOST_URL = os.getenv("PINECONE_HOST_URL")
-INDEX_NAME = "transcripts-v2"
+INDEX_NAME = index_name_for("transcripts-v2")
+
+
+def one_or_any(value: str | list[str]):
+    if isinstance(value, list):
+        return value[0] if len(value) == 1 else {"$in": value}
+    return value
+
+
+def build_filter(filters: Optional[Filter]) -> dict:
+    """Compile a Filter into a Pinecone metadata filter, in a single query."""
+    f = {}
+    if not filters:
+        return f
+    if filters.company:
+        f["company"] = one_or_any(filters.company)
+    quarters = filters.quarter
+    if isinstance(quarters, str):
+        quarters = [quarters]
+    if quarters and len(quarters) == 1:
+        # Stored as "q1" alongside a separate "year" field
+        f["quarter"], f["year"] = parse_quarter(quarters[0])
+    elif quarters:
+        # Quarter and year can't be matched as pairs, their ordinal can
+        f["fiscal_ordinal"] = {
+            "$in": [fiscal_ordinal(*parse_quarter(q)) for q in quarters]
+        }
+    elif filters.year:
+        f["year"] = one_or_any(filters.year)
+    if filters.section:
+        f["section"] = filters.section
+    if filters.speaker:
+        speakers = filters.speaker
+        if isinstance(speakers, str):
+            speakers = [speakers]
+        f["primary_names"] = {"$in": speakers}
+    if filters.role:
+        f["primary_roles"] = {"$in": [filters.role]}
+    if filters.date_from:
+        field, value = range_bound(filters.date_from)
+        f.setdefault(field, {})["$gte"] = value
+    if filters.date_to:
+        field, value = range_bound(filters.date_to, end=True)
+        f.setdefault(field, {})["$lte"] = value
+    return f
 
 
 class PineconeClient:
@@ -25,7 +75,7 @@ class PineconeClient:
             pc.create_index(
                 name=index_name,
                 vector_type="dense",
-                dimension=1536,
+                dimension=EMBEDDING_DIMENSIONS,
                 metric="cosine",
                 spec=ServerlessSpec(cloud="aws", region="us-east-1"),
                 deletion_protection="disabled",
@@ -38,28 +88,22 @@ class PineconeClient:
         )
         return index
 
-    def query_search(self, query_embedding, filters) -> list[PineconeSearchResult]:
+    def query_search(
+        self,
+        query_embedding,
+        filters,
+        include_metadata: bool = True,
+        top_k: int = 8,
+        include_values: bool = False,
+    ) -> list[PineconeSearchResult]:
         start = time.perf_counter()
 
-        def build_filter(filters):
-            f = {}
-            if not filters:
-                return f
-            if filters.company:
-                f["company"] = filters.company
-            if filters.quarter:
-                quarter, year = filters.quarter.split(" ")
-                f["quarter"] = quarter.lstrip("Q")
-                f["year"] = year
-            if filters.section:
-                f["section"] = filters.section
-            return f
-
         result = self.index.query(
-            vector=query_embedding,
-            top_k=8,
-            include_metadata=True,
-            include_values=False,
+            # The SDK only accepts plain lists, so convert at the boundary
+            vector=query_embedding.tolist(),
+            top_k=top_k,
+            include_metadata=include_metadata,
+            include_values=include_values,
             filter=build_filter(filters),
         )
         request_time = time.perf_counter() - start
@@ -68,3 +112,30 @@ class PineconeClient:
             extra={"result_count": len(result.matches), "request_time": request_time},
         )
         return result
+
+    def query_similar(self, chunk_id: str, top_k: int, include_metadata: bool = True):
+        """Nearest neighbours of a stored vector, looked up by its ID."""
+        start = time.perf_counter()
+        result = self.index.query(
+            id=chunk_id,
+            top_k=top_k,
+            include_metadata=include_metadata,
+            include_values=False,
+        )
+        request_time = time.perf_counter() - start
+        self.logger.info(
+            "Pinecone similar query returned",
+            extra={"result_count": len(result.matches), "request_time": request_time},
+        )
+        return result
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, dict]:
+        """Metadata for the stored vectors among `ids`, in one batched fetch."""
+        start = time.perf_counter()
+        result = self.index.fetch(ids=ids)
+        request_time = time.perf_counter() - start
+        self.logger.info(
+            "Pinecone fetch returned",
+            extra={"result_count": len(result.vectors), "request_time": request_time},
+        )
+        return {i: v.metadata or {} for i, v in result.vectors.items()}
@@ -1,29 +1,96 @@
+import asyncio
+import hmac
+import os
 import time
 
-from fastapi import HTTPException, FastAPI, Request, Response, status
+from fastapi import HTTPException, FastAPI, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAIError
 
+from .admission import (
+    PRIORITY_CACHED,
+    PRIORITY_DEFAULT,
+    OverloadedError,
+    build_limiters,
+    estimate_tokens,
+)
 from .cache import LRUCache
+from .circuit_breaker import CircuitOpenError, build_breakers
 from .logger import get_logger
-from .services.openai_service import fetch_embeddings, generate_llm_response
-from .services.pinecone_service import query_index
+from .metrics import metrics
+from .profiler import (
+    ProfiledRequests,
+    ProfilingMiddleware,
+    StackSampler,
+    render_collapsed,
+)
+from .responses import GZIP_LEVEL, GZIP_MIN_BYTES, ModelResponse, parse_fields
+from .shm_cache import SharedEmbeddingCache, build_embedding_cache
+from .services.answer_cache import get_stale_answer, store_answer
+from .services.catalog import is_navigational, load_catalog
+from .services.context import (
+    CONTEXT_CACHE_TRANSCRIPTS,
+    MAX_CONTEXT_RADIUS,
+    fetch_chunks,
+    parse_chunk_id,
+)
+from .services.highlights import find_highlight, highlight_results, load_highlights
+from .services.llm_router import LLMRouter, remaining_budget
+from .services.openai_service import (
+    CompletionProgress,
+    cached_answer,
+    fetch_embeddings,
+    generate_llm_response,
+    get_cached_answer,
+    get_cached_embedding,
+)
+from .services.participants import ParticipantIndex, UnknownParticipantError
+from .services.pinecone_service import (
+    load_metadata_table,
+    query_index,
+    similar_chunks,
+)
+from .services.query_analyzer import QueryAnalyzer
+from .services.suggest import Suggester
 
+from .model.pineconeQueryResponse import ChunkMetadata, PineconeSearchResult
 from .model.searchQuery import SearchQuery
-from .model.searchResponse import SearchResponse, Snippet
+from .model.searchResponse import ContextResponse, SearchResponse, Snippet
+from .model.suggestResponse import SuggestResponse
 
 from .client.pineconeClient import PineconeClient
 from contextlib import asynccontextmanager
+from typing import List, Optional, Set
 from dotenv import load_dotenv
 
 from common.load_tickers import load_ticker_metadata
+from common.metadata_store import MetadataTable
 
 logger = get_logger("needle-backend")
 load_dotenv()
 OAI_client = None
 pinecone_client = None
 
+# Prompt template plus 8 excerpts, for chat TPM budgeting
+LLM_PROMPT_TOKEN_ESTIMATE = 1500
+# Bound upstream calls so slow failures trip the circuit breakers
+OPENAI_TIMEOUT_S = float(os.getenv("OPENAI_TIMEOUT_S", "20"))
+# How often /search checks whether the client is still waiting for the answer
+DISCONNECT_POLL_S = float(os.getenv("DISCONNECT_POLL_S", "0.1"))
+# Logged for searches the client abandoned (nginx's "client closed request")
+CLIENT_CLOSED_REQUEST = 499
+SIMILAR_CACHE_CAPACITY = 1000
+# Lifetime of /similar and context results when there's no metadata table
+# generation to tell us the index was rebuilt
+INDEX_CACHE_TTL_S = float(os.getenv("INDEX_CACHE_TTL_S", "3600"))
+# Enables the /debug endpoints; without it they return 404
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+MAX_PROFILE_SECONDS = 60
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,17 +99,39 @@ async def lifespan(app: FastAPI):
     logger.info(
         "Pinecone client initialized", extra={"client": app.state.pinecone_client}
     )
-    app.state.oai_client = OpenAI()
+    app.state.oai_client = AsyncOpenAI(timeout=OPENAI_TIMEOUT_S)
     logger.info("OpenAI client initialized", extra={"client": app.state.oai_client})
     app.state.ticker_metadata = load_ticker_metadata()
     logger.info(
         "Loaded ticker metadata into memory",
         extra={"num_companies": len(app.state.ticker_metadata)},
     )
-    app.state.embeddings_cache = LRUCache()
+    app.state.query_analyzer = QueryAnalyzer(app.state.ticker_metadata)
+    app.state.metadata_table = load_metadata_table(logger)
+    app.state.participants = ParticipantIndex(app.state.metadata_table)
+    app.state.highlights = load_highlights(logger)
+    app.state.catalog = load_catalog(logger)
+    app.state.suggester = Suggester(app.state.ticker_metadata, app.state.metadata_table)
+    logger.info(
+        "Built suggestion index",
+        extra={"num_entries": len(app.state.suggester.index)},
+    )
+    app.state.embeddings_cache = build_embedding_cache()
     app.state.llm_response_cache = LRUCache()
+    app.state.limiters = build_limiters()
+    app.state.breakers = build_breakers()
+    app.state.llm_router = LLMRouter(app.state.limiters["openai_chat"])
+    app.state.answer_cache = LRUCache(capacity=500)
+    app.state.similar_cache = LRUCache(capacity=SIMILAR_CACHE_CAPACITY)
+    # transcript slug -> {position: (chunk_id, metadata) or None if absent}
+    app.state.context_cache = LRUCache(capacity=CONTEXT_CACHE_TRANSCRIPTS)
     yield
     # Shutdown
+    await app.state.oai_client.close()
+    if app.state.metadata_table is not None:
+        app.state.metadata_table.close()
+    if isinstance(app.state.embeddings_cache, SharedEmbeddingCache):
+        app.state.embeddings_cache.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -60,6 +149,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL
+)
 
 
 @app.get("/healthz", status_code=status.HTTP_200_OK)
@@ -68,21 +160,111 @@ def healthz():
     return {"status": "ok"}
 
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(
-        "Request started", extra={"method": request.method, "url": str(request.url)}
+@app.get("/metrics")
+def get_metrics():
+    """Counters, gauges and timings for this worker process."""
+    return metrics.snapshot()
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError):
+    logger.warning(
+        "Rejecting request, upstream overloaded",
+        extra={"upstream": exc.upstream, "retry_after": exc.retry_after},
     )
-    response = await call_next(request)
-    logger.info(
-        "Request completed",
-        extra={
-            "method": request.method,
-            "url": str(request.url),
-            "status_code": response.status_code,
-        },
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    logger.warning("Rejecting request, circuit open", extra={"upstream": exc.name})
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+class RequestLoggingMiddleware:
+    """
+    Logs the start and end of every HTTP request. Plain ASGI rather than
+    `@app.middleware("http")`, which hides client disconnects from endpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        logger.info(
+            "Request started",
+            extra={"method": request.method, "url": str(request.url)},
+        )
+        status_code = None
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_with_status)
+        logger.info(
+            "Request completed",
+            extra={
+                "method": request.method,
+                "url": str(request.url),
+                "status_code": status_code,
+            },
+        )
+
+
+app.add_middleware(RequestLoggingMiddleware)
+
+stack_sampler = StackSampler()
+profiled_requests = ProfiledRequests(stack_sampler)
+if profiled_requests.every:
+    app.add_middleware(ProfilingMiddleware, profiled=profiled_requests)
+
+
+def require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def debug_profile(
+    request: Request, seconds: float = Query(default=10, gt=0, le=MAX_PROFILE_SECONDS)
+):
+    """
+    Samples every thread in this worker for `seconds` and returns collapsed
+    stacks, ready for flamegraph.pl or speedscope.
+    """
+    require_admin(request)
+    with stack_sampler.capture("/debug/profile") as capture:
+        await asyncio.sleep(seconds)
+    metrics.incr("profile.on_demand")
+    return PlainTextResponse(render_collapsed(capture.counts))
+
+
+@app.get("/debug/profile/requests", response_class=PlainTextResponse)
+async def debug_profile_requests(request: Request):
+    """Collapsed stacks merged over the sampled /search requests in the ring."""
+    require_admin(request)
+    return PlainTextResponse(
+        render_collapsed(profiled_requests.merged()),
+        headers={"X-Profiled-Requests": str(len(profiled_requests.ring))},
     )
-    return response
 
 
 @app.get("/metadata")
@@ -96,8 +278,237 @@ def metadata():
     }
 
 
-@app.post("/search")
-def search(request: Request, response: Response, query: SearchQuery) -> SearchResponse:
+@app.get("/suggest")
+def suggest(
+    request: Request, q: str, limit: int = Query(default=8, ge=1, le=20)
+) -> SuggestResponse:
+    """Typeahead completions from in-memory indexes; never calls an upstream."""
+    start = time.perf_counter()
+    suggestions = request.app.state.suggester.suggest(q, limit)
+    metrics.observe("suggest.lookup", time.perf_counter() - start)
+    return SuggestResponse(query=q, suggestions=suggestions)
+
+
+def index_generation(metadata_table: Optional[MetadataTable]) -> str:
+    """
+    Cache key part for results that only change when the index is rebuilt:
+    the metadata table's generation or, without one, the current
+    INDEX_CACHE_TTL_S window. Entries from earlier windows are never hit
+    again and age out of the LRU.
+    """
+    generation = metadata_table.generation if metadata_table is not None else ""
+    return generation or f"ttl:{int(time.time() // INDEX_CACHE_TTL_S)}"
+
+
+def build_snippet(chunk_id: str, metadata: ChunkMetadata) -> Snippet:
+    return Snippet(
+        chunk_id=chunk_id,
+        company=metadata.company,
+        quarter=metadata.quarter,
+        year=metadata.year,
+        url=metadata.url,
+        participants={
+            sp.name: sp.role if sp.role else sp.type for sp in metadata.participants
+        },
+        section=metadata.section,
+        text=metadata.snippet,
+    )
+
+
+def build_search_response(
+    answer: Optional[str], results: List[PineconeSearchResult], **kwargs
+) -> SearchResponse:
+    return SearchResponse(
+        answer=answer,
+        snippets=[build_snippet(sr.id, sr.metadata) for sr in results],
+        **kwargs,
+    )
+
+
+class SearchProgress:
+    """How far a /search request has got, so a disconnect can cancel the right work."""
+
+    def __init__(self):
+        self.stage = "embedding"
+        self.llm_task: Optional[asyncio.Task] = None
+        self.completion = CompletionProgress()
+
+
+# Nearly finished answers left to complete after their client disconnected
+background_completions: Set[asyncio.Task] = set()
+
+
+def finish_in_background(task: asyncio.Task):
+    def done(t: asyncio.Task):
+        background_completions.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            logger.warning(
+                "Background completion failed", extra={"error": str(t.exception())}
+            )
+
+    background_completions.add(task)
+    task.add_done_callback(done)
+
+
+async def wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
+def search_fields(fields: Optional[str]):
+    """`include` for a `fields=` selector on a SearchResponse, or a 422."""
+    try:
+        return parse_fields(fields, SearchResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/similar/{chunk_id}", response_model=SearchResponse)
+async def similar(
+    request: Request,
+    chunk_id: str,
+    limit: int = Query(default=8, ge=1, le=20),
+    fields: Optional[str] = None,
+):
+    """
+    "More like this excerpt": the index is queried by the stored vector's ID,
+    so there is no OpenAI call. Results are cached per chunk and metadata
+    table generation, since they only change when the index is rebuilt.
+    Without a generation they expire within INDEX_CACHE_TTL_S instead.
+    """
+    include = search_fields(fields)
+    metadata_table = request.app.state.metadata_table
+    if metadata_table is not None and metadata_table.get(chunk_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown chunk")
+    cache = request.app.state.similar_cache
+    key = (chunk_id, limit, index_generation(metadata_table))
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.incr("cache.similar.hits")
+        return ModelResponse(cached, include)
+    metrics.incr("cache.similar.misses")
+
+    breakers = request.app.state.breakers
+    breakers["pinecone"].check()
+    async with request.app.state.limiters["pinecone"].slot(PRIORITY_DEFAULT):
+        with breakers["pinecone"].guard():
+            results = await run_in_threadpool(
+                similar_chunks,
+                request.app.state.pinecone_client,
+                logger,
+                chunk_id,
+                limit,
+                metadata_table,
+            )
+    if not results:
+        raise HTTPException(status_code=404, detail="No similar chunks found")
+    response = build_search_response(None, results)
+    cache.set(key, response)
+    return ModelResponse(response, include)
+
+
+@app.get("/chunks/{chunk_id}/context")
+async def chunk_context(
+    request: Request,
+    chunk_id: str,
+    radius: int = Query(default=2, ge=0, le=MAX_CONTEXT_RADIUS),
+) -> ContextResponse:
+    """
+    The speaker turns around an excerpt, in transcript order. Neighbours are
+    read from the local metadata table, or else fetched from Pinecone in one
+    batch, and cached per transcript and metadata table generation (or
+    INDEX_CACHE_TTL_S window) so widening the window fetches only the new
+    positions.
+    """
+    parsed = parse_chunk_id(chunk_id)
+    if parsed is None:
+        raise HTTPException(status_code=404, detail="Unknown chunk")
+    slug, position = parsed
+    wanted = range(max(0, position - radius), position + radius + 1)
+
+    metadata_table = request.app.state.metadata_table
+    cache = request.app.state.context_cache
+    key = (slug, index_generation(metadata_table))
+    chunks = cache.get(key) or {}
+    missing = [p for p in wanted if p not in chunks]
+    if missing:
+        metrics.incr("cache.context.misses")
+        if metadata_table is not None:
+            found = fetch_chunks(None, logger, slug, missing, metadata_table)
+        else:
+            breakers = request.app.state.breakers
+            breakers["pinecone"].check()
+            async with request.app.state.limiters["pinecone"].slot(PRIORITY_DEFAULT):
+                with breakers["pinecone"].guard():
+                    found = await run_in_threadpool(
+                        fetch_chunks,
+                        request.app.state.pinecone_client,
+                        logger,
+                        slug,
+                        missing,
+                    )
+        for p in missing:
+            # Positions past the end are remembered too, so they aren't refetched
+            chunks[p] = found.get(p)
+        cache.set(key, chunks)
+    else:
+        metrics.incr("cache.context.hits")
+
+    if chunks.get(position) is None or chunks[position][0] != chunk_id:
+        raise HTTPException(status_code=404, detail="Unknown chunk")
+    return ContextResponse(
+        chunk_id=chunk_id,
+        snippets=[build_snippet(*chunks[p]) for p in wanted if chunks[p] is not None],
+    )
+
+
+@app.post("/search", response_model=SearchResponse)
+async def search(request: Request, query: SearchQuery, fields: Optional[str] = None):
+    """
+    Runs the search while watching the client connection. If the client goes
+    away (a retyped query, a closed tab), in-flight upstream calls are
+    cancelled. A streamed answer that is nearly done is left to finish into
+    the LLM cache instead, since the same search is likely to come back.
+
+    `fields` (e.g. "answer,snippets.company,snippets.text") trims the
+    response to the fields a client renders.
+    """
+    include = search_fields(fields)
+    progress = SearchProgress()
+    pipeline = asyncio.create_task(run_search(request, query, progress))
+    watcher = asyncio.create_task(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({pipeline, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        pipeline.cancel()
+        raise
+    finally:
+        watcher.cancel()
+    if pipeline.done():
+        result = pipeline.result()
+        if isinstance(result, SearchResponse) and result.answer:
+            request.app.state.suggester.record_query(query.query)
+        return ModelResponse(result, include)
+
+    pipeline.cancel()
+    llm_task = progress.llm_task
+    if llm_task is not None and not llm_task.done():
+        if progress.completion.near_completion():
+            metrics.incr("search.cancelled.llm_finished_into_cache")
+            finish_in_background(llm_task)
+        else:
+            llm_task.cancel()
+    metrics.incr(f"search.cancelled.{progress.stage}")
+    logger.info(
+        "Client disconnected, cancelled search",
+        extra={"stage": progress.stage, "streamed_tokens": progress.completion.tokens},
+    )
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
+async def run_search(
+    request: Request, query: SearchQuery, progress: SearchProgress
+) -> SearchResponse:
     start = time.perf_counter()
     logger.info("Semantic search query received", extra={"query": query})
     if not query.query:
@@ -107,23 +518,157 @@ def search(request: Request, response: Response, query: SearchQuery) -> SearchRe
     pinecone_client = request.app.state.pinecone_client
     assert pinecone_client is not None, "Pinecone client not initialized"
     assert openai_client is not None, "OpenAI client not initialized"
+    limiters = request.app.state.limiters
+    breakers = request.app.state.breakers
 
-    embeddings_cache = request.app.state.embeddings_cache
-    embedding, embeddings_cache = fetch_embeddings(
-        openai_client, query.query, logger, embeddings_cache
+    # "Apple AI chip strategy 2024" searches Apple's 2024 calls, not everything
+    query, inferred_filters = request.app.state.query_analyzer.analyze(query)
+    if inferred_filters is not None:
+        for field in inferred_filters.model_dump(exclude_none=True):
+            metrics.incr(f"search.filters_inferred.{field}")
+        logger.info("Inferred filters from query", extra={"filters": inferred_filters})
+    # Speaker and role filters go to the index as exact stored values
+    try:
+        query = request.app.state.participants.apply(query)
+    except UnknownParticipantError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Lookups like "Walmart transcripts" are listed from the local catalog
+    catalog = request.app.state.catalog
+    if catalog is not None and is_navigational(query, request.app.state.query_analyzer):
+        filters = query.filters
+        transcripts = catalog.find(filters.company, filters.quarter, filters.year)
+        if transcripts:
+            metrics.incr("search.navigational")
+            return SearchResponse(
+                snippets=[], transcripts=transcripts, inferred_filters=inferred_filters
+            )
+
+    # Common "what did <company> say about X in <quarter>" questions have a
+    # precomputed answer, served along with its excerpts without upstream calls
+    highlight = find_highlight(
+        query, request.app.state.highlights, request.app.state.ticker_metadata
     )
-    app.state.embeddings_cache = embeddings_cache
+    if highlight is not None:
+        results = highlight_results(highlight, request.app.state.metadata_table)
+        if results:
+            metrics.incr("search.highlights.served")
+            return build_search_response(
+                highlight["answer"],
+                results,
+                materialized=True,
+                inferred_filters=inferred_filters,
+            )
+
+    # OpenAI calls are async so a disconnect can cancel them; the Pinecone
+    # query is synchronous and runs in the threadpool.
+    embeddings_cache = request.app.state.embeddings_cache
+    embedding = get_cached_embedding(query.query, embeddings_cache)
+    priority = PRIORITY_CACHED if embedding is not None else PRIORITY_DEFAULT
+    try:
+        if embedding is None:
+            breakers["openai_embeddings"].check()
+            async with limiters["openai_embeddings"].slot(
+                priority, estimate_tokens(query.query)
+            ):
+                with breakers["openai_embeddings"].guard():
+                    embedding, embeddings_cache = await fetch_embeddings(
+                        openai_client, query.query, logger, embeddings_cache
+                    )
+            app.state.embeddings_cache = embeddings_cache
+
+        # Get 3-5 best results
+        progress.stage = "pinecone"
+        breakers["pinecone"].check()
+        async with limiters["pinecone"].slot(priority):
+            with breakers["pinecone"].guard():
+                top_k_results = await run_in_threadpool(
+                    query_index,
+                    pinecone_client,
+                    logger,
+                    embedding,
+                    query.filters,
+                    request.app.state.metadata_table,
+                )
+    except CircuitOpenError:
+        stale = get_stale_answer(request.app.state.answer_cache, query)
+        if stale is None:
+            raise
+        metrics.incr("search.stale_answers")
+        logger.warning("Serving stale answer, upstream circuit open")
+        return stale
 
-    # Get 3-5 best results
-    top_k_results = query_index(pinecone_client, logger, embedding, query.filters)
     if not top_k_results:
         logger.debug("No grouped results.")
         raise HTTPException(status_code=204, detail="No search results found")
 
     llm_response_cache = request.app.state.llm_response_cache
-    answer, llm_response_cache = generate_llm_response(
-        openai_client, logger, query.query, top_k_results, llm_response_cache
+    answer = None
+    # Under load or close to the deadline, a shorter or faster answer keeps
+    # latency in check; with no time left the excerpts go out on their own
+    router = request.app.state.llm_router
+    route = router.choose(remaining_budget(start))
+    cached = get_cached_answer(query.query, top_k_results, llm_response_cache)
+    refresh = (
+        cached is not None
+        and cached["route"] != router.primary.name
+        and route is router.primary
     )
+    if refresh:
+        metrics.incr("llm.route.upgraded")
+
+    async def summarize():
+        breakers["openai_chat"].check()
+        async with limiters["openai_chat"].slot(
+            priority, estimate_tokens(query.query) + LLM_PROMPT_TOKEN_ESTIMATE
+        ):
+            with breakers["openai_chat"].guard():
+                llm_start = time.perf_counter()
+                result = await generate_llm_response(
+                    openai_client,
+                    logger,
+                    query.query,
+                    top_k_results,
+                    llm_response_cache,
+                    progress.completion,
+                    route,
+                    refresh,
+                )
+                router.record(route, time.perf_counter() - llm_start)
+                return result
+
+    if highlight is not None:
+        # No local metadata table to build excerpts from, but the answer holds
+        metrics.incr("search.highlights.served")
+        answer = highlight["answer"]
+    elif cached is not None and not refresh:
+        answer, llm_response_cache = await generate_llm_response(
+            openai_client, logger, query.query, top_k_results, llm_response_cache
+        )
+    elif route is None:
+        metrics.incr("search.llm_skipped.deadline")
+        logger.warning("Skipping LLM summary, request deadline too close")
+    else:
+        # The excerpts are useful on their own, so an unavailable LLM only
+        # costs us the summary rather than the whole response.
+        try:
+            progress.stage = "llm"
+            # Shielded so a disconnect can decide whether to let it finish
+            progress.llm_task = asyncio.create_task(summarize())
+            answer, llm_response_cache = await asyncio.shield(progress.llm_task)
+        except (CircuitOpenError, OpenAIError) as e:
+            if refresh:
+                # The degraded answer we already have beats none at all. It
+                # comes from the entry read before the refresh, which may
+                # have been evicted from the cache since.
+                metrics.incr("llm.route.upgrade_failed")
+                logger.warning(
+                    "Keeping cached answer, refresh failed", extra={"error": str(e)}
+                )
+                answer = cached_answer(cached)
+            else:
+                metrics.incr("search.llm_skipped")
+                logger.warning("Skipping LLM summary", extra={"error": str(e)})
     app.state.llm_response_cache = llm_response_cache
 
     request_time = time.perf_counter() - start
@@ -131,21 +676,9 @@ def search(request: Request, response: Response, query: SearchQuery) -> SearchRe
         "Returning semantic search results",
         extra={"request_time": request_time},
     )
-    return SearchResponse(
-        answer=answer,
-        snippets=[
-            Snippet(
-                company=sr.metadata.company,
-                quarter=sr.metadata.quarter,
-                year=sr.metadata.year,
-                url=sr.metadata.url,
-                participants={
-                    sp.name: sp.role if sp.role else sp.type
-                    for sp in sr.metadata.participants
-                },
-                section=sr.metadata.section,
-                text=sr.metadata.snippet,
-            )
-            for sr in top_k_results
-        ],
+    search_response = build_search_response(
+        answer, top_k_results, inferred_filters=inferred_filters
     )
+    if answer is not None:
+        store_answer(request.app.state.answer_cache, query, search_response)
+    return search_response
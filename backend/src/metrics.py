@@ -0,0 +1,52 @@
+import threading
+
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry, exposed as JSON on /metrics.
+
+    Counters and timings are updated from both the event loop and threadpool
+    workers, so every mutation goes through a lock. Gauges are callbacks read
+    at snapshot time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            t = self.timings.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            t["count"] += 1
+            t["sum"] += seconds
+            t["max"] = max(t["max"], seconds)
+
+    def register_gauge(self, name: str, fn: Callable[[], float]):
+        self._gauges[name] = fn
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            timings = {
+                name: {**t, "avg": t["sum"] / t["count"] if t["count"] else 0.0}
+                for name, t in self.timings.items()
+            }
+        gauges = {name: fn() for name, fn in self._gauges.items()}
+        return {"counters": counters, "gauges": gauges, "timings": timings}
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timings.clear()
+
+
+metrics = Metrics()
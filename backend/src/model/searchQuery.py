@@ -1,10 +1,37 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from common.periods import parse_quarter, range_bound
 
 
 class Filter(BaseModel):
-    company: str | None = None
-    quarter: str | None = None
+    model_config = ConfigDict(populate_by_name=True)
+
+    # Lists match any of the values
+    company: str | list[str] | None = None
+    quarter: str | list[str] | None = None  # "Q1 2024"
+    year: str | list[str] | None = None  # whole fiscal years, when no quarter is set
     section: str | None = None
+    # A name as typed, resolved to the matching stored names before querying
+    speaker: str | list[str] | None = None
+    role: str | None = None  # "CFO", "Analyst", ...
+    # Inclusive call-date range: a quarter ("Q1 2023") or an ISO date
+    date_from: str | None = Field(default=None, alias="from")
+    date_to: str | None = Field(default=None, alias="to")
+
+    @field_validator("quarter")
+    @classmethod
+    def check_quarter(cls, value: str | list[str] | None):
+        for quarter in [value] if isinstance(value, str) else value or []:
+            if parse_quarter(quarter) is None:
+                raise ValueError(f"Expected a quarter like 'Q1 2024', got {quarter!r}")
+        return value
+
+    @field_validator("date_from", "date_to")
+    @classmethod
+    def check_bound(cls, value: str | None) -> str | None:
+        if value is not None:
+            range_bound(value)
+        return value
 
 
 class SearchQuery(BaseModel):
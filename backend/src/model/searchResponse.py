@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from .searchQuery import Filter
+
 
 class SearchResult(BaseModel):
     company: str
@@ -11,6 +13,7 @@ class SearchResult(BaseModel):
 
 
 class Snippet(BaseModel):
+    chunk_id: str | None = None  # for /similar and /chunks/{id}/context
     company: str
     quarter: str
     year: str
@@ -20,6 +23,25 @@ class Snippet(BaseModel):
     text: str
 
 
+class Transcript(BaseModel):
+    company: str
+    quarter: str
+    year: str
+    url: str
+    call_ts: str | None = None
+
+
+class ContextResponse(BaseModel):
+    chunk_id: str
+    snippets: list[Snippet]  # in transcript order, including chunk_id itself
+
+
 class SearchResponse(BaseModel):
-    answer: str
+    answer: str | None = None
     snippets: list[Snippet]
+    stale: bool = False  # served from the last known answer during an outage
+    materialized: bool = False  # precomputed highlight answer, no live LLM call
+    # Filters read from the query text and applied on the user's behalf
+    inferred_filters: Filter | None = None
+    # Lookups like "NVDA Q3 2025 earnings call" list transcripts, no answer
+    transcripts: list[Transcript] = []
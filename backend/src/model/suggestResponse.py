@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str  # "company" | "executive" | "analyst" | "query"
+    ticker: str | None = None
+    detail: str | None = None  # company name for tickers, role for people
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: list[Suggestion]
@@ -0,0 +1,173 @@
+import os
+import sys
+import threading
+import time
+
+from collections import Counter, deque
+from contextlib import contextmanager
+from types import FrameType
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+from .metrics import metrics
+
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_S", "0.005"))
+# Continuously profile one in this many /search requests; 0 turns it off
+PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", "0"))
+PROFILE_RING_SIZE = int(os.getenv("PROFILE_RING_SIZE", "200"))
+MAX_STACK_DEPTH = 128
+
+# Leaf frames of threads that are parked, not working: idle threadpool
+# workers, the event loop waiting on sockets, the sampler itself sleeping
+IDLE_FRAMES = {
+    ("threading", "wait"),
+    ("selectors", "select"),
+    ("queue", "get"),
+    ("concurrent.futures.thread", "_worker"),
+    ("asyncio.base_events", "_run_once"),
+    # uvloop's loop is C code, so when it is idle this is the innermost frame
+    ("asyncio.runners", "run"),
+}
+
+
+def frame_label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse(frame: FrameType, thread_name: str) -> Optional[str]:
+    """
+    One line of Brendan Gregg's collapsed-stack format, root first:
+    "thread;module:function;module:function". None for idle threads.
+    """
+    if (frame.f_globals.get("__name__"), frame.f_code.co_name) in IDLE_FRAMES:
+        return None
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def render_collapsed(counts: Counter) -> str:
+    """Input for flamegraph.pl, speedscope or inferno, hottest stacks first."""
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+
+
+class Capture:
+    """Stacks seen while one profile was running."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.counts: Counter = Counter()
+        self.started = time.monotonic()
+        self.duration = 0.0
+
+
+class StackSampler:
+    """
+    Pure-Python sampling profiler. While any capture is open, a daemon thread
+    reads `sys._current_frames()` every `interval` seconds and adds each busy
+    thread's stack (the event loop and threadpool workers alike) to every
+    open capture. With nothing to capture the thread exits, so the sampler
+    costs nothing when idle.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_S):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._captures: Set[Capture] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self, captures: Iterable[Capture]):
+        names: Dict[int, str] = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = collapse(frame, names.get(ident, f"thread-{ident}"))
+            if stack is not None:
+                stacks.append(stack)
+        for capture in captures:
+            capture.counts.update(stacks)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._captures:
+                    self._thread = None
+                    return
+                captures = list(self._captures)
+            self.sample(captures)
+            time.sleep(self.interval)
+
+    @contextmanager
+    def capture(self, label: str = ""):
+        capture = Capture(label)
+        with self._lock:
+            self._captures.add(capture)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+        try:
+            yield capture
+        finally:
+            with self._lock:
+                self._captures.discard(capture)
+            capture.duration = time.monotonic() - capture.started
+
+
+class ProfiledRequests:
+    """
+    Opt-in continuous profiling: one in `every` requests to `path` is
+    sampled for its whole lifetime and kept in a ring buffer of the last
+    `size` profiles. Samples cover every thread in the process while the
+    request runs, so under concurrency they include its neighbours' work too.
+    """
+
+    def __init__(
+        self,
+        sampler: StackSampler,
+        path: str = "/search",
+        every: int = PROFILE_SAMPLE_EVERY,
+        size: int = PROFILE_RING_SIZE,
+    ):
+        self.sampler = sampler
+        self.path = path
+        self.every = every
+        self.ring: Deque[Capture] = deque(maxlen=size)
+        self.seen = 0
+        metrics.register_gauge("profile.ring_size", lambda: len(self.ring))
+
+    def should_sample(self) -> bool:
+        self.seen += 1
+        return self.every > 0 and self.seen % self.every == 0
+
+    def merged(self) -> Counter:
+        counts: Counter = Counter()
+        for capture in list(self.ring):
+            counts.update(capture.counts)
+        return counts
+
+
+class ProfilingMiddleware:
+    """Samples the requests `ProfiledRequests` picks into its ring buffer."""
+
+    def __init__(self, app, profiled: ProfiledRequests):
+        self.app = app
+        self.profiled = profiled
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] != self.profiled.path
+            or not self.profiled.should_sample()
+        ):
+            await self.app(scope, receive, send)
+            return
+        with self.profiled.sampler.capture(scope["path"]) as capture:
+            await self.app(scope, receive, send)
+        self.profiled.ring.append(capture)
+        metrics.incr("profile.requests_sampled")
@@ -0,0 +1,79 @@
+import os
+import typing
+
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+# Responses smaller than this aren't worth the CPU to gzip
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1000"))
+# zlib's default; level 9 saves nothing more on our responses
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+Include = Dict[str, Any]
+
+
+class ModelResponse(Response):
+    """
+    JSON response serialized straight from a pydantic model by pydantic-core,
+    skipping FastAPI's re-validation and `jsonable_encoder` pass. `include`
+    limits the output to the fields chosen with `parse_fields`.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: BaseModel,
+        include: Optional[Include] = None,
+        status_code: int = 200,
+        **kwargs,
+    ):
+        super().__init__(
+            # by_alias matches FastAPI's own encoding, e.g. Filter's "from"/"to"
+            model.model_dump_json(include=include, by_alias=True),
+            status_code=status_code,
+            **kwargs,
+        )
+
+
+def submodel(model: Type[BaseModel], field: str) -> Tuple[Optional[type], bool]:
+    """The model behind `field`, if any, and whether the field is a list of them."""
+    annotation = model.model_fields[field].annotation
+    for candidate in (annotation, *typing.get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate, False
+        if typing.get_origin(candidate) is list:
+            (item,) = typing.get_args(candidate)
+            if isinstance(item, type) and issubclass(item, BaseModel):
+                return item, True
+    return None, False
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Include]:
+    """
+    Turn a sparse fieldset such as "answer,snippets.company,snippets.text"
+    into a pydantic `include`. A bare name keeps the whole field; a dotted
+    name keeps only that part of each nested item. Raises ValueError for
+    unknown fields.
+    """
+    if not fields:
+        return None
+    include: Include = {}
+    for path in filter(None, (f.strip() for f in fields.split(","))):
+        name, _, rest = path.partition(".")
+        if name not in model.model_fields:
+            raise ValueError(f"Unknown field {path!r}")
+        if not rest:
+            include[name] = True
+            continue
+        nested, is_list = submodel(model, name)
+        if nested is None:
+            raise ValueError(f"{name!r} has no fields to select")
+        if rest not in nested.model_fields:
+            raise ValueError(f"Unknown field {path!r}")
+        selected = include.setdefault(name, {"__all__": {}} if is_list else {})
+        if selected is not True:
+            (selected["__all__"] if is_list else selected)[rest] = True
+    return include
@@ -0,0 +1,44 @@
+"""
+Production entrypoint: runs the API under uvicorn with one worker process per
+CPU (or `WEB_CONCURRENCY`), so request parsing, prompt building and logging
+aren't all bound to a single interpreter's GIL.
+
+Workers share the query-embedding cache through a slab in /dev/shm (see
+`shm_cache.py`), and split the upstream rate limits in `admission.py` evenly.
+
+Usage: python -m backend.src.serve --host 0.0.0.0 --port 8000
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+
+def default_workers() -> int:
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the needle API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    # Read at import time by each worker (admission limits, embedding cache backend)
+    os.environ["NEEDLE_WORKERS"] = str(args.workers)
+    uvicorn.run(
+        "backend.src.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import re
+
+from typing import Optional
+
+from ..cache import LRUCache
+from ..model.searchQuery import SearchQuery
+from ..model.searchResponse import SearchResponse
+
+
+def canonical_query_key(query: SearchQuery) -> str:
+    """
+    Key for "the same question": case, whitespace and trailing punctuation are
+    ignored, filters are part of the key.
+    """
+    text = re.sub(r"\s+", " ", query.query).strip().rstrip("?.!").lower()
+    filters = query.filters.model_dump_json() if query.filters else ""
+    return f"{text}|{filters}"
+
+
+def store_answer(cache: LRUCache, query: SearchQuery, response: SearchResponse):
+    cache.set(canonical_query_key(query), response)
+
+
+def get_stale_answer(cache: LRUCache, query: SearchQuery) -> Optional[SearchResponse]:
+    """Last full answer served for this query, flagged as stale."""
+    cached = cache.get(canonical_query_key(query))
+    if cached is None:
+        return None
+    return cached.model_copy(update={"stale": True})
@@ -0,0 +1,106 @@
+import json
+import os
+
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from common.catalog import DEFAULT_CATALOG_PATH
+from ..model.searchQuery import SearchQuery
+from ..model.searchResponse import Transcript
+from .query_analyzer import QueryAnalyzer
+
+# Transcript list exported by the scraper's `export_catalog` step
+CATALOG_PATH = os.getenv("CATALOG_PATH", DEFAULT_CATALOG_PATH)
+
+# A query made only of these (besides company and period) is a lookup
+NAVIGATIONAL_WORDS = {
+    "all",
+    "call",
+    "calls",
+    "conference",
+    "earnings",
+    "first",
+    "fiscal",
+    "for",
+    "fourth",
+    "from",
+    "full",
+    "in",
+    "latest",
+    "list",
+    "of",
+    "quarter",
+    "quarterly",
+    "report",
+    "results",
+    "second",
+    "show",
+    "the",
+    "third",
+    "transcript",
+    "transcripts",
+}
+# ...and needs one of these, or a period, so a bare "apple" stays a search
+LOOKUP_WORDS = {"call", "calls", "conference", "earnings", "transcript", "transcripts"}
+
+
+class TranscriptCatalog:
+    """Every ingested transcript, grouped by company, newest first."""
+
+    def __init__(self, entries: List[dict]):
+        self.by_company: Dict[str, List[Transcript]] = {}
+        for entry in entries:
+            transcript = Transcript(**entry)
+            self.by_company.setdefault(transcript.company, []).append(transcript)
+        for transcripts in self.by_company.values():
+            transcripts.sort(key=lambda t: (t.year, t.quarter), reverse=True)
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self.by_company.values())
+
+    def find(
+        self, company: str, quarter: Optional[str] = None, year: Optional[str] = None
+    ) -> List[Transcript]:
+        """`quarter` as in Filter ("Q1 2024"), which takes precedence over `year`."""
+        if quarter:
+            quarter, _, year = quarter.lower().partition(" ")
+        return [
+            t
+            for t in self.by_company.get(company.lower(), [])
+            if (not quarter or t.quarter == quarter) and (not year or t.year == year)
+        ]
+
+
+def load_catalog(logger: Logger) -> Optional[TranscriptCatalog]:
+    if not Path(CATALOG_PATH).is_file():
+        return None
+    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+        catalog = TranscriptCatalog(json.load(f)["transcripts"])
+    logger.info(
+        "Loaded transcript catalog",
+        extra={"path": CATALOG_PATH, "num_transcripts": len(catalog)},
+    )
+    return catalog
+
+
+def is_navigational(query: SearchQuery, analyzer: QueryAnalyzer) -> bool:
+    """
+    "NVDA Q3 2025 earnings call" or "Walmart transcripts": a company (named or
+    filtered on) and nothing else but lookup words and a period. Expects
+    `query` to already carry the analyzer's inferred filters.
+    """
+    filters = query.filters
+    if filters is None or not isinstance(filters.company, str):
+        return False
+    if filters.section or filters.speaker or filters.role:
+        return False
+    # Lists and ranges go through the index, which handles them in one query
+    if isinstance(filters.quarter, list) or isinstance(filters.year, list):
+        return False
+    if filters.date_from or filters.date_to:
+        return False
+    terms = analyzer.residual_terms(query.query)
+    if not terms <= NAVIGATIONAL_WORDS:
+        return False
+    return bool(terms & LOOKUP_WORDS or filters.quarter or filters.year)
@@ -0,0 +1,60 @@
+import re
+
+from logging import Logger
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from common.metadata_store import MetadataTable
+from ..client.pineconeClient import PineconeClient
+from ..model.pineconeQueryResponse import ChunkMetadata
+from .pinecone_service import hydrate_metadata, parse_metadata
+
+# `Parser.get_chunk_id`: the number counts chunks across the whole
+# transcript, so a neighbour may be in the other section
+CHUNK_ID = re.compile(r"(\w+-q[1-4]-\d{4})-(prepared_remarks|qa)-(\d+)")
+SECTIONS = ("prepared_remarks", "qa")
+MAX_CONTEXT_RADIUS = 10
+CONTEXT_CACHE_TRANSCRIPTS = 200
+
+
+def parse_chunk_id(chunk_id: str) -> Optional[Tuple[str, int]]:
+    """Transcript slug and position, e.g. ("aapl-q1-2024", 12)."""
+    match = CHUNK_ID.fullmatch(chunk_id)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(3))
+
+
+def candidate_ids(slug: str, positions: Iterable[int]) -> List[str]:
+    return [f"{slug}-{section}-{n}" for n in positions for section in SECTIONS]
+
+
+def fetch_chunks(
+    pinecone_client: Optional[PineconeClient],
+    logger: Logger,
+    slug: str,
+    positions: List[int],
+    metadata_table: Optional[MetadataTable] = None,
+) -> Dict[int, Tuple[str, ChunkMetadata]]:
+    """
+    Chunks at `positions` in one transcript, from the local metadata table
+    if there is one, otherwise in a single batched Pinecone fetch.
+    """
+    ids = candidate_ids(slug, positions)
+    if metadata_table is not None:
+        records = {i: metadata_table.get(i) for i in ids}
+    else:
+        records = pinecone_client.fetch_metadata(ids)
+
+    chunks = {}
+    for chunk_id, m in records.items():
+        m = hydrate_metadata(chunk_id, m, metadata_table)
+        chunk_metadata = parse_metadata(m) if m else None
+        if chunk_metadata is None:
+            continue
+        _, position = parse_chunk_id(chunk_id)
+        chunks[position] = (chunk_id, chunk_metadata)
+    logger.debug(
+        "Fetched context chunks",
+        extra={"slug": slug, "requested": len(positions), "found": len(chunks)},
+    )
+    return chunks
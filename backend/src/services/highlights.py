@@ -0,0 +1,99 @@
+import json
+import os
+import re
+
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from common.highlights import DEFAULT_HIGHLIGHTS_PATH, company_terms, match_template
+from common.metadata_store import MetadataTable
+from ..model.pineconeQueryResponse import PineconeSearchResult
+from ..model.searchQuery import SearchQuery
+from .pinecone_service import parse_metadata
+
+# Precomputed answers exported by the scraper's `materialize_highlights` step
+HIGHLIGHTS_PATH = os.getenv("HIGHLIGHTS_PATH", DEFAULT_HIGHLIGHTS_PATH)
+
+QUARTER_PATTERN = re.compile(r"\bq([1-4])\b", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"\b((?:19|20)\d\d)\b")
+
+
+def load_highlights(logger: Logger) -> Optional[dict]:
+    if not Path(HIGHLIGHTS_PATH).is_file():
+        return None
+    with open(HIGHLIGHTS_PATH, "r", encoding="utf-8") as f:
+        highlights = json.load(f)
+    logger.info(
+        "Loaded materialized highlights",
+        extra={
+            "path": HIGHLIGHTS_PATH,
+            "num_transcripts": len(highlights["answers"]),
+            "generated_at": highlights.get("generated_at"),
+        },
+    )
+    return highlights
+
+
+def transcript_slug(query: SearchQuery) -> Optional[str]:
+    """
+    The single transcript a query is scoped to: the company filter plus a
+    quarter filter ("Q1 2024") or a quarter and year named in the query text.
+    """
+    filters = query.filters
+    if filters is None or not isinstance(filters.company, str):
+        return None
+    if isinstance(filters.quarter, list) or filters.date_from or filters.date_to:
+        return None
+    # Answers cover the whole call, not one speaker's remarks
+    if filters.speaker or filters.role:
+        return None
+    if filters.quarter:
+        quarter, _, year = filters.quarter.partition(" ")
+        quarter = quarter.lstrip("Qq")
+    else:
+        quarters = set(QUARTER_PATTERN.findall(query.query))
+        years = set(YEAR_PATTERN.findall(query.query))
+        if len(quarters) != 1 or len(years) != 1:
+            return None
+        quarter, year = quarters.pop(), years.pop()
+    return f"{filters.company.lower()}-q{quarter}-{year}"
+
+
+def find_highlight(
+    query: SearchQuery,
+    highlights: Optional[dict],
+    ticker_metadata: Dict[str, Dict[str, str]],
+) -> Optional[dict]:
+    """The precomputed answer for this query, if it matches a template exactly."""
+    if not highlights:
+        return None
+    slug = transcript_slug(query)
+    answers = highlights["answers"].get(slug) if slug else None
+    if not answers:
+        return None
+    ticker = query.filters.company.upper()
+    name = ticker_metadata.get(ticker, {}).get("name", "")
+    template = match_template(
+        query.query, highlights["templates"], company_terms(ticker, name)
+    )
+    if template is None:
+        return None
+    return answers.get(template["id"])
+
+
+def highlight_results(
+    highlight: dict, metadata_table: Optional[MetadataTable]
+) -> List[PineconeSearchResult]:
+    """Excerpts the answer was generated from, hydrated from the local table."""
+    if metadata_table is None:
+        return []
+    results = []
+    for chunk_id, score in zip(highlight["chunk_ids"], highlight["scores"]):
+        m = metadata_table.get(chunk_id)
+        chunk_metadata = parse_metadata(m) if m else None
+        if chunk_metadata is not None:
+            results.append(
+                PineconeSearchResult(id=chunk_id, score=score, metadata=chunk_metadata)
+            )
+    return results
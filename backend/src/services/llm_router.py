@@ -0,0 +1,122 @@
+import os
+import time
+
+from typing import List, Optional
+
+from ..admission import UpstreamLimiter
+from ..metrics import metrics
+
+# Budget for a whole /search request; the answer has to fit in what is left
+SEARCH_DEADLINE_S = float(os.getenv("SEARCH_DEADLINE_S", "8"))
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", "gpt-4.1-nano")
+# Token cap on the full route's answer; 0 leaves it uncapped
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "0")) or None
+# Below this the summary is skipped and the excerpts are returned on their own
+MIN_LLM_BUDGET_S = 0.5
+
+
+class Route:
+    """
+    One way of generating the answer. A route is usable while the chat queue
+    holds at most `max_pressure` waiters per concurrency slot; `latency` is
+    the EWMA of its observed completion times, seeded with `expected_s`.
+    A `max_tokens` of None leaves the answer length to the model.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        max_tokens: Optional[int],
+        max_pressure: float,
+        expected_s: float,
+        temperature: float = 0.2,
+    ):
+        self.name = name
+        self.model = model
+        self.max_tokens = max_tokens
+        self.max_pressure = max_pressure
+        self.temperature = temperature
+        self.latency = expected_s
+
+    def record(self, seconds: float):
+        self.latency = 0.8 * self.latency + 0.2 * seconds
+
+
+def default_routes() -> List[Route]:
+    """Best answer first; each later route is cheaper or faster."""
+    return [
+        Route(
+            "full",
+            LLM_MODEL,
+            max_tokens=LLM_MAX_TOKENS,
+            max_pressure=0.5,
+            expected_s=2.5,
+        ),
+        Route("short", LLM_MODEL, max_tokens=120, max_pressure=2.0, expected_s=1.5),
+        Route("fast", LLM_FAST_MODEL, max_tokens=120, max_pressure=4.0, expected_s=1.0),
+    ]
+
+
+# Used when no router is involved, e.g. serving from the cache
+PRIMARY_ROUTE = default_routes()[0]
+
+
+class LLMRouter:
+    """
+    Picks how to generate an answer from the chat limiter's queue depth, the
+    observed latency of each route and the time left before the request's
+    deadline. Takes the first route that is allowed at the current pressure
+    and is expected to finish in time, counting the wait for a chat slot.
+    When none fits, the last (fastest) route is used.
+    """
+
+    def __init__(self, limiter: UpstreamLimiter, routes: Optional[List[Route]] = None):
+        self.limiter = limiter
+        self.routes = routes or default_routes()
+        self.by_name = {r.name: r for r in self.routes}
+        metrics.register_gauge("llm.pressure", self.pressure)
+        for route in self.routes:
+            metrics.register_gauge(
+                f"llm.route.{route.name}.latency", lambda r=route: r.latency
+            )
+
+    @property
+    def primary(self) -> Route:
+        return self.routes[0]
+
+    def pressure(self) -> float:
+        """Requests waiting for a chat slot, per slot."""
+        return self.limiter.queued / self.limiter.max_concurrency
+
+    def expected_wait(self) -> float:
+        if self.limiter.in_flight < self.limiter.max_concurrency:
+            return 0.0
+        return self.limiter.retry_after()
+
+    def choose(self, remaining: Optional[float] = None) -> Optional[Route]:
+        """
+        Route for an answer that must be done within `remaining` seconds, or
+        None if there isn't enough time left for any answer.
+        """
+        if remaining is not None and remaining < MIN_LLM_BUDGET_S:
+            return None
+        pressure = self.pressure()
+        wait = self.expected_wait()
+        for route in self.routes:
+            if pressure > route.max_pressure:
+                continue
+            if remaining is None or wait + route.latency <= remaining:
+                return route
+        return self.routes[-1]
+
+    def record(self, route: Route, seconds: float):
+        route.record(seconds)
+        metrics.incr(f"llm.route.{route.name}")
+        metrics.observe(f"llm.route.{route.name}", seconds)
+
+
+def remaining_budget(started: float, deadline: float = SEARCH_DEADLINE_S) -> float:
+    """Seconds left of `deadline` for a request that began at `started`."""
+    return deadline - (time.perf_counter() - started)
@@ -1,28 +1,44 @@
 import hashlib
 import time
 
+from common.embedding import decode_embedding, embedding_request_kwargs
 from ..cache import LRUCache
+from ..metrics import metrics
 from logging import Logger
-from openai import OpenAI
+from openai import AsyncOpenAI
 from typing import Dict, List, Tuple, Optional
 
 from ..model.pineconeQueryResponse import PineconeSearchResult
+from .llm_router import PRIMARY_ROUTE, Route
 
+# What the prompt asks the model to reply when the excerpts don't answer it
+NO_INSIGHTS_ANSWER = "No directly relevant insights found."
 
-def fetch_embeddings(
-    oai_client: OpenAI, search_query: str, logger: Logger, cache: LRUCache
+
+def query_cache_key(search_query: str) -> str:
+    return hashlib.sha256(search_query.encode("utf-8")).hexdigest()
+
+
+def get_cached_embedding(search_query: str, cache: LRUCache):
+    embedding = cache.get(query_cache_key(search_query))
+    metrics.incr(f"cache.embeddings.{'miss' if embedding is None else 'hit'}")
+    return embedding
+
+
+async def fetch_embeddings(
+    oai_client: AsyncOpenAI, search_query: str, logger: Logger, cache: LRUCache
 ):
     logger.debug("Fetching query embeddings.")
     start = time.perf_counter()
-    hashed_query = hashlib.sha256(search_query.encode("utf-8")).hexdigest()
+    hashed_query = query_cache_key(search_query)
     cached_embedding = cache.get(hashed_query)
-    if cached_embedding:
+    if cached_embedding is not None:
         embedding = cached_embedding
     else:
-        response = oai_client.embeddings.create(
-            input=search_query, model="text-embedding-3-small"
+        response = await oai_client.embeddings.create(
+            input=search_query, **embedding_request_kwargs()
         )
-        embedding = response.data[0].embedding
+        embedding = decode_embedding(response.data[0].embedding)
         cache.set(hashed_query, embedding)
     request_time = time.perf_counter() - start
     logger.info("Fetched query embeddings.", extra={"request_time": request_time})
@@ -72,32 +88,93 @@ def parse_summary(summary: str) -> list[str]:
     return [bp.strip() for bp in bullet_points]
 
 
-def generate_llm_response(
-    oai_client: OpenAI,
+def llm_cache_key(search_query: str, top_k_results: List[PineconeSearchResult]):
+    prompt = get_prompt(search_query, top_k_results)
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def get_cached_answer(
+    search_query: str, top_k_results: List[PineconeSearchResult], cache: LRUCache
+) -> Optional[Dict[str, str]]:
+    """The cached answer for this prompt and the route that generated it."""
+    return cache.get(llm_cache_key(search_query, top_k_results))
+
+
+def cached_answer(cached: Dict[str, str]) -> Optional[str]:
+    """The answer in a get_cached_answer() entry; None if there was none."""
+    answer = cached["answer"]
+    return None if answer == NO_INSIGHTS_ANSWER else answer
+
+
+class CompletionProgress:
+    """
+    Tracks how far a streamed completion has got, so a request that is
+    abandoned mid-stream can decide whether the answer is worth finishing.
+    """
+
+    # EWMA of completed answer lengths in streamed chunks (~1 token each),
+    # shared by all requests in the process. Unknown until one completes.
+    typical_tokens: Optional[float] = None
+
+    def __init__(self):
+        self.tokens = 0
+
+    def near_completion(self, threshold: float = 0.8) -> bool:
+        typical = CompletionProgress.typical_tokens
+        return typical is not None and self.tokens >= threshold * typical
+
+    @classmethod
+    def record_completed(cls, tokens: int):
+        if cls.typical_tokens is None:
+            cls.typical_tokens = float(tokens)
+        else:
+            cls.typical_tokens = 0.9 * cls.typical_tokens + 0.1 * tokens
+
+
+async def generate_llm_response(
+    oai_client: AsyncOpenAI,
     logger: Logger,
     search_query: str,
     top_k_results: List[PineconeSearchResult],
     results_cache: LRUCache,
+    progress: Optional[CompletionProgress] = None,
+    route: Route = PRIMARY_ROUTE,
+    refresh: bool = False,
 ) -> Tuple[Optional[str], LRUCache]:
     prompt = get_prompt(search_query, top_k_results)
     hashed_prompt = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    progress = progress or CompletionProgress()
 
     start = time.perf_counter()
-    if results_cache.get(hashed_prompt):
-        llm_response = results_cache.get(hashed_prompt)
+    cached = None if refresh else results_cache.get(hashed_prompt)
+    if cached:
+        metrics.incr("cache.llm.hit")
+        llm_response = cached["answer"]
     else:
-        completion = oai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.2,
+        metrics.incr("cache.llm.miss")
+        # Streamed so that cancelling the request closes the connection and
+        # stops generation, and so we know how much of the answer we have.
+        stream = await oai_client.chat.completions.create(
+            model=route.model,
+            temperature=route.temperature,
+            **({"max_tokens": route.max_tokens} if route.max_tokens else {}),
             messages=[
                 {"role": "user", "content": prompt.strip()},
             ],
+            stream=True,
         )
-        llm_response = completion.choices[0].message.content.strip()
-        results_cache.set(hashed_prompt, llm_response)
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                progress.tokens += 1
+        CompletionProgress.record_completed(progress.tokens)
+        llm_response = "".join(parts).strip()
+        # The route is kept so a degraded answer can be replaced once load drops
+        results_cache.set(hashed_prompt, {"answer": llm_response, "route": route.name})
 
     request_time = time.perf_counter() - start
-    if "No directly relevant insights found." == llm_response:
+    if NO_INSIGHTS_ANSWER == llm_response:
         logger.info(
             "Could not generate answer to user query based on snippets",
             extra={"request_time": request_time},
@@ -105,6 +182,9 @@ def generate_llm_response(
         return None, results_cache
     logger.info(
         "Successfully generated LLM response",
-        extra={"request_time": request_time},
+        extra={
+            "request_time": request_time,
+            "route": cached["route"] if cached else route.name,
+        },
     )
     return llm_response, results_cache
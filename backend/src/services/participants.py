@@ -0,0 +1,119 @@
+import difflib
+
+from collections import Counter
+from typing import Dict, List, Optional, Union
+
+from common.metadata_store import MetadataTable
+from ..model.searchQuery import Filter, SearchQuery
+from .suggest import normalize
+
+# Roles as `Parser.parse_speaker` stores them, keyed by what people type.
+# Only executive roles: the parser drops operator and investor relations
+# turns, and keeps only executives as primary speakers when a chunk has more
+# than one, so filters on those roles (or analysts) would match nothing.
+ROLES = {
+    "ceo": "CEO",
+    "chief executive officer": "CEO",
+    "cfo": "CFO",
+    "chief financial officer": "CFO",
+    "coo": "COO",
+    "chief operating officer": "COO",
+    "cto": "CTO",
+    "chief technology officer": "CTO",
+    "president": "President",
+    "svp": "SVP",
+    "senior vice president": "SVP",
+    "vp": "VP",
+    "vice president": "VP",
+}
+# One fuzzy name can resolve to a few people; more than this is too vague
+MAX_SPEAKER_MATCHES = 5
+FUZZY_CUTOFF = 0.8
+
+
+class UnknownParticipantError(ValueError):
+    pass
+
+
+def resolve_role(role: str) -> str:
+    canonical = ROLES.get(normalize(role))
+    if canonical is None:
+        raise UnknownParticipantError(f"Unknown role {role!r}")
+    return canonical
+
+
+class ParticipantIndex:
+    """
+    Every primary speaker in the metadata table, with how many chunks they
+    lead per company. Resolves a typed name to the names stored on vectors:
+    exact (case-insensitive), then by whole words ("cook" -> "Tim Cook"),
+    then fuzzily for typos.
+    """
+
+    def __init__(self, metadata_table: Optional[MetadataTable]):
+        # name -> company -> chunks led
+        self.chunks: Dict[str, Counter] = {}
+        if metadata_table is not None:
+            for _, m in metadata_table.items():
+                for name in m.get("primary_names", []):
+                    self.chunks.setdefault(name, Counter())[m["company"]] += 1
+        self.by_key: Dict[str, List[str]] = {}
+        for name in self.chunks:
+            self.by_key.setdefault(normalize(name), []).append(name)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def resolve(
+        self, speaker: str, company: Union[str, List[str], None] = None
+    ) -> List[str]:
+        """Stored names for `speaker`, most prolific first; empty if none match."""
+        key = normalize(speaker)
+        companies = [company] if isinstance(company, str) else company
+        keys = [
+            k
+            for k, names in self.by_key.items()
+            if not companies
+            or any(c.lower() in self.chunks[n] for c in companies for n in names)
+        ]
+        if key in keys:
+            matched = [key]
+        else:
+            matched = [k for k in keys if f" {key} " in f" {k} "]
+            if not matched:
+                matched = difflib.get_close_matches(
+                    key, keys, n=MAX_SPEAKER_MATCHES, cutoff=FUZZY_CUTOFF
+                )
+        names = [name for k in matched for name in self.by_key[k]]
+        names.sort(key=lambda n: -sum(self.chunks[n].values()))
+        return names[:MAX_SPEAKER_MATCHES]
+
+    def apply(self, query: SearchQuery) -> SearchQuery:
+        """
+        Replace the speaker and role filters with the values stored on the
+        vectors, so they can be pushed down to the index as `$in` filters.
+        """
+        filters = query.filters
+        if filters is None or not (filters.speaker or filters.role):
+            return query
+        update = {}
+        if filters.role:
+            update["role"] = resolve_role(filters.role)
+        if filters.speaker:
+            speakers = (
+                [filters.speaker]
+                if isinstance(filters.speaker, str)
+                else filters.speaker
+            )
+            names: List[str] = []
+            for speaker in speakers:
+                # Without a metadata table names can't be checked, so pass them as is
+                resolved = (
+                    self.resolve(speaker, filters.company) if self.chunks else [speaker]
+                )
+                if not resolved:
+                    raise UnknownParticipantError(f"Unknown speaker {speaker!r}")
+                names += [n for n in resolved if n not in names]
+            update["speaker"] = names
+        merged: Filter = filters.model_copy(update=update)
+        return query.model_copy(update={"filters": merged})
@@ -1,12 +1,46 @@
+import os
+import time
+
+import numpy as np
+
 from ..client.pineconeClient import PineconeClient
 from ..model.pineconeQueryResponse import ChunkMetadata, PineconeSearchResult, Speaker
 from ..model.searchQuery import Filter
 from ..model.searchResponse import SearchResult
+from ..metrics import metrics
+from .rerank import SEARCH_CANDIDATES, SEARCH_TOP_K, mmr
 
+from common.metadata_store import DEFAULT_CHUNK_METADATA_PATH, MetadataTable
 from logging import Logger
 from typing import List, Optional
 from pydantic_core import ValidationError
 
+# In "slim" mode the index only carries filterable fields, so queries skip
+# include_metadata and everything is hydrated from the exported metadata table.
+METADATA_MODE = os.getenv("PINECONE_METADATA_MODE", "full")
+CHUNK_METADATA_PATH = os.getenv("CHUNK_METADATA_PATH", DEFAULT_CHUNK_METADATA_PATH)
+
+
+def load_metadata_table(logger: Logger) -> Optional[MetadataTable]:
+    table = MetadataTable.load(CHUNK_METADATA_PATH)
+    if table is None:
+        if METADATA_MODE == "slim":
+            # Slim vectors have no snippets or speakers; every match would drop
+            raise RuntimeError(
+                f"PINECONE_METADATA_MODE=slim needs the chunk metadata table, "
+                f"but none was found at {CHUNK_METADATA_PATH}"
+            )
+        return None
+    logger.info(
+        "Loaded chunk metadata table",
+        extra={
+            "path": CHUNK_METADATA_PATH,
+            "num_chunks": len(table),
+            "generation": table.generation,
+        },
+    )
+    return table
+
 
 def group_results(
     results: list[PineconeSearchResult], logger: Logger, threshold: float = 0.4
@@ -53,56 +87,144 @@ def normalize_filters(filter: Optional[Filter]) -> Filter:
     f = Filter()
     if not filter:
         return f
-    if filter.company:
+    if isinstance(filter.company, list):
+        f.company = [c.lower() for c in filter.company]
+    elif filter.company:
         f.company = filter.company.lower()
     if filter.quarter:
         f.quarter = filter.quarter
+    if filter.year:
+        f.year = filter.year
     if filter.section:
         f.section = filter.section
+    if filter.speaker:
+        f.speaker = filter.speaker
+    if filter.role:
+        f.role = filter.role
+    if filter.date_from:
+        f.date_from = filter.date_from
+    if filter.date_to:
+        f.date_to = filter.date_to
     return f
 
 
-def query_index(
-    pinecone_client: PineconeClient, logger: Logger, query_embedding, filters
-) -> list[PineconeSearchResult]:
-    norm_filter = normalize_filters(filters)
-    results = pinecone_client.query_search(query_embedding, norm_filter).to_dict()
-
-    def parse_metadata(m: dict) -> ChunkMetadata:
-        filtered_keys = [
-            "participant_names",
-            "participant_roles",
-            "participant_types",
-            "primary_names",
-            "primary_roles",
-            "primary_types",
+def hydrate_metadata(
+    chunk_id: str, m: Optional[dict], metadata_table: Optional[MetadataTable]
+) -> Optional[dict]:
+    """Fill in the fields a slim index does not store from the local table."""
+    if metadata_table is None or (m and "snippet" in m):
+        return m
+    local = metadata_table.get(chunk_id)
+    if local is None:
+        return m
+    return {**local, **(m or {})}
+
+
+def parse_metadata(m: dict) -> ChunkMetadata:
+    filtered_keys = [
+        "participant_names",
+        "participant_roles",
+        "participant_types",
+        "primary_names",
+        "primary_roles",
+        "primary_types",
+    ]
+
+    def get_speakers(s: str, m: dict) -> List[Speaker]:
+        return [
+            Speaker(name=n, type=t, role=r)
+            for n, t, r in zip(m[f"{s}_names"], m[f"{s}_roles"], m[f"{s}_types"])
         ]
 
-        def get_speakers(s: str, m: dict) -> List[Speaker]:
-            return [
-                Speaker(name=n, type=t, role=r)
-                for n, t, r in zip(m[f"{s}_names"], m[f"{s}_roles"], m[f"{s}_types"])
-            ]
-
-        chunk_metadata = None
-        try:
-            participants = get_speakers("participant", m)
-            primary_speakers = get_speakers("primary", m)
-            chunk_metadata = ChunkMetadata(
-                **{k: v for k, v in m.items() if k not in filtered_keys},
-                participants=participants,
-                primary_speakers=primary_speakers,
+    chunk_metadata = None
+    try:
+        participants = get_speakers("participant", m)
+        primary_speakers = get_speakers("primary", m)
+        chunk_metadata = ChunkMetadata(
+            **{k: v for k, v in m.items() if k not in filtered_keys},
+            participants=participants,
+            primary_speakers=primary_speakers,
+        )
+    except KeyError as e:
+        # A slim vector whose chunk isn't in the metadata table
+        print(f"Incomplete metadata, missing {e} for {m}")
+    except ValidationError as e:
+        print(f"Validation error for {m}:", e)
+
+    return chunk_metadata
+
+
+def hydrate_matches(
+    logger: Logger, matches: List[dict], metadata_table: Optional[MetadataTable]
+) -> list[PineconeSearchResult]:
+    results = []
+    for sr in matches:
+        m = hydrate_metadata(sr["id"], sr.get("metadata"), metadata_table)
+        chunk_metadata = parse_metadata(m) if m else None
+        if chunk_metadata is None:
+            logger.warning("Dropping match without metadata", extra={"id": sr["id"]})
+            continue
+        results.append(
+            PineconeSearchResult(
+                id=sr["id"], score=sr["score"], metadata=chunk_metadata
             )
-        except ValidationError as e:
-            print(f"Validation error for {m}:", e)
+        )
+    return results
 
-        return chunk_metadata
 
-    pinecone_matches = [
-        PineconeSearchResult(
-            id=sr["id"], score=sr["score"], metadata=parse_metadata(sr["metadata"])
+def query_index(
+    pinecone_client: PineconeClient,
+    logger: Logger,
+    query_embedding,
+    filters,
+    metadata_table: Optional[MetadataTable] = None,
+    top_k: int = SEARCH_TOP_K,
+    candidates: int = SEARCH_CANDIDATES,
+) -> list[PineconeSearchResult]:
+    norm_filter = normalize_filters(filters)
+    slim = METADATA_MODE == "slim" and metadata_table is not None
+    # Overfetching lets MMR trade near-duplicate turns for distinct evidence
+    rerank = candidates > top_k
+    results = pinecone_client.query_search(
+        query_embedding,
+        norm_filter,
+        include_metadata=not slim,
+        top_k=candidates if rerank else top_k,
+        include_values=rerank,
+    ).to_dict()
+    matches = results["matches"]
+    if rerank and matches:
+        start = time.perf_counter()
+        picked = mmr(
+            np.asarray(query_embedding, dtype=np.float32),
+            np.asarray([m["values"] for m in matches], dtype=np.float32),
+            top_k,
+            groups=[transcript_of(m["id"]) for m in matches],
         )
-        for sr in results["matches"]
-    ]
+        metrics.observe("search.rerank", time.perf_counter() - start)
+        matches = [matches[i] for i in picked]
+    return hydrate_matches(logger, matches, metadata_table)
+
 
-    return pinecone_matches
+def transcript_of(chunk_id: str) -> str:
+    """The transcript slug a chunk belongs to, e.g. "aapl-q1-2024"."""
+    return chunk_id.rsplit("-", 2)[0]
+
+
+def similar_chunks(
+    pinecone_client: PineconeClient,
+    logger: Logger,
+    chunk_id: str,
+    limit: int,
+    metadata_table: Optional[MetadataTable] = None,
+) -> list[PineconeSearchResult]:
+    """
+    Chunks nearest to a stored one, queried by its vector ID so nothing has
+    to be embedded. The chunk itself (always the top match) is left out.
+    """
+    slim = METADATA_MODE == "slim" and metadata_table is not None
+    results = pinecone_client.query_similar(
+        chunk_id, limit + 1, include_metadata=not slim
+    ).to_dict()
+    matches = [m for m in results["matches"] if m["id"] != chunk_id][:limit]
+    return hydrate_matches(logger, matches, metadata_table)
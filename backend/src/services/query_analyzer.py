@@ -0,0 +1,320 @@
+import re
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+from common.periods import days_ago
+from ..model.searchQuery import Filter, SearchQuery
+
+T = TypeVar("T")
+
+# Trailing words dropped from company names to get the name people type
+NAME_SUFFIXES = {
+    "&",
+    "co",
+    "com",
+    "companies",
+    "company",
+    "corp",
+    "corporation",
+    "group",
+    "holdings",
+    "inc",
+    "incorporated",
+    "lp",
+    "plc",
+}
+# Shortened names that are also ordinary words in earnings questions
+# ("target margin", "delta vs last year"); only the full name matches these
+AMBIGUOUS_NAMES = {"target", "progressive", "delta", "charter"}
+# Names people use that can't be derived from tickers.json
+EXTRA_ALIASES = {
+    "AMZN": ["amazon"],
+    "COR": ["amerisourcebergen"],
+    "COST": ["costco"],
+    "CSCO": ["cisco"],
+    "CVS": ["cvs"],
+    "DAL": ["delta airlines"],
+    "DELL": ["dell"],
+    "DIS": ["disney"],
+    "ELV": ["elevance"],
+    "GOOGL": ["google"],
+    "GS": ["goldman"],
+    "HCA": ["hca"],
+    "IBM": ["ibm"],
+    "JNJ": ["j&j"],
+    "JPM": ["jpmorgan", "jp morgan"],
+    "LMT": ["lockheed"],
+    "META": ["meta", "facebook"],
+    "PG": ["p&g"],
+    "RTX": ["raytheon"],
+    "SNX": ["synnex"],
+    "VLO": ["valero"],
+    "VZ": ["verizon"],
+    "WBA": ["walgreens"],
+    "XOM": ["exxon", "exxonmobil"],
+}
+# Tickers that are also English words need a "$" even when typed in caps
+WORD_TICKERS = {"ALL", "LOW", "MET", "COST", "CAT", "DE", "ET", "HUM", "COR", "DIS"}
+
+ORDINALS = {"first": "1", "second": "2", "third": "3", "fourth": "4"}
+QUARTER_PATTERNS = [
+    # Q3 2024, Q3'24, Q3 FY24, Q3-2024
+    re.compile(r"\bq([1-4])\s*(?:-|')?\s*(?:fy\s*)?((?:19|20)?\d\d)\b", re.IGNORECASE),
+    # 3Q24, 3Q 2024
+    re.compile(r"\b([1-4])q\s*((?:19|20)?\d\d)\b", re.IGNORECASE),
+    # third quarter 2024, third quarter of fiscal 2024
+    re.compile(
+        r"\b(first|second|third|fourth)\s+quarter\s+(?:of\s+)?(?:fiscal\s+)?"
+        r"((?:19|20)\d\d)\b",
+        re.IGNORECASE,
+    ),
+]
+LONE_QUARTER_PATTERN = re.compile(
+    r"\bq([1-4])\b|\b([1-4])q\b|\b(first|second|third|fourth)\s+quarter\b",
+    re.IGNORECASE,
+)
+YEAR_PATTERNS = [
+    re.compile(r"\b((?:19|20)\d\d)\b"),
+    # FY24, FY'24
+    re.compile(r"\bfy\s*'?(\d\d)\b", re.IGNORECASE),
+]
+# A single normalized word naming a period: "q3", "3q24", "q324", "fy25", "2024"
+PERIOD_TERM = re.compile(
+    r"q[1-4](?:fy)?(?:\d\d){0,2}|[1-4]q(?:\d\d){0,2}|fy\d\d(?:\d\d)?|(?:19|20)\d\d"
+)
+# Q2 2023 or 2023, as a range bound
+PERIOD = r"(?:q([1-4])\s+)?((?:19|20)\d\d)"
+BETWEEN_PATTERN = re.compile(
+    rf"\b(?:from|between)\s+{PERIOD}\s+(?:to|and|through|until|-)\s+{PERIOD}\b",
+    re.IGNORECASE,
+)
+SINCE_PATTERN = re.compile(
+    rf"\b(?:since|from|starting(?:\s+in)?)\s+{PERIOD}\b", re.IGNORECASE
+)
+UNTIL_PATTERN = re.compile(rf"\b(until|through|before)\s+{PERIOD}\b", re.IGNORECASE)
+# "over the last 4 quarters", "in the past two years", "since last quarter".
+# Needs the range word: in "compared to last year" or "vs last quarter" the
+# period is a comparison, not a window to search.
+RECENT_PATTERN = re.compile(
+    r"\b(?:in|over|during|within|across|for|since)\s+(?:the\s+)?"
+    r"(?:last|past|previous)\s+(?:(\d+|two|three|four|five|six|eight)\s+)?"
+    r"(quarter|year)s?\b",
+    re.IGNORECASE,
+)
+NUMBERS = {"two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "eight": 8}
+# Relative ranges count back by call date, allowing for reporting lag
+QUARTER_DAYS = 92
+YEAR_DAYS = 366
+TICKER_PATTERN = re.compile(r"(?<![\w$])(\$?)([A-Za-z]{1,5})\b")
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Multi-pattern matcher: finds every occurrence of any pattern in one pass
+    over the text, regardless of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Dict[str, T]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, T]]] = [[]]
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.out[node].append((len(pattern), value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """Yield (start, end, value) for every match, overlapping ones included."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, value in self.out[node]:
+                yield i + 1 - length, i + 1, value
+
+
+def normalize(text: str) -> str:
+    text = text.lower().replace("’", "").replace("'", "")
+    return " ".join(re.findall(r"[a-z0-9&]+", text))
+
+
+def name_aliases(name: str) -> List[str]:
+    """Full and short names, e.g. ["the home depot inc", "home depot"]."""
+    full = normalize(re.sub(r"\(.*?\)", "", name))
+    words = full.split(" ")
+    if words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words = words[:-1]
+    short = " ".join(words)
+    return [full] if short in AMBIGUOUS_NAMES else [full, short]
+
+
+class QueryAnalyzer:
+    """
+    Infers filters from free text before the index is queried: companies
+    named (or tickers written in caps / with "$") become a company filter,
+    quarters or fiscal years a period filter, and phrases like "since 2023"
+    or "last 4 quarters" a call-date range.
+    """
+
+    def __init__(self, ticker_metadata: Dict[str, Dict[str, str]]):
+        self.tickers = set(ticker_metadata)
+        patterns: Dict[str, str] = {}
+        for ticker, meta in ticker_metadata.items():
+            for alias in name_aliases(meta["name"]) + EXTRA_ALIASES.get(ticker, []):
+                patterns[normalize(alias)] = ticker
+        self.names = AhoCorasick(patterns)
+
+    def name_matches(self, normalized: str) -> Iterator[Tuple[int, int, str]]:
+        for start, end, ticker in self.names.finditer(normalized):
+            # Whole words only, so "ups" doesn't match inside "startups"
+            if (start == 0 or normalized[start - 1] == " ") and (
+                end == len(normalized) or normalized[end] == " "
+            ):
+                yield start, end, ticker
+
+    def ticker_matches(self, text: str) -> Iterator[Tuple[str, str]]:
+        for dollar, token in TICKER_PATTERN.findall(text):
+            ticker = token.upper()
+            if ticker not in self.tickers:
+                continue
+            if dollar or (
+                token.isupper() and len(token) > 1 and ticker not in WORD_TICKERS
+            ):
+                yield token, ticker
+
+    def companies(self, text: str) -> Set[str]:
+        found = {ticker for _, _, ticker in self.name_matches(normalize(text))}
+        found.update(ticker for _, ticker in self.ticker_matches(text))
+        return found
+
+    def residual_terms(self, text: str) -> Set[str]:
+        """Words left once company names, tickers and periods are taken out."""
+        chars = list(normalize(text))
+        for start, end, _ in self.name_matches("".join(chars)):
+            chars[start:end] = " " * (end - start)
+        tickers = {token.lower() for token, _ in self.ticker_matches(text)}
+        return {
+            term
+            for term in "".join(chars).split()
+            if term not in tickers and not PERIOD_TERM.fullmatch(term)
+        }
+
+    @staticmethod
+    def date_range(text: str, now: Optional[datetime] = None) -> Tuple[dict, str]:
+        """
+        `from`/`to` bounds named in the text ("since 2023", "last 4 quarters"),
+        and the text with them taken out.
+        """
+        if match := BETWEEN_PATTERN.search(text):
+            bounds = {
+                "date_from": quarter_bound(match[1], match[2]),
+                "date_to": quarter_bound(match[3], match[4], end=True),
+            }
+        elif match := SINCE_PATTERN.search(text):
+            bounds = {"date_from": quarter_bound(match[1], match[2])}
+        elif match := UNTIL_PATTERN.search(text):
+            if match[1].lower() == "before":
+                # The quarter before: ordinal - 1
+                ordinal = int(match[3]) * 4 + int(match[2] or 1) - 2
+                bounds = {"date_to": f"Q{ordinal % 4 + 1} {ordinal // 4}"}
+            else:
+                bounds = {"date_to": quarter_bound(match[2], match[3], end=True)}
+        elif match := RECENT_PATTERN.search(text):
+            count = match[1] or "1"
+            count = int(NUMBERS.get(count.lower(), count))
+            days = QUARTER_DAYS if match[2].lower() == "quarter" else YEAR_DAYS
+            bounds = {"date_from": days_ago(count * days, now)}
+        else:
+            return {}, text
+        return bounds, f"{text[: match.start()]} {text[match.end() :]}"
+
+    @staticmethod
+    def periods(text: str) -> dict:
+        """Quarters ("Q3 2024") or, failing that, fiscal years named in the text."""
+        quarters = set()
+        for pattern in QUARTER_PATTERNS:
+            for quarter, year in pattern.findall(text):
+                quarter = ORDINALS.get(quarter.lower(), quarter)
+                quarters.add(f"Q{quarter} {full_year(year)}")
+        if quarters:
+            return {"quarter": one_or_list(sorted(quarters, key=lambda q: (q[3:], q)))}
+        years = {
+            full_year(year)
+            for pattern in YEAR_PATTERNS
+            for year in pattern.findall(text)
+        }
+        if len(years) == 1:
+            # "Q3 results ... in 2024": a lone quarter and a lone year go together
+            lone = {
+                ORDINALS.get("".join(groups).lower(), "".join(groups))
+                for groups in LONE_QUARTER_PATTERN.findall(text)
+            }
+            if len(lone) == 1:
+                return {"quarter": f"Q{lone.pop()} {years.pop()}"}
+        if years:
+            return {"year": one_or_list(sorted(years))}
+        return {}
+
+    def analyze(
+        self, query: SearchQuery, now: Optional[datetime] = None
+    ) -> Tuple[SearchQuery, Optional[Filter]]:
+        """
+        Return the query with inferred filters merged in, plus just the
+        inferred part. Several companies or periods become a list, matched
+        with `$in` in one query. Filters the user set explicitly are never
+        overridden.
+        """
+        filters = query.filters or Filter()
+        inferred = {}
+        if not filters.company:
+            companies = sorted(self.companies(query.query))
+            if companies:
+                inferred["company"] = one_or_list(companies)
+        if not (
+            filters.quarter or filters.year or filters.date_from or filters.date_to
+        ):
+            bounds, rest = self.date_range(query.query, now)
+            inferred.update(bounds)
+            inferred.update(self.periods(rest))
+
+        if not inferred:
+            return query, None
+        merged = filters.model_copy(update=inferred)
+        return query.model_copy(update={"filters": merged}), Filter(**inferred)
+
+
+def one_or_list(values: List[str]) -> Union[str, List[str]]:
+    return values[0] if len(values) == 1 else values
+
+
+def quarter_bound(quarter: Optional[str], year: str, end: bool = False) -> str:
+    """A bare year starts at its Q1, or ends at its Q4."""
+    return f"Q{quarter or (4 if end else 1)} {year}"
+
+
+def full_year(year: str) -> str:
+    return year if len(year) == 4 else f"20{year}"
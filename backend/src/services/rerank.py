@@ -0,0 +1,76 @@
+import os
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Candidates fetched per query; more than SEARCH_TOP_K turns on MMR re-ranking
+SEARCH_TOP_K = 8
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", str(SEARCH_TOP_K)))
+# 1.0 ranks purely by relevance, lower values favour results unlike those
+# already picked
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+# Most results kept from one transcript; 0 for no cap
+MAX_PER_TRANSCRIPT = int(os.getenv("MAX_PER_TRANSCRIPT", "3"))
+
+
+def mmr(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    k: int,
+    lambda_: float = MMR_LAMBDA,
+    groups: Optional[Sequence[str]] = None,
+    max_per_group: int = MAX_PER_TRANSCRIPT,
+) -> List[int]:
+    """
+    Maximal marginal relevance: pick `k` of the candidate vectors (rows), each
+    time taking the one that best trades relevance to `query` against
+    similarity to those already picked. Candidates sharing a group (e.g. a
+    transcript) are capped at `max_per_group`; if the caps rule out every
+    candidate left, as when a query is filtered to one transcript, the rest
+    are filled from the capped candidates. Returns row indices in pick order.
+
+    All pairwise similarities come from one matrix product, so each of the k
+    steps is a handful of vector operations over the candidates.
+    """
+    n = len(candidates)
+    if n == 0 or k <= 0:
+        return []
+    vectors = candidates / np.maximum(
+        np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12
+    )
+    q = query / max(float(np.linalg.norm(query)), 1e-12)
+    relevance = vectors @ q
+    similarity = vectors @ vectors.T
+
+    if groups is not None and max_per_group > 0:
+        _, group_ids = np.unique(np.asarray(groups), return_inverse=True)
+        group_counts = np.zeros(group_ids.max() + 1, dtype=np.int32)
+    else:
+        group_ids = None
+
+    available = np.ones(n, dtype=bool)
+    max_similarity = np.full(n, -np.inf, dtype=relevance.dtype)
+    picked: List[int] = []
+    for _ in range(min(k, n)):
+        if group_ids is not None and not available.any():
+            group_ids = None
+            available[:] = True
+            available[picked] = False
+        if picked:
+            scores = lambda_ * relevance - (1 - lambda_) * max_similarity
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        if not np.isfinite(scores[best]):
+            break
+        picked.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+        if group_ids is not None:
+            group = group_ids[best]
+            group_counts[group] += 1
+            if group_counts[group] >= max_per_group:
+                available[group_ids == group] = False
+    return picked
@@ -0,0 +1,214 @@
+import os
+import re
+import threading
+import time
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from common.metadata_store import MetadataTable
+from ..model.suggestResponse import Suggestion
+
+# Company names carry these suffixes; nobody starts typing with them
+NAME_SUFFIXES = {"inc", "corp", "corporation", "co", "company", "plc", "ltd", "the"}
+POPULAR_QUERY_CAPACITY = 1000
+POPULAR_REBUILD_S = 30.0
+# Searches a query needs before it is suggested to anyone, so one user's
+# typing (or anything sensitive in it) isn't echoed back to others
+POPULAR_MIN_COUNT = int(os.getenv("POPULAR_MIN_COUNT", "3"))
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+
+def index_keys(text: str) -> List[str]:
+    """The full text plus every later word onward, so "cook" finds "tim cook"."""
+    words = normalize(text).split(" ")
+    return [
+        " ".join(words[i:])
+        for i in range(len(words))
+        if words[i] and (i == 0 or words[i] not in NAME_SUFFIXES)
+    ]
+
+
+class PrefixIndex:
+    """
+    Immutable prefix index: a sorted array of (key, entry) pairs. A lookup
+    bisects to the first key starting with the prefix and scans forward, so it
+    costs O(log n) plus the (capped) number of matching keys.
+    """
+
+    def __init__(
+        self,
+        entries: List[Suggestion],
+        weights: List[float],
+        keys: Optional[List[List[str]]] = None,
+    ):
+        self.entries = entries
+        self.weights = weights
+        pairs = []
+        for i, entry in enumerate(entries):
+            full = normalize(entry.text)
+            entry_keys = keys[i] if keys else index_keys(entry.text)
+            for j, key in enumerate(entry_keys):
+                # Leading keys (the whole text, or a ticker) rank above
+                # matches on a later word
+                pairs.append((key, i, j == 0 or key == full))
+        pairs.sort()
+        self.keys = [key for key, _, _ in pairs]
+        self.ids = array("I", [i for _, i, _ in pairs])
+        self.leading = bytes(leading for _, _, leading in pairs)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, prefix: str, limit: int, max_scan: int = 512) -> List[Suggestion]:
+        start = bisect_left(self.keys, prefix)
+        # entry -> whether it matched on a leading key
+        matched: Dict[int, bool] = {}
+        for pos in range(start, min(start + max_scan, len(self.keys))):
+            key = self.keys[pos]
+            if not key.startswith(prefix):
+                break
+            i = self.ids[pos]
+            matched[i] = matched.get(i, False) or bool(self.leading[pos])
+        ranked = sorted(matched, key=lambda i: (not matched[i], -self.weights[i]))
+        return [self.entries[i] for i in ranked[:limit]]
+
+
+def company_entries(
+    ticker_metadata: Dict[str, Dict[str, str]],
+) -> Iterable[Tuple[Suggestion, float, List[str]]]:
+    for ticker, meta in ticker_metadata.items():
+        # Matching either the ticker or the name suggests the company name
+        yield (
+            Suggestion(text=meta["name"], kind="company", ticker=ticker),
+            1000.0,
+            [ticker.lower(), *index_keys(meta["name"])],
+        )
+
+
+def participant_entries(
+    metadata_table: Optional[MetadataTable],
+) -> Iterable[Tuple[Suggestion, float, List[str]]]:
+    """Executives and analysts, weighted by how many chunks they lead."""
+    if metadata_table is None:
+        return []
+    counts: Counter = Counter()
+    details: Dict[Tuple[str, str], Counter] = {}
+    for _, m in metadata_table.items():
+        names, types = m.get("primary_names", []), m.get("primary_types", [])
+        # Roles are only stored for speakers that have one, so they only line
+        # up with names when every speaker has a role
+        roles = m.get("primary_roles", [])
+        if len(roles) != len(names):
+            roles = [None] * len(names)
+        for name, kind, role in zip(names, types, roles):
+            if kind not in ("executive", "analyst"):
+                continue
+            counts[(name, kind)] += 1
+            company = m["company"].upper() if kind == "executive" else None
+            details.setdefault((name, kind), Counter())[(company, role)] += 1
+
+    entries = []
+    for (name, kind), count in counts.items():
+        (company, role), _ = details[(name, kind)].most_common(1)[0]
+        entries.append(
+            (
+                Suggestion(text=name, kind=kind, ticker=company, detail=role),
+                float(count),
+                index_keys(name),
+            )
+        )
+    return entries
+
+
+class PopularQueries:
+    """
+    Counts successful search queries and serves those searched at least
+    min_count times as suggestions. The prefix index over them is rebuilt at
+    most every POPULAR_REBUILD_S seconds. Queries are recorded on the event
+    loop while /suggest runs in the threadpool, so the counts are locked.
+    """
+
+    def __init__(
+        self,
+        capacity: int = POPULAR_QUERY_CAPACITY,
+        min_count: int = POPULAR_MIN_COUNT,
+    ):
+        self.capacity = capacity
+        self.min_count = min_count
+        self.counts: Counter = Counter()
+        self.index = PrefixIndex([], [])
+        self.built_at = 0.0
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def record(self, query: str):
+        key = normalize(query)
+        if not key:
+            return
+        with self._lock:
+            self.counts[key] += 1
+            self.dirty = True
+            if len(self.counts) > 2 * self.capacity:
+                self.counts = Counter(dict(self.counts.most_common(self.capacity)))
+
+    def search(self, prefix: str, limit: int) -> List[Suggestion]:
+        with self._lock:
+            stale = self.dirty and time.monotonic() - self.built_at >= POPULAR_REBUILD_S
+            if stale:
+                top = [
+                    (q, count)
+                    for q, count in self.counts.most_common(self.capacity)
+                    if count >= self.min_count
+                ]
+                self.built_at = time.monotonic()
+                self.dirty = False
+        if stale:
+            # Built outside the lock so record() never waits on it; the index
+            # is immutable and swapped in whole
+            self.index = PrefixIndex(
+                [Suggestion(text=q, kind="query") for q, _ in top],
+                [float(count) for _, count in top],
+                # Queries only match from their first word
+                [[q] for q, _ in top],
+            )
+        return self.index.search(prefix, limit)
+
+
+class Suggester:
+    """Typeahead over companies, people and popular queries, without upstream calls."""
+
+    def __init__(
+        self,
+        ticker_metadata: Dict[str, Dict[str, str]],
+        metadata_table: Optional[MetadataTable] = None,
+    ):
+        entries, weights, keys = [], [], []
+        for source in (
+            company_entries(ticker_metadata),
+            participant_entries(metadata_table),
+        ):
+            for entry, weight, entry_keys in source:
+                entries.append(entry)
+                weights.append(weight)
+                keys.append(entry_keys)
+        self.index = PrefixIndex(entries, weights, keys)
+        self.popular = PopularQueries()
+
+    def record_query(self, query: str):
+        self.popular.record(query)
+
+    def suggest(self, q: str, limit: int = 8) -> List[Suggestion]:
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        entities = self.index.search(prefix, limit)
+        queries = self.popular.search(prefix, limit)
+        # Up to half the list is popular queries; either side fills any gap
+        n_queries = min(len(queries), max(limit // 2, limit - len(entities)))
+        return (entities[: limit - n_queries] + queries[:n_queries])[:limit]
@@ -0,0 +1,137 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from common.embedding import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+from .cache import LRUCache
+from .metrics import metrics
+
+NEEDLE_WORKERS = int(os.getenv("NEEDLE_WORKERS", "1"))
+# "lru" keeps a per-process cache; "shm" shares one slab between all workers
+EMBEDDING_CACHE_BACKEND = os.getenv(
+    "EMBEDDING_CACHE_BACKEND", "shm" if NEEDLE_WORKERS > 1 else "lru"
+)
+EMBEDDING_CACHE_SLOTS = int(os.getenv("EMBEDDING_CACHE_SLOTS", "4096"))
+
+# key hash, crc32 of key + vector, write time (unix seconds)
+HEADER = struct.Struct("<QII")
+EMPTY = 0
+FORMAT_VERSION = 1
+
+
+def key_hash(key: Any) -> int:
+    digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+
+
+def default_slab_path(dims: int, slots: int) -> Path:
+    shm = Path("/dev/shm")
+    directory = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return directory / (
+        f"needle-{EMBEDDING_MODEL}-{dims}d-{slots}.v{FORMAT_VERSION}.slab"
+    )
+
+
+class SharedEmbeddingCache:
+    """
+    Fixed-size embedding cache in a memory-mapped file (by default under
+    /dev/shm), shared by every worker process on the host.
+
+    The slab is split into buckets of `ways` slots; a key can only live in its
+    own bucket, so a lookup scans at most `ways` headers. Each slot holds a
+    64-bit key hash, a crc32 over the key and vector, and the float32 vector.
+
+    There are no locks. Writers clear the key, write the vector, then publish
+    the checksum and key; readers copy the vector and verify the checksum, so a
+    slot caught mid-write (or overwritten by another worker) reads as a miss.
+    Has the same `get`/`set` interface as `LRUCache`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = None,
+        dims: int = EMBEDDING_DIMENSIONS,
+        slots: int = EMBEDDING_CACHE_SLOTS,
+        ways: int = 8,
+    ):
+        self.dims = dims
+        self.ways = ways
+        self.buckets = max(1, slots // ways)
+        self.slots = self.buckets * ways
+        self.vector_bytes = dims * 4
+        # Round slots up to a cache line so neighbouring writers don't share one
+        self.slot_size = -(-(HEADER.size + self.vector_bytes) // 64) * 64
+        self.path = Path(path or default_slab_path(dims, self.slots))
+
+        size = self.slots * self.slot_size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                # New pages read as zeros, i.e. empty slots
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _slot_offsets(self, h: int):
+        base = (h % self.buckets) * self.ways
+        return [(base + i) * self.slot_size for i in range(self.ways)]
+
+    def _checksum(self, h: int, vector: bytes) -> int:
+        return zlib.crc32(vector, zlib.crc32(h.to_bytes(8, "little")))
+
+    def get(self, k: Any) -> Optional[np.ndarray]:
+        h = key_hash(k)
+        for offset in self._slot_offsets(h):
+            stored, crc, _ = HEADER.unpack_from(self._mm, offset)
+            if stored != h:
+                continue
+            start = offset + HEADER.size
+            vector = self._mm[start : start + self.vector_bytes]
+            if self._checksum(h, vector) != crc:
+                metrics.incr("cache.embeddings.torn")
+                return None
+            return np.frombuffer(vector, dtype="<f4")
+        return None
+
+    def set(self, k: Any, v: np.ndarray):
+        vector = np.asarray(v, dtype="<f4").tobytes()
+        if len(vector) != self.vector_bytes:
+            return
+        h = key_hash(k)
+        offsets = self._slot_offsets(h)
+        target, oldest = offsets[0], None
+        for offset in offsets:
+            stored, _, written_at = HEADER.unpack_from(self._mm, offset)
+            if stored in (h, EMPTY):
+                target = offset
+                break
+            if oldest is None or written_at < oldest:
+                target, oldest = offset, written_at
+
+        HEADER.pack_into(self._mm, target, EMPTY, 0, 0)
+        start = target + HEADER.size
+        self._mm[start : start + self.vector_bytes] = vector
+        HEADER.pack_into(
+            self._mm, target, h, self._checksum(h, vector), int(time.time())
+        )
+
+    def close(self):
+        self._mm.close()
+
+
+def build_embedding_cache(backend: str = EMBEDDING_CACHE_BACKEND):
+    if backend == "shm":
+        return SharedEmbeddingCache()
+    if backend == "lru":
+        return LRUCache()
+    raise ValueError(f"Unknown EMBEDDING_CACHE_BACKEND {backend!r}")
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from .admission import (
+    PRIORITY_CACHED,
+    PRIORITY_DEFAULT,
+    OverloadedError,
+    TokenBucket,
+    UpstreamLimiter,
+    build_limiters,
+)
+
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Third token has to wait ~1/10s for a refill
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_limiter_rejects_when_queue_full():
+    async def run():
+        limiter = UpstreamLimiter("test-full", max_concurrency=1, max_queue=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as e:
+            await limiter.acquire()
+        assert e.value.retry_after >= 1
+        limiter.release()
+        await waiter
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_limiter_prioritizes_cached_requests():
+    async def run():
+        limiter = UpstreamLimiter("test-priority", max_concurrency=1, max_queue=4)
+        order = []
+
+        async def worker(name, priority):
+            async with limiter.slot(priority):
+                order.append(name)
+
+        await limiter.acquire()
+        cold = asyncio.create_task(worker("cold", PRIORITY_DEFAULT))
+        await asyncio.sleep(0)
+        cached = asyncio.create_task(worker("cached", PRIORITY_CACHED))
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(cold, cached)
+        assert order == ["cached", "cold"]
+
+    asyncio.run(run())
+
+
+def test_limiter_times_out_waiters():
+    async def run():
+        limiter = UpstreamLimiter("test-timeout", max_concurrency=1, max_wait=0.01)
+        await limiter.acquire()
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_limits_are_split_across_workers():
+    single, quad = build_limiters(workers=1), build_limiters(workers=4)
+    chat, chat_share = single["openai_chat"], quad["openai_chat"]
+    assert chat_share.requests.rate == pytest.approx(chat.requests.rate / 4)
+    assert chat_share.tokens.rate == pytest.approx(chat.tokens.rate / 4)
+    assert chat_share.max_concurrency == max(1, -(-chat.max_concurrency // 4))
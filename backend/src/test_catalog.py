@@ -0,0 +1,88 @@
+import pytest
+
+from .model.searchQuery import Filter, SearchQuery
+from .services.catalog import TranscriptCatalog, is_navigational
+from .services.query_analyzer import QueryAnalyzer
+
+TICKERS = {
+    "NVDA": {"exchange": "NASDAQ", "name": "NVIDIA Corporation"},
+    "WMT": {"exchange": "NYSE", "name": "Walmart Inc."},
+}
+
+
+def entry(company, quarter, year):
+    return {
+        "company": company,
+        "quarter": quarter,
+        "year": year,
+        "url": f"https://www.fool.com/earnings/{company}-{quarter}-{year}/",
+        "call_ts": f"{year}-05-15T17:00:00-04:00",
+    }
+
+
+@pytest.fixture
+def analyzer():
+    return QueryAnalyzer(TICKERS)
+
+
+def navigational(analyzer, text, filters=None):
+    query, _ = analyzer.analyze(SearchQuery(query=text, filters=filters))
+    return is_navigational(query, analyzer)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "NVDA Q3 2025 earnings call",
+        "nvidia q3'25 transcript",
+        "Walmart transcripts",
+        "walmart earnings calls for fiscal 2024",
+        "WMT 2024",
+    ],
+)
+def test_lookups_are_navigational(analyzer, text):
+    assert navigational(analyzer, text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "NVDA data center demand in Q3 2025",
+        "what did Walmart say on the earnings call about tariffs",
+        # A bare company name stays a search
+        "walmart",
+        # No company to list transcripts for
+        "earnings call transcripts 2024",
+    ],
+)
+def test_questions_are_not_navigational(analyzer, text):
+    assert not navigational(analyzer, text)
+
+
+def test_explicit_company_filter_counts(analyzer):
+    assert navigational(analyzer, "earnings calls", Filter(company="WMT"))
+    assert not navigational(
+        analyzer, "earnings calls", Filter(company="WMT", section="qa")
+    )
+
+
+def test_catalog_find():
+    catalog = TranscriptCatalog(
+        [
+            entry("wmt", "q4", "2023"),
+            entry("wmt", "q1", "2024"),
+            entry("wmt", "q2", "2024"),
+            entry("nvda", "q3", "2025"),
+        ]
+    )
+    assert len(catalog) == 4
+    assert [(t.quarter, t.year) for t in catalog.find("WMT")] == [
+        ("q2", "2024"),
+        ("q1", "2024"),
+        ("q4", "2023"),
+    ]
+    assert [t.quarter for t in catalog.find("wmt", year="2024")] == ["q2", "q1"]
+    [nvda] = catalog.find("nvda", quarter="Q3 2025")
+    assert nvda.url.endswith("/nvda-q3-2025/")
+    assert catalog.find("nvda", quarter="Q1 2025") == []
+    assert catalog.find("aapl") == []
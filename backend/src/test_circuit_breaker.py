@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from .circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def fail(breaker: CircuitBreaker):
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("upstream down")
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test-open", failure_threshold=2, recovery_timeout=60)
+    fail(breaker)
+    assert breaker.state == CLOSED
+    fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.check()
+    assert e.value.retry_after >= 1
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("test-probe", failure_threshold=1, recovery_timeout=0.01)
+    fail(breaker)
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    with breaker.guard():
+        # Only one probe is allowed while half-open
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_failure_reopens():
+    breaker = CircuitBreaker("test-reopen", failure_threshold=1, recovery_timeout=0.01)
+    fail(breaker)
+    time.sleep(0.02)
+    fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_breaker_counts_slow_calls_as_failures():
+    breaker = CircuitBreaker(
+        "test-slow", failure_threshold=1, recovery_timeout=60, slow_call_threshold=0
+    )
+    with breaker.guard():
+        time.sleep(0.001)
+    assert breaker.state == OPEN
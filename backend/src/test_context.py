@@ -0,0 +1,80 @@
+import logging
+
+from common.metadata_store import MetadataTable, write_metadata_table
+
+from . import main
+from .services.context import candidate_ids, fetch_chunks, parse_chunk_id
+
+CHUNK = {
+    "url": "https://example.com",
+    "company": "aapl",
+    "quarter": "q1",
+    "year": "2024",
+    "call_ts": "2024-01-30T17:00:00-05:00",
+    "snippet": "...",
+    "primary_names": ["Tim Cook"],
+    "primary_roles": ["CEO"],
+    "primary_types": ["executive"],
+    "participant_names": ["Tim Cook"],
+    "participant_roles": ["CEO"],
+    "participant_types": ["executive"],
+}
+
+
+def test_parse_chunk_id():
+    assert parse_chunk_id("aapl-q1-2024-qa-12") == ("aapl-q1-2024", 12)
+    assert parse_chunk_id("aapl-q1-2024-prepared_remarks-0") == ("aapl-q1-2024", 0)
+    assert parse_chunk_id("aapl-q1-2024-intro-3") is None
+    assert candidate_ids("aapl-q1-2024", [4]) == [
+        "aapl-q1-2024-prepared_remarks-4",
+        "aapl-q1-2024-qa-4",
+    ]
+
+
+def test_fetch_chunks_across_sections(tmp_path):
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(
+        path,
+        {
+            "aapl-q1-2024-prepared_remarks-0": {**CHUNK, "section": "prepared_remarks"},
+            "aapl-q1-2024-prepared_remarks-1": {**CHUNK, "section": "prepared_remarks"},
+            "aapl-q1-2024-qa-2": {**CHUNK, "section": "qa"},
+            "msft-q1-2024-qa-2": {**CHUNK, "company": "msft", "section": "qa"},
+        },
+    )
+    table = MetadataTable(path)
+    chunks = fetch_chunks(None, logging.getLogger(), "aapl-q1-2024", [1, 2, 3], table)
+    assert {p: chunk_id for p, (chunk_id, _) in chunks.items()} == {
+        1: "aapl-q1-2024-prepared_remarks-1",
+        2: "aapl-q1-2024-qa-2",
+    }
+    table.close()
+
+
+def test_fetch_chunks_batches_pinecone_fetch():
+    class FakeClient:
+        def __init__(self):
+            self.calls = []
+
+        def fetch_metadata(self, ids):
+            self.calls.append(ids)
+            return {"aapl-q1-2024-qa-5": {**CHUNK, "section": "qa"}}
+
+    client = FakeClient()
+    chunks = fetch_chunks(client, logging.getLogger(), "aapl-q1-2024", [4, 5, 6])
+    assert list(chunks) == [5]
+    assert len(client.calls) == 1 and len(client.calls[0]) == 6
+
+
+def test_cache_generation_expires_without_a_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "INDEX_CACHE_TTL_S", 60)
+    monkeypatch.setattr(main.time, "time", lambda: 119.0)
+    assert main.index_generation(None) == "ttl:1"
+    monkeypatch.setattr(main.time, "time", lambda: 120.0)
+    assert main.index_generation(None) == "ttl:2"
+
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(path, {"aapl-q1-2024-qa-0": {**CHUNK, "section": "qa"}})
+    table = MetadataTable(path)
+    assert main.index_generation(table) == table.generation != ""
+    table.close()
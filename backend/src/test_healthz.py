@@ -4,6 +4,8 @@ import types
 # stub external deps
 sys.modules["openai"] = types.ModuleType("openai")
 sys.modules["openai"].OpenAI = object
+sys.modules["openai"].AsyncOpenAI = object
+sys.modules["openai"].OpenAIError = Exception
 sys.modules["pinecone"] = types.ModuleType("pinecone")
 sys.modules["pinecone"].Pinecone = object
 sys.modules["pinecone"].ServerlessSpec = object
@@ -0,0 +1,79 @@
+from common.highlights import load_templates, template_version
+from common.metadata_store import MetadataTable, write_metadata_table
+
+from .model.searchQuery import Filter, SearchQuery
+from .services.highlights import find_highlight, highlight_results, transcript_slug
+
+TICKERS = {"AAPL": {"exchange": "NASDAQ", "name": "Apple Inc."}}
+CHUNK = {
+    "url": "https://example.com",
+    "section": "prepared_remarks",
+    "company": "aapl",
+    "quarter": "q1",
+    "year": "2024",
+    "call_ts": "2024-01-30T17:00:00-05:00",
+    "snippet": "We expect revenue to be similar to last year.",
+    "primary_names": ["Luca Maestri"],
+    "primary_roles": ["CFO"],
+    "primary_types": ["executive"],
+    "participant_names": ["Luca Maestri"],
+    "participant_roles": ["CFO"],
+    "participant_types": ["executive"],
+}
+HIGHLIGHTS = {
+    "templates": [{**t, "version": template_version(t)} for t in load_templates()],
+    "answers": {
+        "aapl-q1-2024": {
+            "guidance": {
+                "answer": "- Revenue expected to be flat year over year.",
+                "chunk_ids": ["aapl-q1-2024-prepared_remarks-3"],
+                "scores": [0.71],
+            }
+        }
+    },
+}
+
+
+def search(text: str, **filters) -> SearchQuery:
+    return SearchQuery(query=text, filters=Filter(**filters))
+
+
+def test_transcript_slug_from_filter_or_query():
+    assert transcript_slug(search("guidance", company="AAPL", quarter="Q1 2024")) == (
+        "aapl-q1-2024"
+    )
+    assert transcript_slug(search("guidance in Q1 2024", company="AAPL")) == (
+        "aapl-q1-2024"
+    )
+    assert (
+        transcript_slug(search("guidance in q1 2024 vs q1 2023", company="aapl"))
+        is None
+    )
+    assert transcript_slug(SearchQuery(query="apple guidance q1 2024")) is None
+
+
+def test_find_highlight_requires_template_and_transcript():
+    hit = find_highlight(
+        search("What did Apple say about guidance?", company="AAPL", quarter="Q1 2024"),
+        HIGHLIGHTS,
+        TICKERS,
+    )
+    assert hit["answer"].startswith("- Revenue")
+    for query in [
+        search("guidance for china", company="AAPL", quarter="Q1 2024"),
+        search("guidance", company="AAPL", quarter="Q2 2024"),
+        search("AI", company="AAPL", quarter="Q1 2024"),
+    ]:
+        assert find_highlight(query, HIGHLIGHTS, TICKERS) is None
+
+
+def test_highlight_results_hydrate_from_metadata_table(tmp_path):
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(path, {"aapl-q1-2024-prepared_remarks-3": CHUNK})
+    table = MetadataTable(path)
+    highlight = HIGHLIGHTS["answers"]["aapl-q1-2024"]["guidance"]
+    [result] = highlight_results(highlight, table)
+    assert result.score == 0.71
+    assert result.metadata.primary_speakers[0].name == "Luca Maestri"
+    assert highlight_results(highlight, None) == []
+    table.close()
@@ -0,0 +1,46 @@
+from .admission import UpstreamLimiter
+from .services.llm_router import LLMRouter
+
+
+def router(queued=0, in_flight=0, concurrency=4):
+    limiter = UpstreamLimiter("test_chat", concurrency)
+    limiter.queued = queued
+    limiter.in_flight = in_flight
+    return LLMRouter(limiter)
+
+
+def test_idle_requests_get_the_full_answer():
+    assert router().choose(8.0).name == "full"
+    assert router().choose().name == "full"
+
+
+def test_queue_depth_degrades_the_route():
+    assert router(queued=4, in_flight=4).choose().name == "short"
+    assert router(queued=12, in_flight=4).choose().name == "fast"
+    # Past every route's limit the fastest one still answers
+    assert router(queued=40, in_flight=4).choose().name == "fast"
+
+
+def test_tight_deadline_picks_a_route_that_fits():
+    r = router()
+    assert r.choose(2.0).name == "short"
+    assert r.choose(1.2).name == "fast"
+    assert r.choose(0.2) is None
+
+
+def test_observed_latency_moves_the_choice():
+    r = router()
+    for _ in range(10):
+        r.record(r.primary, 6.0)
+    assert r.primary.latency > 5
+    assert r.choose(4.0).name == "short"
+    assert r.choose().name == "full"
+
+
+def test_wait_for_a_chat_slot_counts_against_the_deadline():
+    r = router(queued=1, in_flight=4, concurrency=4)
+    r.limiter.avg_service_time = 4.0
+    # One waiter plus four in flight at 4s each over four slots is 5s of queue
+    assert r.expected_wait() == 5.0
+    assert r.choose(7.0).name == "short"
+    assert r.choose(6.2).name == "fast"
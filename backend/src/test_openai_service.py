@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import types
+
+from .cache import LRUCache
+from .model.pineconeQueryResponse import ChunkMetadata, PineconeSearchResult
+from .services.llm_router import Route
+from .services.openai_service import (
+    CompletionProgress,
+    generate_llm_response,
+    llm_cache_key,
+)
+
+RESULTS = [
+    PineconeSearchResult(
+        id="aapl-q1-2024-qa-0",
+        score=0.9,
+        metadata=ChunkMetadata(
+            url="https://example.com",
+            section="qa",
+            company="aapl",
+            quarter="q1",
+            year="2024",
+            call_ts="2024-01-30T17:00:00-05:00",
+            snippet="Services revenue hit an all-time record.",
+            primary_speakers=[],
+            participants=[],
+        ),
+    )
+]
+
+
+class FakeStream:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    async def __aiter__(self):
+        for token in self.tokens:
+            await asyncio.sleep(0)
+            delta = types.SimpleNamespace(content=token)
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+
+def fake_client(tokens):
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return FakeStream(tokens)
+
+    completions = types.SimpleNamespace(create=create)
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+
+def test_streamed_answer_is_counted_and_cached(monkeypatch):
+    monkeypatch.setattr(CompletionProgress, "typical_tokens", None)
+    cache, progress = LRUCache(), CompletionProgress()
+    answer, cache = asyncio.run(
+        generate_llm_response(
+            fake_client(["- Record ", "services ", "revenue."]),
+            logging.getLogger("test"),
+            "apple services",
+            RESULTS,
+            cache,
+            progress,
+        )
+    )
+    assert answer == "- Record services revenue."
+    assert progress.tokens == 3
+    assert cache.get(llm_cache_key("apple services", RESULTS)) == {
+        "answer": answer,
+        "route": "full",
+    }
+    assert CompletionProgress.typical_tokens == 3
+
+
+def test_route_sets_model_and_answer_length():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return FakeStream(["Short."])
+
+    completions = types.SimpleNamespace(create=create)
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    route = Route("fast", "small-model", max_tokens=50, max_pressure=4, expected_s=1)
+    cache = LRUCache()
+    asyncio.run(
+        generate_llm_response(
+            client, logging.getLogger("test"), "q", RESULTS, cache, route=route
+        )
+    )
+    assert calls[0]["model"] == "small-model"
+    assert calls[0]["max_tokens"] == 50
+    assert cache.get(llm_cache_key("q", RESULTS))["route"] == "fast"
+
+    # A refresh regenerates instead of serving the cached answer
+    asyncio.run(
+        generate_llm_response(
+            client, logging.getLogger("test"), "q", RESULTS, cache, refresh=True
+        )
+    )
+    assert len(calls) == 2
+    # The primary route leaves the answer length to the model
+    assert "max_tokens" not in calls[1]
+    assert cache.get(llm_cache_key("q", RESULTS))["route"] == "full"
+
+
+def test_near_completion_tracks_typical_length(monkeypatch):
+    monkeypatch.setattr(CompletionProgress, "typical_tokens", None)
+    progress = CompletionProgress()
+    progress.tokens = 100
+    # Nothing has completed yet, so there is nothing to compare against
+    assert not progress.near_completion()
+    CompletionProgress.record_completed(120)
+    assert progress.near_completion()
+    progress.tokens = 50
+    assert not progress.near_completion()
@@ -0,0 +1,113 @@
+import json
+import pytest
+
+from common.metadata_store import MetadataTable, write_metadata_table
+from pathlib import Path
+
+from .model.searchQuery import Filter, SearchQuery
+from .services.participants import (
+    ROLES,
+    ParticipantIndex,
+    UnknownParticipantError,
+    resolve_role,
+)
+
+
+def chunk(company, names, roles):
+    return {"company": company, "primary_names": names, "primary_roles": roles}
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(
+        path,
+        {
+            "aapl-q1-2024-qa-0": chunk("aapl", ["Tim Cook"], ["CEO"]),
+            "aapl-q1-2024-qa-1": chunk("aapl", ["Tim Cook"], ["CEO"]),
+            "aapl-q1-2024-qa-2": chunk("aapl", ["Luca Maestri"], ["CFO"]),
+            "cost-q1-2024-qa-0": chunk("cost", ["Richard Galanti"], ["CFO"]),
+            "cost-q1-2024-qa-1": chunk("cost", ["Tim Cooke"], ["Analyst"]),
+        },
+    )
+    table = MetadataTable(path)
+    yield ParticipantIndex(table)
+    table.close()
+
+
+def test_resolve(index):
+    assert len(index) == 4
+    assert index.resolve("tim cook") == ["Tim Cook"]
+    assert index.resolve("MAESTRI") == ["Luca Maestri"]
+    # Typo
+    assert index.resolve("Luca Maestro") == ["Luca Maestri"]
+    # Scoped to the company filter
+    assert index.resolve("tim cooke", "AAPL") == ["Tim Cook"]
+    assert index.resolve("maestri", "cost") == []
+    assert index.resolve("Jensen Huang") == []
+
+
+def test_apply_resolves_speaker_and_role(index):
+    query = index.apply(
+        SearchQuery(
+            query="services margins", filters=Filter(speaker="cook", role="cfo")
+        )
+    )
+    assert query.filters == Filter(speaker=["Tim Cook"], role="CFO")
+
+    query = index.apply(
+        SearchQuery(query="margins", filters=Filter(role="Chief Financial Officer"))
+    )
+    assert query.filters.role == "CFO"
+    assert query.filters.speaker is None
+
+
+def test_apply_rejects_unknown(index):
+    with pytest.raises(UnknownParticipantError):
+        index.apply(SearchQuery(query="x", filters=Filter(speaker="Jensen Huang")))
+    with pytest.raises(UnknownParticipantError):
+        index.apply(SearchQuery(query="x", filters=Filter(role="janitor")))
+
+
+def test_apply_resolves_each_speaker_in_a_list(index):
+    query = index.apply(
+        SearchQuery(query="x", filters=Filter(speaker=["cook", "maestri", "Tim Cook"]))
+    )
+    assert query.filters.speaker == ["Tim Cook", "Luca Maestri"]
+    with pytest.raises(UnknownParticipantError, match="Jensen Huang"):
+        index.apply(
+            SearchQuery(query="x", filters=Filter(speaker=["cook", "Jensen Huang"]))
+        )
+
+
+def test_without_metadata_table_names_pass_through():
+    index = ParticipantIndex(None)
+    query = index.apply(SearchQuery(query="x", filters=Filter(speaker="Tim Cook")))
+    assert query.filters.speaker == ["Tim Cook"]
+    query = index.apply(
+        SearchQuery(query="x", filters=Filter(speaker=["Tim Cook", "Luca Maestri"]))
+    )
+    assert query.filters.speaker == ["Tim Cook", "Luca Maestri"]
+
+
+def golden_chunks():
+    # Parser output for the scraper's fool.com-style test pages
+    testdata = Path(__file__).resolve().parents[2] / "scraper" / "testdata" / "parser"
+    for path in sorted(testdata.glob("*.json")):
+        yield from json.loads(path.read_text(encoding="utf-8"))["chunks"]
+
+
+def test_roles_match_what_the_parser_stores():
+    chunks = list(golden_chunks())
+    assert chunks
+    primary_roles = {s["role"] for c in chunks for s in c["primary_speakers"]}
+    # Every role the parser leaves on a primary speaker from its own table can
+    # be filtered on (unlisted titles like "Chief Revenue Officer" are kept
+    # verbatim and can't be)
+    assert {"CEO", "CFO", "President", "SVP", "VP"} <= primary_roles
+    assert primary_roles - set(ROLES.values()) == {"Chief Revenue Officer"}
+    # ...and the roles it never leaves there are rejected
+    assert primary_roles.isdisjoint({"Operator", "Investor Relations", "Analyst"})
+    for role in ["operator", "IR", "investor relations", "analyst", "analysts"]:
+        with pytest.raises(UnknownParticipantError):
+            resolve_role(role)
@@ -0,0 +1,41 @@
+from common.periods import fiscal_ordinal
+
+from .client.pineconeClient import build_filter
+from .model.searchQuery import Filter
+
+
+def test_single_values_match_exactly():
+    assert build_filter(Filter(company="aapl", quarter="Q1 2024", section="qa")) == {
+        "company": "aapl",
+        "quarter": "q1",
+        "year": "2024",
+        "section": "qa",
+    }
+    assert build_filter(Filter(year="2024")) == {"year": "2024"}
+    assert build_filter(None) == {}
+
+
+def test_lists_compile_to_in():
+    assert build_filter(
+        Filter(company=["aapl", "msft"], quarter=["Q4 2023", "Q1 2024"])
+    ) == {
+        "company": {"$in": ["aapl", "msft"]},
+        "fiscal_ordinal": {
+            "$in": [fiscal_ordinal("q4", 2023), fiscal_ordinal("q1", 2024)]
+        },
+    }
+    assert build_filter(Filter(year=["2023", "2024"])) == {
+        "year": {"$in": ["2023", "2024"]}
+    }
+
+
+def test_ranges_compile_to_gte_lte():
+    f = Filter.model_validate({"from": "Q1 2023", "to": "Q4 2024"})
+    assert build_filter(f) == {
+        "fiscal_ordinal": {
+            "$gte": fiscal_ordinal("q1", 2023),
+            "$lte": fiscal_ordinal("q4", 2024),
+        }
+    }
+    f = Filter.model_validate({"company": "aapl", "from": "2024-01-01"})
+    assert build_filter(f) == {"company": "aapl", "call_epoch": {"$gte": 1704067200}}
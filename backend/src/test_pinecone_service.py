@@ -0,0 +1,107 @@
+import logging
+import pytest
+
+from common.metadata_store import (
+    FILTERABLE_METADATA_FIELDS,
+    MetadataTable,
+    write_metadata_table,
+)
+
+from .services import pinecone_service
+from .services.pinecone_service import (
+    hydrate_matches,
+    load_metadata_table,
+    parse_metadata,
+    similar_chunks,
+)
+
+CHUNK = {
+    "url": "https://example.com",
+    "section": "qa",
+    "company": "aapl",
+    "quarter": "q1",
+    "year": "2024",
+    "call_ts": "2024-01-30T17:00:00-05:00",
+    "snippet": "Services grew double digits.",
+    "primary_names": ["Tim Cook"],
+    "primary_roles": ["CEO"],
+    "primary_types": ["executive"],
+    "participant_names": ["Tim Cook"],
+    "participant_roles": ["CEO"],
+    "participant_types": ["executive"],
+}
+
+
+class Result:
+    def __init__(self, matches):
+        self.matches = matches
+
+    def to_dict(self):
+        return {"matches": self.matches}
+
+
+class FakeClient:
+    def __init__(self, ids):
+        self.ids = ids
+        self.calls = []
+
+    def query_similar(self, chunk_id, top_k, include_metadata=True):
+        self.calls.append((chunk_id, top_k, include_metadata))
+        return Result(
+            [
+                {
+                    "id": i,
+                    "score": 1.0 - n / 10,
+                    **({"metadata": CHUNK} if include_metadata else {}),
+                }
+                for n, i in enumerate(self.ids[:top_k])
+            ]
+        )
+
+
+def test_similar_chunks_skips_the_source_chunk():
+    client = FakeClient(["aapl-q1-2024-qa-3", "msft-q2-2024-qa-1", "aapl-q4-2023-qa-7"])
+    results = similar_chunks(client, logging.getLogger(), "aapl-q1-2024-qa-3", 2)
+    assert [r.id for r in results] == ["msft-q2-2024-qa-1", "aapl-q4-2023-qa-7"]
+    assert client.calls == [("aapl-q1-2024-qa-3", 3, True)]
+
+
+def test_similar_chunks_hydrates_slim_matches(tmp_path, monkeypatch):
+    monkeypatch.setattr(pinecone_service, "METADATA_MODE", "slim")
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(path, {"msft-q2-2024-qa-1": CHUNK})
+    table = MetadataTable(path)
+    client = FakeClient(["aapl-q1-2024-qa-3", "msft-q2-2024-qa-1"])
+    [result] = similar_chunks(
+        client, logging.getLogger(), "aapl-q1-2024-qa-3", 5, table
+    )
+    assert result.metadata.snippet == "Services grew double digits."
+    assert client.calls[0][2] is False
+    table.close()
+
+
+def test_slim_match_missing_from_the_table_is_dropped(tmp_path):
+    slim = {k: CHUNK[k] for k in FILTERABLE_METADATA_FIELDS if k in CHUNK}
+    assert parse_metadata(slim) is None
+
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(path, {"msft-q2-2024-qa-1": CHUNK})
+    table = MetadataTable(path)
+    matches = [
+        {"id": "aapl-q1-2024-qa-3", "score": 0.9, "metadata": slim},
+        {"id": "msft-q2-2024-qa-1", "score": 0.8, "metadata": slim},
+    ]
+    results = hydrate_matches(logging.getLogger(), matches, table)
+    assert [r.id for r in results] == ["msft-q2-2024-qa-1"]
+    table.close()
+
+
+def test_slim_mode_without_a_table_fails_at_startup(tmp_path, monkeypatch):
+    monkeypatch.setattr(pinecone_service, "METADATA_MODE", "slim")
+    monkeypatch.setattr(
+        pinecone_service, "CHUNK_METADATA_PATH", str(tmp_path / "missing.bin")
+    )
+    with pytest.raises(RuntimeError, match="metadata table"):
+        load_metadata_table(logging.getLogger())
+    monkeypatch.setattr(pinecone_service, "METADATA_MODE", "full")
+    assert load_metadata_table(logging.getLogger()) is None
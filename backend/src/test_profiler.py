@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+from .profiler import (
+    ProfiledRequests,
+    ProfilingMiddleware,
+    StackSampler,
+    render_collapsed,
+)
+
+
+def busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_sees_busy_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy")
+    worker.start()
+    sampler = StackSampler(interval=0.001)
+    try:
+        with sampler.capture() as capture:
+            time.sleep(0.1)
+    finally:
+        stop.set()
+        worker.join()
+    busy = [s for s in capture.counts if s.startswith("busy;")]
+    assert busy
+    assert busy[0].endswith(f"{__name__}:busy_work")
+    # The sampler thread stops once nothing is being captured
+    time.sleep(0.05)
+    assert sampler._thread is None
+
+
+def test_render_collapsed_puts_hottest_stacks_first():
+    from collections import Counter
+
+    counts = Counter({"main;a:f": 2, "main;a:f;b:g": 5})
+    assert render_collapsed(counts) == "main;a:f;b:g 5\nmain;a:f 2\n"
+
+
+def test_middleware_samples_one_in_n_requests_into_the_ring():
+    async def app(scope, receive, send):
+        sum(range(1000))
+
+    profiled = ProfiledRequests(StackSampler(interval=0.001), every=3, size=2)
+    middleware = ProfilingMiddleware(app, profiled)
+
+    async def run():
+        for path in ["/search"] * 9 + ["/healthz"] * 3:
+            await middleware({"type": "http", "path": path}, None, None)
+
+    asyncio.run(run())
+    assert profiled.seen == 9
+    # Three were sampled; the ring only keeps the last two
+    assert len(profiled.ring) == 2
+    assert all(c.label == "/search" for c in profiled.ring)
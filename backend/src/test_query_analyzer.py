@@ -0,0 +1,133 @@
+import pytest
+
+from datetime import datetime, timezone
+
+from .model.searchQuery import Filter, SearchQuery
+from .services.query_analyzer import AhoCorasick, QueryAnalyzer, name_aliases
+
+TICKERS = {
+    "AAPL": {"exchange": "NASDAQ", "name": "Apple Inc."},
+    "MSFT": {"exchange": "NASDAQ", "name": "Microsoft Corporation"},
+    "HD": {"exchange": "NYSE", "name": "The Home Depot, Inc."},
+    "TGT": {"exchange": "NYSE", "name": "Target Corporation"},
+    "T": {"exchange": "NYSE", "name": "AT&T Inc."},
+    "ALL": {"exchange": "NYSE", "name": "The Allstate Corporation"},
+    "UPS": {"exchange": "NYSE", "name": "United Parcel Service, Inc."},
+}
+
+
+@pytest.fixture
+def analyzer():
+    return QueryAnalyzer(TICKERS)
+
+
+def infer(analyzer, text, filters=None):
+    return analyzer.analyze(SearchQuery(query=text, filters=filters))
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick({"he": 1, "she": 2, "hers": 3})
+    assert sorted(matcher.finditer("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+
+
+def test_name_aliases_drop_suffixes_and_ambiguous_words():
+    assert name_aliases("The Home Depot, Inc.") == ["the home depot inc", "home depot"]
+    assert name_aliases("Target Corporation") == ["target corporation"]
+
+
+def test_company_and_year_from_text(analyzer):
+    query, inferred = infer(analyzer, "Apple AI chip strategy 2024")
+    assert inferred == Filter(company="AAPL", year="2024")
+    assert query.filters == inferred
+    assert query.query == "Apple AI chip strategy 2024"
+
+
+@pytest.mark.parametrize(
+    "text,quarter",
+    [
+        ("HD housing commentary Q3 2023", "Q3 2023"),
+        ("Home Depot Q3 FY24 housing", "Q3 2024"),
+        ("Home Depot 3Q23 housing", "Q3 2023"),
+        ("Home Depot third quarter 2023", "Q3 2023"),
+        ("Home Depot Q1 results in 2024", "Q1 2024"),
+    ],
+)
+def test_quarter_formats(analyzer, text, quarter):
+    _, inferred = infer(analyzer, text)
+    assert inferred == Filter(company="HD", quarter=quarter)
+
+
+def test_tickers_need_caps_or_dollar(analyzer):
+    assert infer(analyzer, "$T wireless churn")[1].company == "T"
+    assert infer(analyzer, "AT&T wireless churn")[1].company == "T"
+    # Single letters and tickers that are words need the "$"
+    assert infer(analyzer, "T wireless churn")[1] is None
+    assert infer(analyzer, "ALL of the margin commentary")[1] is None
+    assert infer(analyzer, "$ALL catastrophe losses")[1].company == "ALL"
+    # Whole words only
+    assert infer(analyzer, "startups hiring")[1] is None
+    # "target" is only the company by its full name
+    assert infer(analyzer, "gross margin target")[1] is None
+
+
+def test_several_companies_or_periods_become_lists(analyzer):
+    _, inferred = infer(analyzer, "Apple vs Microsoft services growth")
+    assert inferred == Filter(company=["AAPL", "MSFT"])
+    _, inferred = infer(analyzer, "pricing in 2024 and 2023")
+    assert inferred == Filter(year=["2023", "2024"])
+    _, inferred = infer(analyzer, "Apple Q2 2024 vs Q2 2023")
+    assert inferred == Filter(company="AAPL", quarter=["Q2 2023", "Q2 2024"])
+
+
+@pytest.mark.parametrize(
+    "text,bounds",
+    [
+        ("AI capex since 2023", {"date_from": "Q1 2023"}),
+        ("AI capex starting in Q3 2023", {"date_from": "Q3 2023"}),
+        ("AI capex through 2023", {"date_to": "Q4 2023"}),
+        ("AI capex before Q1 2024", {"date_to": "Q4 2023"}),
+        (
+            "AI capex from 2022 to Q2 2024",
+            {"date_from": "Q1 2022", "date_to": "Q2 2024"},
+        ),
+        ("AI capex over the last 4 quarters", {"date_from": "2024-05-30"}),
+        ("AI capex in the past two years", {"date_from": "2023-06-01"}),
+        ("AI capex since last year", {"date_from": "2024-06-01"}),
+        ("AI capex during the previous quarter", {"date_from": "2025-03-02"}),
+    ],
+)
+def test_date_ranges(analyzer, text, bounds):
+    now = datetime(2025, 6, 2, tzinfo=timezone.utc)
+    _, inferred = analyzer.analyze(SearchQuery(query=text), now)
+    # Range years aren't also read as a year filter
+    assert inferred == Filter(**bounds)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "How did Apple services revenue grow compared to last year",
+        "Apple services revenue vs last quarter",
+        "Is Nvidia data center growth faster than last year",
+        "What changed from the previous quarter at Microsoft",
+        "last year's guidance for Azure",
+    ],
+)
+def test_comparisons_are_not_date_ranges(analyzer, text):
+    now = datetime(2025, 6, 2, tzinfo=timezone.utc)
+    _, inferred = analyzer.analyze(SearchQuery(query=text), now)
+    inferred = inferred or Filter()
+    assert inferred.date_from is None and inferred.date_to is None
+
+
+def test_explicit_filters_win(analyzer):
+    query, inferred = infer(
+        analyzer, "Apple Q1 2024", Filter(company="MSFT", section="qa")
+    )
+    assert inferred == Filter(quarter="Q1 2024")
+    assert query.filters == Filter(company="MSFT", quarter="Q1 2024", section="qa")
+
+    query, inferred = infer(analyzer, "Apple 2024", Filter(quarter="Q4 2023"))
+    assert inferred == Filter(company="AAPL")
+    assert query.filters.quarter == "Q4 2023"
+    assert query.filters.year is None
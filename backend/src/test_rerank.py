@@ -0,0 +1,91 @@
+import logging
+
+import numpy as np
+
+from .services.pinecone_service import query_index
+from .services.rerank import mmr
+from .test_pinecone_service import CHUNK, Result
+
+
+def test_mmr_skips_near_duplicates():
+    query = np.array([1.0, 0.0, 0.0])
+    candidates = np.array(
+        [
+            [0.9, 0.1, 0.0],
+            [0.9, 0.11, 0.0],  # near-duplicate of the first
+            [0.7, 0.0, 0.7],
+        ]
+    )
+    assert mmr(query, candidates, 2, lambda_=0.5) == [0, 2]
+
+
+def test_mmr_with_lambda_one_ranks_by_relevance():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[0.5, 0.5], [1.0, 0.0], [1.0, 0.1]])
+    assert mmr(query, candidates, 3, lambda_=1.0) == [1, 2, 0]
+
+
+def test_mmr_caps_results_per_transcript():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[1.0, 0.0], [1.0, 0.05], [1.0, 0.1], [0.2, 1.0]])
+    groups = ["aapl-q1-2024"] * 3 + ["msft-q1-2024"]
+    picked = mmr(query, candidates, 3, lambda_=1.0, groups=groups, max_per_group=2)
+    assert picked == [0, 1, 3]
+
+
+def test_mmr_backfills_when_caps_exhaust_candidates():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+    picked = mmr(query, candidates, 5, groups=["a", "a", "b"], max_per_group=1)
+    assert picked == [0, 2, 1]
+
+
+def test_mmr_fills_k_from_a_single_transcript():
+    rng = np.random.default_rng(0)
+    candidates = rng.normal(size=(20, 8))
+    picked = mmr(candidates[0], candidates, 8, groups=["a"] * 20, max_per_group=3)
+    assert len(picked) == len(set(picked)) == 8
+    assert picked == mmr(candidates[0], candidates, 8)
+
+
+class FakeClient:
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+
+    def query_search(
+        self, query_embedding, filters, include_metadata, top_k, include_values
+    ):
+        self.calls.append((top_k, include_values))
+        return Result(
+            [
+                {
+                    "id": chunk_id,
+                    "score": 1.0,
+                    "metadata": CHUNK,
+                    **({"values": v} if include_values else {}),
+                }
+                for chunk_id, v in list(self.vectors.items())[:top_k]
+            ]
+        )
+
+
+def test_query_index_overfetches_and_reranks():
+    client = FakeClient(
+        {
+            "aapl-q1-2024-qa-1": [1.0, 0.06],
+            "aapl-q1-2024-qa-2": [1.0, 0.05],
+            "msft-q1-2024-qa-1": [0.0, 1.0],
+        }
+    )
+    results = query_index(
+        client, logging.getLogger(), np.array([1.0, 1.0]), None, top_k=2, candidates=3
+    )
+    assert client.calls == [(3, True)]
+    assert [r.id for r in results] == ["aapl-q1-2024-qa-1", "msft-q1-2024-qa-1"]
+
+
+def test_query_index_without_overfetch_keeps_index_order():
+    client = FakeClient({"aapl-q1-2024-qa-1": [1.0, 0.0]})
+    query_index(client, logging.getLogger(), np.array([1.0, 0.0]), None, 8, 8)
+    assert client.calls == [(8, False)]
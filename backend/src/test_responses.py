@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from .model.searchQuery import Filter
+from .model.searchResponse import SearchResponse, Snippet
+from .responses import ModelResponse, parse_fields
+
+RESPONSE = SearchResponse(
+    answer="Services hit a record.",
+    snippets=[
+        Snippet(
+            chunk_id="aapl-q1-2024-qa-3",
+            company="aapl",
+            quarter="q1",
+            year="2024",
+            url="https://example.com",
+            participants={"Tim Cook": "CEO"},
+            section="qa",
+            text="Services grew double digits.",
+        )
+    ],
+    inferred_filters=Filter(company="aapl", date_from="2024-01-01"),
+)
+
+
+def render(fields=None):
+    return json.loads(
+        ModelResponse(RESPONSE, parse_fields(fields, SearchResponse)).body
+    )
+
+
+def test_full_response_matches_fastapi_encoding():
+    body = render()
+    assert body == json.loads(RESPONSE.model_dump_json(by_alias=True))
+    assert body["inferred_filters"]["from"] == "2024-01-01"
+
+
+def test_fields_select_nested_snippet_fields():
+    body = render("answer, snippets.company,snippets.text")
+    assert body == {
+        "answer": "Services hit a record.",
+        "snippets": [{"company": "aapl", "text": "Services grew double digits."}],
+    }
+
+
+def test_fields_select_inside_a_single_model():
+    assert render("inferred_filters.company") == {
+        "inferred_filters": {"company": "aapl"}
+    }
+
+
+def test_whole_field_wins_over_a_subfield():
+    body = render("snippets.text,snippets")
+    assert body["snippets"][0]["participants"] == {"Tim Cook": "CEO"}
+
+
+@pytest.mark.parametrize("fields", ["nope", "snippets.nope", "answer.text"])
+def test_unknown_fields_are_rejected(fields):
+    with pytest.raises(ValueError):
+        parse_fields(fields, SearchResponse)
@@ -0,0 +1,87 @@
+import asyncio
+import types
+
+from . import main
+from .cache import LRUCache
+from .model.searchQuery import SearchQuery
+from .services.llm_router import LLMRouter
+from .services.openai_service import llm_cache_key, query_cache_key
+from .services.participants import ParticipantIndex
+from .services.query_analyzer import QueryAnalyzer
+from .test_openai_service import RESULTS
+
+QUERY = "services revenue"
+
+
+class FailingClient:
+    """Chat completions that fail, after other searches evict the LLM cache."""
+
+    def __init__(self, cache: LRUCache):
+        self.cache = cache
+        self.calls = 0
+        self.chat = types.SimpleNamespace(
+            completions=types.SimpleNamespace(create=self.create)
+        )
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        for i in range(self.cache.capacity):
+            self.cache.set(f"other-{i}", {"answer": "other", "route": "full"})
+        raise main.OpenAIError("upstream unavailable")
+
+
+def request_for(cache: LRUCache, client: FailingClient):
+    limiters = main.build_limiters()
+    embeddings = LRUCache()
+    embeddings.set(query_cache_key(QUERY), [1.0, 0.0])
+    state = types.SimpleNamespace(
+        oai_client=client,
+        pinecone_client=object(),
+        limiters=limiters,
+        breakers=main.build_breakers(),
+        query_analyzer=QueryAnalyzer({}),
+        participants=ParticipantIndex(None),
+        catalog=None,
+        highlights=None,
+        ticker_metadata={},
+        embeddings_cache=embeddings,
+        metadata_table=None,
+        llm_response_cache=cache,
+        llm_router=LLMRouter(limiters["openai_chat"]),
+        answer_cache=LRUCache(),
+    )
+    return types.SimpleNamespace(app=types.SimpleNamespace(state=state))
+
+
+def search(cache: LRUCache, client: FailingClient, monkeypatch):
+    monkeypatch.setattr(main, "query_index", lambda *args: RESULTS)
+    return asyncio.run(
+        main.run_search(
+            request_for(cache, client), SearchQuery(query=QUERY), main.SearchProgress()
+        )
+    )
+
+
+def test_failed_refresh_serves_the_evicted_cached_answer(monkeypatch):
+    cache = LRUCache()
+    # Answered earlier by a degraded route, so an idle router regenerates it
+    cache.set(llm_cache_key(QUERY, RESULTS), {"answer": "Short.", "route": "fast"})
+    client = FailingClient(cache)
+
+    response = search(cache, client, monkeypatch)
+
+    assert client.calls == 1
+    assert cache.get(llm_cache_key(QUERY, RESULTS)) is None
+    assert response.answer == "Short."
+    assert [s.chunk_id for s in response.snippets] == [RESULTS[0].id]
+
+
+def test_failed_refresh_keeps_a_cached_non_answer_empty(monkeypatch):
+    cache = LRUCache()
+    cache.set(
+        llm_cache_key(QUERY, RESULTS),
+        {"answer": "No directly relevant insights found.", "route": "fast"},
+    )
+    response = search(cache, FailingClient(cache), monkeypatch)
+    assert response.answer is None
+    assert response.snippets
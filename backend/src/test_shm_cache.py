@@ -0,0 +1,52 @@
+import numpy as np
+
+from .shm_cache import HEADER, SharedEmbeddingCache
+
+
+def make_cache(tmp_path, **kwargs):
+    return SharedEmbeddingCache(tmp_path / "embeddings.slab", dims=8, **kwargs)
+
+
+def test_set_and_get_round_trip(tmp_path):
+    cache = make_cache(tmp_path, slots=64)
+    v = np.arange(8, dtype=np.float32)
+    assert cache.get("q") is None
+    cache.set("q", v)
+    np.testing.assert_array_equal(cache.get("q"), v)
+    cache.set("q", v * 2)
+    np.testing.assert_array_equal(cache.get("q"), v * 2)
+    cache.close()
+
+
+def test_workers_share_the_slab(tmp_path):
+    writer, reader = make_cache(tmp_path), make_cache(tmp_path)
+    writer.set("shared", np.ones(8, dtype=np.float32))
+    np.testing.assert_array_equal(reader.get("shared"), np.ones(8))
+    writer.close()
+    reader.close()
+
+
+def test_full_bucket_evicts_one_entry(tmp_path):
+    # A single bucket, so every key competes for the same four slots
+    cache = make_cache(tmp_path, slots=4, ways=4)
+    for i in range(5):
+        cache.set(f"q{i}", np.full(8, i, dtype=np.float32))
+    hits = [i for i in range(5) if cache.get(f"q{i}") is not None]
+    assert len(hits) == 4 and 4 in hits
+    cache.close()
+
+
+def test_torn_slot_reads_as_miss(tmp_path):
+    cache = make_cache(tmp_path, slots=1, ways=1)
+    cache.set("q", np.ones(8, dtype=np.float32))
+    # Simulate a concurrent writer halfway through replacing the vector
+    cache._mm[HEADER.size : HEADER.size + 4] = np.float32(7).tobytes()
+    assert cache.get("q") is None
+    cache.close()
+
+
+def test_wrong_width_is_ignored(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("q", np.ones(4, dtype=np.float32))
+    assert cache.get("q") is None
+    cache.close()
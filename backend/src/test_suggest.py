@@ -0,0 +1,132 @@
+import threading
+
+from common.metadata_store import MetadataTable, write_metadata_table
+
+from .services import suggest as suggest_module
+from .services.suggest import PopularQueries, Suggester
+
+TICKERS = {
+    "AAPL": {"exchange": "NASDAQ", "name": "Apple Inc."},
+    "AMAT": {"exchange": "NASDAQ", "name": "Applied Materials, Inc."},
+    "COST": {"exchange": "NASDAQ", "name": "Costco Wholesale Corporation"},
+}
+
+
+def chunk(company, names, roles, types):
+    return {
+        "company": company,
+        "primary_names": names,
+        "primary_roles": roles,
+        "primary_types": types,
+    }
+
+
+def build(tmp_path) -> Suggester:
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(
+        path,
+        {
+            "aapl-q1-2024-qa-0": chunk("aapl", ["Tim Cook"], ["CEO"], ["executive"]),
+            "aapl-q1-2024-qa-1": chunk("aapl", ["Tim Cook"], ["CEO"], ["executive"]),
+            # Analyst without a role, so roles don't line up with names
+            "aapl-q1-2024-qa-2": chunk(
+                "aapl",
+                ["Tim Cook", "Amit Daryanani"],
+                ["CEO"],
+                ["executive", "analyst"],
+            ),
+            "cost-q1-2024-qa-0": chunk("cost", ["Operator"], [], ["operator"]),
+        },
+    )
+    table = MetadataTable(path)
+    suggester = Suggester(TICKERS, table)
+    table.close()
+    return suggester
+
+
+def test_companies_match_name_or_ticker(tmp_path):
+    suggester = build(tmp_path)
+    assert [s.text for s in suggester.suggest("app")] == [
+        "Apple Inc.",
+        "Applied Materials, Inc.",
+    ]
+    [apple] = suggester.suggest("AAPL")
+    assert apple.kind == "company" and apple.ticker == "AAPL"
+    # Later words match too, but corporate suffixes don't
+    assert [s.text for s in suggester.suggest("materials")] == [
+        "Applied Materials, Inc."
+    ]
+    assert suggester.suggest("inc") == []
+
+
+def test_people_come_from_chunk_metadata(tmp_path):
+    suggester = build(tmp_path)
+    [tim] = suggester.suggest("coo")
+    assert (tim.text, tim.kind, tim.ticker, tim.detail) == (
+        "Tim Cook",
+        "executive",
+        "AAPL",
+        "CEO",
+    )
+    [amit] = suggester.suggest("amit")
+    assert (amit.kind, amit.ticker, amit.detail) == ("analyst", None, None)
+    assert suggester.suggest("operator") == []
+
+
+def test_popular_queries_are_suggested(tmp_path, monkeypatch):
+    monkeypatch.setattr(suggest_module, "POPULAR_REBUILD_S", 0)
+    suggester = build(tmp_path)
+    for _ in range(4):
+        suggester.record_query("Apple   AI chips?")
+    for _ in range(3):
+        suggester.record_query("apple services growth")
+    texts = [s.text for s in suggester.suggest("appl", limit=4)]
+    assert texts == [
+        "Apple Inc.",
+        "Applied Materials, Inc.",
+        "apple ai chips",
+        "apple services growth",
+    ]
+    assert [s.text for s in suggester.suggest("apple a")] == ["apple ai chips"]
+
+
+def test_popular_queries_are_bounded():
+    popular = PopularQueries(capacity=2)
+    for i in range(5):
+        popular.record(f"query {i}")
+    assert len(popular.counts) <= 4
+
+
+def test_rare_queries_are_not_suggested(monkeypatch):
+    monkeypatch.setattr(suggest_module, "POPULAR_REBUILD_S", 0)
+    popular = PopularQueries(min_count=2)
+    popular.record("apple layoffs in cupertino")
+    assert popular.search("apple", 8) == []
+    popular.record("Apple layoffs in Cupertino")
+    assert [s.text for s in popular.search("apple", 8)] == [
+        "apple layoffs in cupertino"
+    ]
+
+
+def test_popular_queries_survive_concurrent_record_and_search(monkeypatch):
+    monkeypatch.setattr(suggest_module, "POPULAR_REBUILD_S", 0)
+    popular = PopularQueries(capacity=50, min_count=1)
+    errors = []
+
+    def record():
+        for i in range(2000):
+            popular.record(f"query {i}")
+
+    def search():
+        try:
+            for _ in range(2000):
+                popular.search("query", 8)
+        except RuntimeError as e:  # "dictionary changed size during iteration"
+            errors.append(e)
+
+    threads = [threading.Thread(target=f) for f in (record, search, search)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
@@ -0,0 +1,8 @@
+from pathlib import Path
+
+# Where the scraper exports the transcript catalog and the backend reads it
+# (both honour CATALOG_PATH). It sits under backend/data so it ships with the
+# app.
+DEFAULT_CATALOG_PATH = str(
+    Path(__file__).resolve().parents[1] / "backend" / "data" / "transcripts.json"
+)
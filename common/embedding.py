@@ -0,0 +1,54 @@
+import base64
+import os
+
+import numpy as np
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+FULL_EMBEDDING_DIMENSIONS = 1536
+
+# text-embedding-3 models are Matryoshka-trained: the leading dimensions of an
+# embedding carry most of the signal, so the API can return a shortened (and
+# re-normalized) vector. The index must be created with the same width.
+EMBEDDING_DIMENSIONS = int(
+    os.getenv("EMBEDDING_DIMENSIONS", str(FULL_EMBEDDING_DIMENSIONS))
+)
+
+if not 0 < EMBEDDING_DIMENSIONS <= FULL_EMBEDDING_DIMENSIONS:
+    raise ValueError(
+        f"EMBEDDING_DIMENSIONS must be between 1 and {FULL_EMBEDDING_DIMENSIONS}, "
+        f"got {EMBEDDING_DIMENSIONS}"
+    )
+
+
+def embedding_request_kwargs(dimensions: int = EMBEDDING_DIMENSIONS) -> dict:
+    """
+    Keyword arguments for `embeddings.create` at the configured width.
+
+    Embeddings are requested as base64 so they can be decoded straight into
+    float32 arrays with `decode_embedding`, instead of the SDK building a list
+    of Python floats per vector.
+    """
+    kwargs = {"model": EMBEDDING_MODEL, "encoding_format": "base64"}
+    if dimensions != FULL_EMBEDDING_DIMENSIONS:
+        kwargs["dimensions"] = dimensions
+    return kwargs
+
+
+def index_name_for(base: str, dimensions: int = EMBEDDING_DIMENSIONS) -> str:
+    """
+    Each embedding width needs its own index, e.g. `transcripts-v2-512d`.
+    The full-width index keeps its original name.
+    """
+    if dimensions == FULL_EMBEDDING_DIMENSIONS:
+        return base
+    return f"{base}-{dimensions}d"
+
+
+def decode_embedding(data: str | list[float]) -> np.ndarray:
+    """
+    Decode a base64 embedding payload into a read-only float32 array that
+    views the decoded bytes directly (no per-element conversion or copy).
+    """
+    if isinstance(data, str):
+        return np.frombuffer(base64.b64decode(data), dtype="<f4")
+    return np.asarray(data, dtype=np.float32)
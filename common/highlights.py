@@ -0,0 +1,99 @@
+import hashlib
+import json
+import re
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+TEMPLATES_PATH = Path(__file__).resolve().parent / "highlight_templates.json"
+# Where the scraper exports materialized answers and the backend reads them
+# (both honour HIGHLIGHTS_PATH). It sits under backend/data so it ships with
+# the app.
+DEFAULT_HIGHLIGHTS_PATH = str(
+    Path(__file__).resolve().parents[1] / "backend" / "data" / "highlights.json"
+)
+
+# Words that frame a question without changing its topic, e.g.
+# "what did apple say about guidance" -> {"guidance"}
+FRAMING_WORDS = {
+    "a",
+    "about",
+    "an",
+    "and",
+    "around",
+    "call",
+    "company",
+    "comment",
+    "comments",
+    "did",
+    "discuss",
+    "discussed",
+    "do",
+    "does",
+    "earnings",
+    "for",
+    "in",
+    "its",
+    "management",
+    "mention",
+    "mentioned",
+    "of",
+    "on",
+    "quarter",
+    "regarding",
+    "remarks",
+    "said",
+    "say",
+    "talk",
+    "the",
+    "their",
+    "they",
+    "to",
+    "update",
+    "what",
+}
+QUARTER_OR_YEAR = re.compile(r"q[1-4]|(19|20)\d\d|fy\d{2,4}")
+
+
+def load_templates(path: str | Path = TEMPLATES_PATH) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def template_version(template: dict) -> str:
+    """Changes whenever the question is reworded, so stale answers get regenerated."""
+    text = f"{template['topic']}|{template['question']}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+
+
+def query_terms(query: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", query.lower())
+
+
+def company_terms(ticker: str, name: str) -> set[str]:
+    """Words that just name the company, e.g. {"aapl", "apple", "inc"}."""
+    return {ticker.lower(), *query_terms(name)}
+
+
+def match_template(
+    query: str, templates: Iterable[dict], ignore: set[str] = frozenset()
+) -> Optional[dict]:
+    """
+    Return the template whose keywords cover every topical word in `query`,
+    after dropping framing words, quarters/years and the `ignore` set (the
+    company's own name). Queries with anything else in them don't match, so
+    only questions the precomputed answer actually addresses are served.
+    """
+    topical = {
+        term
+        for term in query_terms(query)
+        if term not in FRAMING_WORDS
+        and term not in ignore
+        and not QUARTER_OR_YEAR.fullmatch(term)
+    }
+    if not topical:
+        return None
+    for template in templates:
+        if topical <= set(template["keywords"]):
+            return template
+    return None
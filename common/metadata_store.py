@@ -0,0 +1,112 @@
+import json
+import mmap
+import os
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Where the scraper exports the table and the backend reads it (both honour
+# CHUNK_METADATA_PATH). It sits under backend/data so it ships with the app.
+DEFAULT_CHUNK_METADATA_PATH = str(
+    Path(__file__).resolve().parents[1] / "backend" / "data" / "chunk_metadata.bin"
+)
+
+# Fields kept on the Pinecone vector when the index runs in "slim" mode. Everything
+# else lives in the local metadata table and is hydrated by the backend.
+FILTERABLE_METADATA_FIELDS = (
+    "company",
+    "quarter",
+    "year",
+    "section",
+    "primary_names",
+    "primary_roles",
+    "call_epoch",
+    "fiscal_ordinal",
+)
+
+
+def index_path(path: str | Path) -> Path:
+    return Path(f"{path}.idx.json")
+
+
+def write_metadata_table(path: str | Path, records: Dict[str, Dict[str, Any]]):
+    """
+    Write chunk metadata records to `path` as concatenated JSON blobs, plus a
+    sidecar `<path>.idx.json` mapping chunk_id -> [offset, length].
+
+    Both files are written to a temp path first and swapped in, so a reader
+    never sees a half-written table.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offsets = {}
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        offset = 0
+        for chunk_id in sorted(records):
+            blob = json.dumps(records[chunk_id], separators=(",", ":")).encode("utf-8")
+            f.write(blob)
+            offsets[chunk_id] = [offset, len(blob)]
+            offset += len(blob)
+
+    idx = {
+        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "count": len(offsets),
+        "offsets": offsets,
+    }
+    tmp_idx_path = index_path(tmp_path)
+    with open(tmp_idx_path, "w", encoding="utf-8") as f:
+        json.dump(idx, f, separators=(",", ":"))
+
+    tmp_path.replace(path)
+    tmp_idx_path.replace(index_path(path))
+
+
+class MetadataTable:
+    """
+    Read-only, memory-mapped view over a table written by `write_metadata_table`.
+
+    Only the offset index is held in memory; records are decoded on lookup.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(index_path(self.path), "r", encoding="utf-8") as f:
+            idx = json.load(f)
+        self.generation: str = idx.get("generated_at", "")
+        self.offsets: Dict[str, list] = idx["offsets"]
+        self._file = open(self.path, "rb")
+        self._mm = None
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["MetadataTable"]:
+        """Return the table at `path`, or None if it has not been exported yet."""
+        if not Path(path).is_file() or not index_path(path).is_file():
+            return None
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self.offsets
+
+    def get(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        loc = self.offsets.get(chunk_id)
+        if loc is None or self._mm is None:
+            return None
+        offset, length = loc
+        return json.loads(self._mm[offset : offset + length])
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for chunk_id in self.offsets:
+            yield chunk_id, self.get(chunk_id)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
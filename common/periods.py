@@ -0,0 +1,53 @@
+import re
+
+from datetime import datetime, time, timedelta, timezone
+
+# "Q1 2024", the format Filter.quarter uses
+QUARTER_FORMAT = re.compile(r"[Qq]([1-4]) ((?:19|20)\d\d)")
+
+
+def fiscal_ordinal(quarter: str, year: str | int) -> int:
+    """Sortable number for a fiscal quarter: ("q1", "2024") -> 8096."""
+    return int(year) * 4 + int(str(quarter).lstrip("Qq")) - 1
+
+
+def parse_quarter(value: str) -> tuple[str, str] | None:
+    """Split "Q1 2024" into ("q1", "2024"); None if `value` isn't a quarter."""
+    match = QUARTER_FORMAT.fullmatch(value.strip())
+    if match is None:
+        return None
+    return f"q{match.group(1)}", match.group(2)
+
+
+def call_epoch(call_ts: str) -> int:
+    """Unix seconds for an ISO call timestamp ("2024-05-02T17:00:00-04:00")."""
+    return int(parse_datetime(call_ts).timestamp())
+
+
+def parse_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """
+    ISO date or timestamp; a bare date means the start of that day in UTC,
+    or its last second with `end_of_day`. Raises ValueError otherwise.
+    """
+    parsed = datetime.fromisoformat(value.strip())
+    if len(value.strip()) == 10 and end_of_day:
+        parsed = datetime.combine(parsed.date(), time.max)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def range_bound(value: str, end: bool = False) -> tuple[str, int]:
+    """
+    The metadata field and value a `from`/`to` bound compiles to: quarters
+    ("Q1 2024") compare fiscal_ordinal, dates compare call_epoch.
+    """
+    quarter = parse_quarter(value)
+    if quarter is not None:
+        return "fiscal_ordinal", fiscal_ordinal(*quarter)
+    return "call_epoch", int(parse_datetime(value, end_of_day=end).timestamp())
+
+
+def days_ago(days: int, now: datetime | None = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).date().isoformat()
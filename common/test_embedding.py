@@ -0,0 +1,36 @@
+import base64
+
+import numpy as np
+
+from common.embedding import (
+    FULL_EMBEDDING_DIMENSIONS,
+    decode_embedding,
+    embedding_request_kwargs,
+    index_name_for,
+)
+
+
+def test_decode_base64_embedding():
+    values = np.array([0.25, -1.5, 3.0], dtype="<f4")
+    encoded = base64.b64encode(values.tobytes()).decode("ascii")
+    decoded = decode_embedding(encoded)
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, values)
+    assert not decoded.flags.writeable
+
+
+def test_decode_float_list_embedding():
+    decoded = decode_embedding([0.5, 1.0])
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, 1.0]
+
+
+def test_embedding_request_kwargs_width():
+    full = embedding_request_kwargs(FULL_EMBEDDING_DIMENSIONS)
+    assert "dimensions" not in full
+    assert full["encoding_format"] == "base64"
+    assert embedding_request_kwargs(512)["dimensions"] == 512
+    assert index_name_for("transcripts-v2", 512) == "transcripts-v2-512d"
+    assert index_name_for("transcripts-v2", FULL_EMBEDDING_DIMENSIONS) == (
+        "transcripts-v2"
+    )
@@ -0,0 +1,36 @@
+from common.highlights import (
+    company_terms,
+    load_templates,
+    match_template,
+    template_version,
+)
+
+TEMPLATES = load_templates()
+APPLE = company_terms("AAPL", "Apple Inc.")
+
+
+def test_matches_topic_questions():
+    cases = {
+        "What did Apple say about guidance?": "guidance",
+        "AAPL outlook q3 2024": "guidance",
+        "apple comments on share buybacks and dividends": "capital_return",
+        "AI": "ai",
+    }
+    for query, template_id in cases.items():
+        assert match_template(query, TEMPLATES, APPLE)["id"] == template_id
+
+
+def test_rejects_questions_outside_a_template():
+    for query in [
+        "What did Apple say about guidance for China?",
+        "apple vision pro",
+        "what did apple say",
+    ]:
+        assert match_template(query, TEMPLATES, APPLE) is None
+
+
+def test_template_version_tracks_wording():
+    template = dict(TEMPLATES[0])
+    version = template_version(template)
+    template["question"] += " Be brief."
+    assert template_version(template) != version
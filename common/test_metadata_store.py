@@ -0,0 +1,32 @@
+from common.metadata_store import MetadataTable, write_metadata_table
+
+
+def test_metadata_table_roundtrip(tmp_path):
+    path = tmp_path / "chunk_metadata.bin"
+    records = {
+        "aapl-q1-2024-qa-3": {"company": "aapl", "snippet": "Services grew."},
+        "msft-q2-2023-prepared_remarks-0": {"company": "msft", "snippet": "Azure."},
+    }
+    write_metadata_table(path, records)
+
+    table = MetadataTable.load(path)
+    assert len(table) == 2
+    assert "aapl-q1-2024-qa-3" in table
+    assert table.get("aapl-q1-2024-qa-3") == records["aapl-q1-2024-qa-3"]
+    assert table.get("missing") is None
+    assert dict(table.items()) == records
+    assert table.generation
+    table.close()
+
+
+def test_metadata_table_missing(tmp_path):
+    assert MetadataTable.load(tmp_path / "nope.bin") is None
+
+
+def test_metadata_table_empty(tmp_path):
+    path = tmp_path / "chunk_metadata.bin"
+    write_metadata_table(path, {})
+    table = MetadataTable.load(path)
+    assert len(table) == 0
+    assert table.get("anything") is None
+    table.close()
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from common.periods import (
+    call_epoch,
+    days_ago,
+    fiscal_ordinal,
+    parse_quarter,
+    range_bound,
+)
+
+
+def test_fiscal_ordinal_sorts_quarters():
+    assert fiscal_ordinal("q4", "2023") + 1 == fiscal_ordinal("Q1", 2024)
+    assert parse_quarter("Q3 2024") == ("q3", "2024")
+    assert parse_quarter("third quarter") is None
+
+
+def test_call_epoch():
+    assert call_epoch("2024-05-02T17:00:00-04:00") == 1714683600
+
+
+def test_range_bound():
+    assert range_bound("Q1 2024") == ("fiscal_ordinal", fiscal_ordinal("q1", 2024))
+    assert range_bound("2024-05-02") == ("call_epoch", 1714608000)
+    # A bare end date covers the whole day
+    assert range_bound("2024-05-02", end=True) == ("call_epoch", 1714694399)
+    with pytest.raises(ValueError):
+        range_bound("last spring")
+
+
+def test_days_ago():
+    now = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    assert days_ago(365, now) == "2024-03-01"
@@ -39,6 +39,7 @@ function App() {
   // ----------------------------------------------------
 
   const [snippets, setSnippets] = useState([])
+  const [transcripts, setTranscripts] = useState([])
 
   const SkeletonCard = () => (
     <div className="border border-gray-200 rounded-2xl bg-white shadow-sm p-6 animate-pulse">
@@ -91,6 +92,7 @@ function App() {
     setError(null)
     setAnswer('')
     setSnippets([])
+    setTranscripts([])
     try {
       const queryKey = JSON.stringify({ query, companyTicker, section })
       const cached = getCachedResult(queryKey)
@@ -98,6 +100,7 @@ function App() {
       if (cached) {
         setAnswer(cached.answer)
         setSnippets(cached.snippets)
+        setTranscripts(cached.transcripts || [])
         return
       }
 
@@ -113,15 +116,28 @@ function App() {
         },
         withCredentials: false,
       })
-      if (!response.data.answer) {
-        setError('No results found. Please try another query.')
-      } else {
-        setAnswer(response.data.answer)
-        setSnippets(response.data.snippets || [])
+      if (response.data.transcripts?.length) {
+        // Lookups like "Walmart transcripts" come back as a list of calls
+        setTranscripts(response.data.transcripts)
         setCachedResult(queryKey, {
-          answer: response.data.answer,
-          snippets: response.data.snippets || [],
+          answer: '',
+          snippets: [],
+          transcripts: response.data.transcripts,
         })
+      } else if (!response.data.snippets?.length) {
+        setError('No results found. Please try another query.')
+      } else {
+        // The summary is skipped when the LLM is unavailable or out of time;
+        // the excerpts still stand on their own
+        setAnswer(response.data.answer || '')
+        setSnippets(response.data.snippets)
+        if (response.data.answer) {
+          // Don't cache excerpts alone, so a retry can still get the summary
+          setCachedResult(queryKey, {
+            answer: response.data.answer,
+            snippets: response.data.snippets,
+          })
+        }
       }
     } catch (err) {
       console.error("Search error:", err)
@@ -242,7 +258,7 @@ function App() {
       </form>
 
       {/* No results */}
-      {!error && !answer && !loading && (
+      {!error && !answer && !snippets.length && !transcripts.length && !loading && (
         <div className="text-center text-gray-500 my-8">
           No results yet. Try a query to get insights.
         </div>
@@ -254,13 +270,48 @@ function App() {
       {/* Error handling */}
       {error && <div className='mt-4 text-red-500'>An error occurred: {error}</div>}
 
-      {answer && (
+      {transcripts.length > 0 && (
         <div className="mt-4 border border-gray-200 rounded-2xl bg-white shadow-sm p-6">
-          <h2 className="text-xl font-semibold text-gray-800 mb-2">Answer</h2>
-          <p className="text-gray-700 mb-4">{answer}</p>
+          <h2 className="text-xl font-semibold text-gray-800 mb-2">
+            Transcripts ({transcripts.length})
+          </h2>
+          <ul className="space-y-2 text-left">
+            {transcripts.map((t) => (
+              <li key={t.url}>
+                <a
+                  href={t.url}
+                  target="_blank"
+                  rel="noopener noreferrer"
+                  className="text-indigo-600 hover:underline"
+                >
+                  {t.company.toUpperCase()} {t.quarter.toUpperCase()} {t.year}
+                </a>
+                {t.call_ts && (
+                  <span className="ml-2 text-sm text-gray-500">
+                    {new Date(t.call_ts).toLocaleDateString()}
+                  </span>
+                )}
+              </li>
+            ))}
+          </ul>
+        </div>
+      )}
+
+      {(answer || snippets.length > 0) && (
+        <div className="mt-4 border border-gray-200 rounded-2xl bg-white shadow-sm p-6">
+          {answer ? (
+            <>
+              <h2 className="text-xl font-semibold text-gray-800 mb-2">Answer</h2>
+              <p className="text-gray-700 mb-4">{answer}</p>
+            </>
+          ) : (
+            <p className="text-sm text-amber-700 bg-amber-50 rounded-lg px-3 py-2 mb-4">
+              A summary isn’t available right now. Here are the most relevant excerpts.
+            </p>
+          )}
 
           {snippets.length > 0 && (
-            <details>
+            <details open={!answer}>
               <summary
                 className="cursor-pointer text-indigo-600 font-medium"
                 title="Toggle to view transcript snippets"
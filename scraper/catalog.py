@@ -0,0 +1,60 @@
+import json
+import os
+
+from pathlib import Path
+from typing import List
+
+from common.catalog import DEFAULT_CATALOG_PATH
+from parser import Parser
+from status_tracker import StatusTracker
+from utils.storage import TranscriptKey, get_storage
+from utils.time_util import now_utc_iso
+
+CATALOG_PATH = os.getenv("CATALOG_PATH", DEFAULT_CATALOG_PATH)
+
+
+def backfill_call_ts(st: StatusTracker, slugs: List[str]) -> List[str]:
+    """
+    Read the call time from the stored HTML for transcripts ingested before
+    it was kept in the manifest. Returns the slugs that couldn't be read.
+    """
+    failed = []
+    storage = get_storage()
+    # One manifest write for the whole backfill
+    with st.batched():
+        for slug in slugs:
+            tk = TranscriptKey.from_slug(slug)
+            try:
+                parser = Parser.from_html(storage.read_html(tk), tk, st.get_url(slug))
+                st.update(slug, "call_ts", parser.timestamp)
+            except Exception:
+                failed.append(slug)
+    st.save()
+    return failed
+
+
+def export_catalog(st: StatusTracker, path: str = CATALOG_PATH) -> int:
+    """
+    Write every embedded transcript (company, quarter, year, URL, call time)
+    to one JSON file, which the backend uses to answer lookups like "NVDA Q3
+    2025 earnings call" without a search.
+    """
+    transcripts = []
+    for slug in st.filter_for(step="embedded", status=True):
+        tk = TranscriptKey.from_slug(slug)
+        transcripts.append(
+            {
+                "company": tk.company,
+                "quarter": tk.quarter,
+                "year": str(tk.year),
+                "url": st.get_url(slug),
+                "call_ts": st.data[slug].get("call_ts"),
+            }
+        )
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"generated_at": now_utc_iso(), "transcripts": transcripts}, f)
+    tmp_path.replace(path)
+    return len(transcripts)
@@ -15,7 +15,12 @@ from pathlib import Path
 from tqdm import tqdm
 from typing import Any, Iterable, List
 
-from ingest import get_chunk_metadata, get_embeddings, upsert_chunks
+from ingest import (
+    export_chunk_metadata,
+    get_embeddings,
+    get_index_metadata,
+    upsert_chunks,
+)
 from model import TranscriptChunk
 from utils.pinecone import get_index
 from utils.time_util import now_utc_iso
@@ -121,7 +126,7 @@ class ChunkProcessor:
                 }
                 payload = {
                     "id": chunk.chunk_id,
-                    "setMetadata": get_chunk_metadata(chunk),
+                    "setMetadata": get_index_metadata(chunk),
                 }
 
                 if dry_run:
@@ -166,6 +171,13 @@ class ChunkProcessor:
         duration = time.perf_counter() - start
         print(f"⚡ Metadata refresh completed in {duration:.2f} seconds.")
 
+    def export_metadata(self, dry_run: bool = False):
+        if dry_run:
+            print(f"🚫 Dry run: Would export metadata for {len(self.chunks)} chunks.")
+            return
+        total = export_chunk_metadata(self.chunks)
+        print(f"🗂️  Exported metadata table ({total} chunks total).")
+
     def get_report(self):
         return {
             "embed_started_at": self.report.get("embed_started_at"),
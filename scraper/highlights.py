@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+
+from aiolimiter import AsyncLimiter
+from openai import AsyncOpenAI
+from pinecone import Pinecone
+from dotenv import load_dotenv
+from more_itertools import chunked
+from pathlib import Path
+from tqdm import tqdm
+from typing import List, Optional, Tuple
+
+from common.highlights import DEFAULT_HIGHLIGHTS_PATH, load_templates, template_version
+from common.load_tickers import load_ticker_metadata
+from common.metadata_store import MetadataTable
+from ingest import CHUNK_METADATA_PATH, get_embeddings
+from status_tracker import StatusTracker
+from utils.pinecone import get_index
+from utils.storage import TranscriptKey
+from utils.time_util import now_utc_iso
+
+load_dotenv()
+
+HIGHLIGHTS_PATH = os.getenv("HIGHLIGHTS_PATH", DEFAULT_HIGHLIGHTS_PATH)
+HIGHLIGHT_CONCURRENCY = int(os.getenv("HIGHLIGHT_CONCURRENCY", "8"))
+HIGHLIGHT_RPM = int(os.getenv("HIGHLIGHT_RPM", "300"))
+HIGHLIGHT_TOP_K = 8
+NO_ANSWER = "No directly relevant insights found."
+
+
+def build_prompt(question: str, excerpts: List[dict]) -> str:
+    listed = "\n".join(
+        f"Excerpt {i + 1} ({m.get('section')}): {m.get('snippet')}"
+        for i, m in enumerate(excerpts)
+    )
+    return f"""
+    You are an expert financial analyst summarizing an earnings call transcript.
+    Answer the question clearly, precisely, and concisely using ONLY the excerpts below.
+
+    Question: {question}
+
+    {listed}
+
+    Respond with 2-4 short bullet points, each starting with "- ".
+    If the excerpts don't address the question, respond exactly: "{NO_ANSWER}"
+    """
+
+
+class HighlightMaterializer:
+    """
+    Precomputes answers to the highlight templates for every transcript, so
+    the backend can serve common "what did <company> say about X in <quarter>"
+    questions without an LLM call on the request path.
+
+    Answers are kept in the manifest under each slug's "highlights" field and
+    regenerated only when a template's wording changes (or with --force).
+    """
+
+    def __init__(self, st: StatusTracker, templates: Optional[List[dict]] = None):
+        self.st = st
+        self.templates = templates or load_templates()
+        self.tickers = load_ticker_metadata()
+        self.failed: List[Tuple[str, str, str]] = []
+
+    def pending(self, slugs: List[str], force: bool = False) -> List[Tuple[str, dict]]:
+        work = []
+        for slug in slugs:
+            existing = self.st.get_highlights(slug)
+            for template in self.templates:
+                record = existing.get(template["id"])
+                if (
+                    force
+                    or not record
+                    or record["version"] != template_version(template)
+                ):
+                    work.append((slug, template))
+        return work
+
+    def question(self, slug: str, template: dict) -> str:
+        tk = TranscriptKey.from_slug(slug)
+        name = self.tickers.get(tk.company.upper(), {}).get("name", tk.company.upper())
+        return template["question"].format(
+            company_name=name, quarter=tk.quarter.upper(), year=tk.year
+        )
+
+    async def materialize(
+        self,
+        work: List[Tuple[str, dict]],
+        batch_size: int = 100,
+        concurrency: int = HIGHLIGHT_CONCURRENCY,
+    ):
+        index = get_index(Pinecone(api_key=os.getenv("PINECONE_DEFAULT_API_KEY")))
+        oai_client = AsyncOpenAI()
+        metadata_table = MetadataTable.load(CHUNK_METADATA_PATH)
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = AsyncLimiter(max_rate=HIGHLIGHT_RPM, time_period=60)
+
+        async def answer(slug: str, template: dict, question: str, embedding):
+            tk = TranscriptKey.from_slug(slug)
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(
+                        index.query,
+                        vector=embedding.tolist(),
+                        top_k=HIGHLIGHT_TOP_K,
+                        include_metadata=True,
+                        filter={
+                            "company": tk.company,
+                            "quarter": tk.quarter,
+                            "year": str(tk.year),
+                        },
+                    )
+                    matches = result.to_dict()["matches"]
+                    excerpts = []
+                    for match in matches:
+                        m = match.get("metadata") or {}
+                        if "snippet" not in m and metadata_table is not None:
+                            m = {**(metadata_table.get(match["id"]) or {}), **m}
+                        excerpts.append(m)
+
+                    text = None
+                    if excerpts:
+                        async with limiter:
+                            completion = await oai_client.chat.completions.create(
+                                model="gpt-4o-mini",
+                                temperature=0.2,
+                                messages=[
+                                    {
+                                        "role": "user",
+                                        "content": build_prompt(
+                                            question, excerpts
+                                        ).strip(),
+                                    }
+                                ],
+                            )
+                        text = completion.choices[0].message.content.strip()
+                except Exception as e:
+                    self.failed.append((slug, template["id"], str(e)))
+                    return
+
+            self.st.set_highlight(
+                slug,
+                template["id"],
+                {
+                    # None when the call had nothing on this topic
+                    "answer": None if text in (None, NO_ANSWER) else text,
+                    "chunk_ids": [m["id"] for m in matches],
+                    "scores": [m["score"] for m in matches],
+                    "version": template_version(template),
+                    "generated_at": now_utc_iso(),
+                },
+            )
+
+        try:
+            with tqdm(total=len(work), desc="✨ Materializing highlights") as pbar:
+                for batch in chunked(work, batch_size):
+                    questions = [self.question(slug, t) for slug, t in batch]
+                    embeddings = get_embeddings(questions)
+                    await asyncio.gather(
+                        *(
+                            answer(slug, template, question, embedding)
+                            for (slug, template), question, embedding in zip(
+                                batch, questions, embeddings
+                            )
+                        )
+                    )
+                    # One manifest write per batch rather than per answer
+                    self.st.save()
+                    pbar.update(len(batch))
+        finally:
+            if metadata_table is not None:
+                metadata_table.close()
+
+    def export(self, path: str = HIGHLIGHTS_PATH) -> int:
+        """
+        Write the current answers to a single JSON file for the backend,
+        skipping empty answers and ones generated from an outdated template.
+        """
+        versions = {t["id"]: template_version(t) for t in self.templates}
+        answers = {}
+        for slug in self.st.data:
+            for template_id, record in self.st.get_highlights(slug).items():
+                if record.get("answer") and record["version"] == versions.get(
+                    template_id
+                ):
+                    answers.setdefault(slug, {})[template_id] = {
+                        k: record[k] for k in ("answer", "chunk_ids", "scores")
+                    }
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "generated_at": now_utc_iso(),
+                    "templates": [
+                        {**t, "version": versions[t["id"]]} for t in self.templates
+                    ],
+                    "answers": answers,
+                },
+                f,
+            )
+        tmp_path.replace(path)
+        return sum(len(v) for v in answers.values())
@@ -1,8 +1,26 @@
+import aiohttp
+import asyncio
 import requests
 
 from status_tracker import StatusTracker
-from utils.io import mark_url_as_scraped, record_url_metadata
-from utils.storage import LocalStorage, TranscriptKey
+from utils.io import load_url_store, mark_url_as_scraped, record_url_metadata
+from utils.politeness import (
+    FETCH_CONCURRENCY,
+    FETCH_MAX_ATTEMPTS,
+    HostScheduler,
+    PermanentFetchError,
+    RetryableFetchError,
+    is_retryable,
+    parse_retry_after,
+    sleep_before_retry,
+)
+from utils.revalidation import (
+    conditional_headers,
+    content_hash,
+    is_unchanged,
+    response_validators,
+)
+from utils.storage import TranscriptKey, get_storage
 from utils.time_util import now_utc_iso, polite_sleep
 from storage import (
     clear_urls_to_scrape,
@@ -11,7 +29,9 @@ from storage import (
 
 from datetime import datetime
 from tqdm import tqdm
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+FETCH_TIMEOUT_S = 30
 
 
 class HTMLFetcher:
@@ -28,20 +48,23 @@ class HTMLFetcher:
         self.force = force
         self.batch = batch
         self.already_fetched_urls = load_scraped_urls()
+        # Validators and content hashes from earlier fetches, for revalidation
+        self.url_store = load_url_store()
         self.report = {
             "started_at": now_utc_iso(),
             "fetched": [],
+            "unchanged": [],
             "skipped": [],
             "failed": {},
             "total_urls": 0,
         }
-        self.storage = LocalStorage(data_root)
+        self.storage = get_storage(data_root)
 
     def already_fetched(self, url: str) -> bool:
         return url in self.already_fetched_urls
 
     def update_report(self, url, result, e=""):
-        if result not in ["fetched", "skipped", "failed"]:
+        if result not in ["fetched", "unchanged", "skipped", "failed"]:
             print(f"Check unhandled report status: {result}")
 
         if result == "failed":
@@ -51,10 +74,14 @@ class HTMLFetcher:
 
         self.report["total_urls"] += 1
 
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional headers when refetching (--force) a URL we already have."""
+        entry = self.url_store.get(url) if self.already_fetched(url) else None
+        return conditional_headers(entry)
+
     @polite_sleep()
-    def fetch_html(self, url) -> str:
-        resp = requests.get(url)
-        return resp.text
+    def fetch_html(self, url) -> requests.Response:
+        return requests.get(url, headers=self.request_headers(url))
 
     def fetch(self):
         pbar = tqdm(self.urls, desc="📄 Fetching transcripts...", leave=False)
@@ -68,26 +95,62 @@ class HTMLFetcher:
                 f"📄 {tk.company.upper()} {tk.quarter.upper()} {tk.year}"
             )
             try:
-                html = self.fetch_html(url)
-                self.storage.write_html(tk, html)
-
-                self.st.mark_success(tk.slug(), "html_saved")
-                record_url_metadata(
-                    url,
-                    metadata={
-                        "status": "fetched",
-                        "discovered_at": now_utc_iso(),
-                        "company": tk.company,
-                        "quarter": f"{tk.quarter.upper()} {tk.year}",
-                    },
-                )
-                mark_url_as_scraped(url)
-                self.update_report(url, "fetched")
+                resp = self.fetch_html(url)
+                if resp.status_code == 304:
+                    self.save_unchanged(url, tk)
+                else:
+                    self.save_response(url, tk, resp.text, resp.headers)
             except Exception as e:
-                self.st.mark_failure(tk.slug(), "html_saved", str(e))
-                record_url_metadata(url, {"status": "failed", "error": str(e)})
-                self.update_report(url, "failed", str(e))
+                self.save_failed(url, tk, e)
+
+        self.finish_report()
+
+    def save_response(self, url: str, tk: TranscriptKey, html: str, headers):
+        entry = self.url_store.get(url)
+        if self.already_fetched(url) and is_unchanged(entry, html):
+            self.save_unchanged(url, tk)
+        else:
+            self.save_fetched(url, tk, html, response_validators(headers))
+
+    def save_fetched(
+        self,
+        url: str,
+        tk: TranscriptKey,
+        html: str,
+        validators: Optional[Dict[str, str]] = None,
+    ):
+        self.storage.write_html(tk, html)
 
+        if self.already_fetched(url):
+            # New content: parse and embed it again
+            self.st.mark_changed(tk.slug())
+        self.st.mark_success(tk.slug(), "html_saved")
+        record_url_metadata(
+            url,
+            metadata={
+                "status": "fetched",
+                "discovered_at": now_utc_iso(),
+                "company": tk.company,
+                "quarter": f"{tk.quarter.upper()} {tk.year}",
+                "content_hash": content_hash(html),
+                **(validators or {}),
+            },
+        )
+        mark_url_as_scraped(url)
+        self.update_report(url, "fetched")
+
+    def save_unchanged(self, url: str, tk: TranscriptKey):
+        """A refetch that found the stored HTML current; nothing is rewritten."""
+        self.st.mark_unchanged(tk.slug())
+        record_url_metadata(url, {"status": "fetched", "checked_at": now_utc_iso()})
+        self.update_report(url, "unchanged")
+
+    def save_failed(self, url: str, tk: TranscriptKey, e: Exception):
+        self.st.mark_failure(tk.slug(), "html_saved", str(e))
+        record_url_metadata(url, {"status": "failed", "error": str(e)})
+        self.update_report(url, "failed", str(e))
+
+    def finish_report(self):
         self.report["ended_at"] = now_utc_iso()
         self.report["runtime_seconds"] = (
             datetime.fromisoformat(self.report["ended_at"])
@@ -99,6 +162,131 @@ class HTMLFetcher:
         return self.report
 
 
+class AsyncHTMLFetcher(HTMLFetcher):
+    """
+    Fetches many transcripts at once over a pooled keep-alive session.
+    Pacing comes from a per-host token bucket instead of a sleep before
+    every request, so throughput is bounded by the politeness budget rather
+    than by one round trip at a time. Throttling and server errors are
+    retried with jittered exponential backoff. Permanent failures, and URLs
+    that run out of attempts, go to the dead-letter list in the report.
+    """
+
+    def __init__(
+        self,
+        st: StatusTracker,
+        crawled_urls,
+        data_root: str = "data",
+        force: bool = False,
+        concurrency: int = FETCH_CONCURRENCY,
+        max_attempts: int = FETCH_MAX_ATTEMPTS,
+        scheduler: Optional[HostScheduler] = None,
+    ):
+        super().__init__(st, crawled_urls, data_root=data_root, force=force)
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.scheduler = scheduler or HostScheduler()
+        self.report["dead_letters"] = []
+
+    async def get(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Tuple[Optional[str], Any]:
+        """The page and response headers; no page if it's unchanged (304)."""
+        await self.scheduler.wait(url)
+        try:
+            async with session.get(url, headers=self.request_headers(url)) as resp:
+                if resp.status == 304:
+                    return None, resp.headers
+                if resp.status == 200:
+                    return await resp.text(), resp.headers
+                error = f"HTTP {resp.status}"
+                if is_retryable(resp.status):
+                    raise RetryableFetchError(
+                        error,
+                        resp.status,
+                        parse_retry_after(resp.headers.get("Retry-After")),
+                    )
+                raise PermanentFetchError(error, resp.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RetryableFetchError(str(e) or type(e).__name__)
+
+    async def fetch_with_retries(self, session: aiohttp.ClientSession, url: str):
+        tk = TranscriptKey.from_url(url)
+        for attempt in range(self.max_attempts):
+            try:
+                html, headers = await self.get(session, url)
+                if html is None:
+                    self.save_unchanged(url, tk)
+                else:
+                    self.save_response(url, tk, html, headers)
+                return
+            except RetryableFetchError as e:
+                if attempt + 1 < self.max_attempts:
+                    await sleep_before_retry(attempt, e)
+                    continue
+                self.dead_letter(url, tk, e, e.status, attempt + 1)
+                return
+            except PermanentFetchError as e:
+                self.dead_letter(url, tk, e, e.status, attempt + 1)
+                return
+            except Exception as e:
+                # An undecodable page or a failed write fails this URL, not
+                # the whole run
+                self.dead_letter(url, tk, e, None, attempt + 1)
+                return
+
+    def dead_letter(
+        self,
+        url: str,
+        tk: TranscriptKey,
+        e: Exception,
+        status: Optional[int],
+        attempts: int,
+    ):
+        self.save_failed(url, tk, e)
+        self.report["dead_letters"].append(
+            {
+                "url": url,
+                "status": status,
+                "error": str(e),
+                "attempts": attempts,
+                "failed_at": now_utc_iso(),
+            }
+        )
+
+    async def fetch_async(self):
+        pending = []
+        for url in self.urls:
+            if not self.force and self.already_fetched(url):
+                self.update_report(url, "skipped")
+            else:
+                pending.append(url)
+
+        # The connector's pool limit is the global concurrency cap; waiting
+        # out a backoff doesn't hold a connection
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT_S)
+
+        async def fetch_one(session, url):
+            try:
+                await self.fetch_with_retries(session, url)
+            except Exception as e:
+                # Even recording the failure failed; keep it in the report
+                self.update_report(url, "failed", str(e))
+            pbar.update(1)
+
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout
+        ) as session:
+            with tqdm(total=len(pending), desc="📄 Fetching transcripts") as pbar:
+                await asyncio.gather(*(fetch_one(session, url) for url in pending))
+
+        self.finish_report()
+
+    def fetch(self):
+        asyncio.run(self.fetch_async())
+
+
 if __name__ == "__main__":
     urls = [
         "https://www.fool.com/earnings/call-transcripts/2019/10/30/apple-inc-aapl-q4-2019-earnings-call-transcript.aspx",
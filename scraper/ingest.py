@@ -1,12 +1,23 @@
 import os
 
+import numpy as np
+
 from openai import OpenAI
-from pinecone import Index, Pinecone, ServerlessSpec
+from pinecone import Index, Pinecone
 from dotenv import load_dotenv
 from typing import Any, Dict, List
 
+from common.embedding import decode_embedding, embedding_request_kwargs
+from common.metadata_store import (
+    DEFAULT_CHUNK_METADATA_PATH,
+    FILTERABLE_METADATA_FIELDS,
+    MetadataTable,
+    write_metadata_table,
+)
+from common.periods import call_epoch, fiscal_ordinal
 from model import TranscriptChunk
 from more_itertools import chunked
+from utils.pinecone import get_index
 from utils.time_util import time_block
 
 
@@ -14,23 +25,33 @@ load_dotenv()
 OAI_client = OpenAI()
 pc = Pinecone(api_key=os.getenv("PINECONE_DEFAULT_API_KEY"))
 
+# "full" stores every metadata field on the vector; "slim" stores only the
+# filterable fields and relies on the exported metadata table for the rest.
+METADATA_MODE = os.getenv("PINECONE_METADATA_MODE", "full")
+CHUNK_METADATA_PATH = os.getenv("CHUNK_METADATA_PATH", DEFAULT_CHUNK_METADATA_PATH)
+
 
 def get_embeddings(
     texts: List[str], oai_client: OpenAI = OAI_client
-) -> List[List[float]]:
+) -> List[np.ndarray]:
     if not texts:
         return []
-    response = oai_client.embeddings.create(input=texts, model="text-embedding-3-small")
+    response = oai_client.embeddings.create(input=texts, **embedding_request_kwargs())
     sorted_embeddings = sorted(response.data, key=lambda x: x.index)
-    return [item.embedding for item in sorted_embeddings]
+    return [decode_embedding(item.embedding) for item in sorted_embeddings]
 
 
 def upsert_chunks(
-    chunks: List[TranscriptChunk], embeddings: list[list[float]], index: Index
+    chunks: List[TranscriptChunk], embeddings: List[np.ndarray], index: Index
 ):
+    # Embeddings stay float32 arrays until the SDK boundary, which needs lists
     index.upsert(
         [
-            {"id": chunk.chunk_id, "values": emb, "metadata": get_chunk_metadata(chunk)}
+            {
+                "id": chunk.chunk_id,
+                "values": emb.tolist(),
+                "metadata": get_index_metadata(chunk),
+            }
             for chunk, emb in zip(chunks, embeddings)
         ]
     )
@@ -38,7 +59,7 @@ def upsert_chunks(
 
 def upsert_chunks_in_batches(
     chunks: List[TranscriptChunk],
-    embeddings: List[List[float]],
+    embeddings: List[np.ndarray],
     index: Index,
     batch_size: int = 100,
 ):
@@ -48,8 +69,8 @@ def upsert_chunks_in_batches(
             [
                 {
                     "id": chunk.chunk_id,
-                    "values": emb,
-                    "metadata": get_chunk_metadata(chunk),
+                    "values": emb.tolist(),
+                    "metadata": get_index_metadata(chunk),
                 }
                 for chunk, emb in batch
             ]
@@ -64,25 +85,6 @@ def flatten_speakers(speakers):
     }
 
 
-def get_index(pc: Pinecone):
-    index_name = "transcripts-v2"
-    if not pc.has_index(index_name):
-        print("Index not found, creating new")
-        pc.create_index(
-            name=index_name,
-            vector_type="dense",
-            dimension=1536,
-            metric="cosine",
-            spec=ServerlessSpec(cloud="aws", region="us-east-1"),
-            deletion_protection="disabled",
-            tags={"environment": "development"},
-        )
-    index = pc.Index(
-        host="https://transcripts-v2-e38g0na.svc.aped-4627-b74a.pinecone.io"
-    )
-    return index
-
-
 def get_chunk_metadata(chunk: TranscriptChunk) -> dict[str, Any]:
     metadata = {
         "url": chunk.url,
@@ -92,6 +94,9 @@ def get_chunk_metadata(chunk: TranscriptChunk) -> dict[str, Any]:
         "year": chunk.year,
         "snippet": chunk.snippet,
         "call_ts": chunk.call_ts,
+        # Numeric copies of the call date and fiscal period for range filters
+        "call_epoch": call_epoch(chunk.call_ts),
+        "fiscal_ordinal": fiscal_ordinal(chunk.quarter, chunk.year),
         **{  # AI madness
             f"primary_{k}": v
             for k, v in flatten_speakers(chunk.primary_speakers).items()
@@ -108,6 +113,32 @@ def get_chunk_metadata(chunk: TranscriptChunk) -> dict[str, Any]:
     return metadata
 
 
+def get_index_metadata(chunk: TranscriptChunk) -> dict[str, Any]:
+    """Metadata to store on the Pinecone vector, depending on METADATA_MODE."""
+    metadata = get_chunk_metadata(chunk)
+    if METADATA_MODE != "slim":
+        return metadata
+    return {k: v for k, v in metadata.items() if k in FILTERABLE_METADATA_FIELDS}
+
+
+def export_chunk_metadata(
+    chunks: List[TranscriptChunk], path: str = CHUNK_METADATA_PATH
+) -> int:
+    """
+    Merge the full metadata for `chunks` into the local metadata table the
+    backend memory-maps to hydrate slim query results.
+    """
+    records = {}
+    existing = MetadataTable.load(path)
+    if existing is not None:
+        records.update(existing.items())
+        existing.close()
+    for chunk in chunks:
+        records[chunk.chunk_id] = get_chunk_metadata(chunk)
+    write_metadata_table(path, records)
+    return len(records)
+
+
 def ingest_chunks(chunks: List[TranscriptChunk]) -> Dict[str, Any]:
     index = get_index(pc)
     texts = [chunk.text for chunk in chunks]
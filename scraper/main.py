@@ -1,15 +1,14 @@
 import argparse
 import asyncio
-import concurrent.futures
 import json
-import os
-
-from tqdm import tqdm
 
+from catalog import backfill_call_ts, export_catalog
 from chunk_processor import ChunkProcessor
 from crawler_manager import get_urls_and_store
-from html_fetcher import HTMLFetcher
-from parser import Parser
+from highlights import HighlightMaterializer
+from html_fetcher import AsyncHTMLFetcher, HTMLFetcher
+from ingest import export_chunk_metadata
+from parse_pool import parse_transcripts, record_parsed
 from status_tracker import StatusTracker
 
 from utils.report import (
@@ -18,7 +17,7 @@ from utils.report import (
     save_skipped_slugs,
     save_ingest_report,
 )
-from utils.storage import TranscriptKey
+from utils.politeness import FETCH_CONCURRENCY
 
 
 def main():
@@ -34,6 +33,9 @@ def main():
             "refresh_metadata",
             "extract_candidates",
             "regenerate_snippets",
+            "export_metadata",
+            "materialize_highlights",
+            "export_catalog",
         ],
         help="Step to run: 'crawl' (discover URLs), 'fetch' (download HTML), 'ingest' (parse and embed), or 'retry' (retry failed embeddings)",
     )
@@ -47,6 +49,24 @@ def main():
         action="store_true",
         help="Force re-scraping URLs even if already marked as scraped",
     )
+    parser.add_argument(
+        "--async",
+        dest="async_fetch",
+        action="store_true",
+        help="Fetch concurrently over a pooled session, paced per host instead of sleeping between requests",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=FETCH_CONCURRENCY,
+        help="Requests in flight at once with --async",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes to parse transcripts with (default: PARSE_WORKERS, or one per core)",
+    )
     parser.add_argument(
         "--skipped_file",
         type=str,
@@ -66,7 +86,12 @@ def main():
         try:
             with open("data/urls_to_scrape.json") as f:
                 url_list = json.load(f)
-            fetcher = HTMLFetcher(st, url_list, force=args.force)
+            if args.async_fetch:
+                fetcher = AsyncHTMLFetcher(
+                    st, url_list, force=args.force, concurrency=args.concurrency
+                )
+            else:
+                fetcher = HTMLFetcher(st, url_list, force=args.force)
             fetcher.fetch()
             report = fetcher.get_report()
             print_run_report(report)
@@ -75,7 +100,6 @@ def main():
             print("No cached URL list found. Run 'crawl' first.")
 
     elif args.step == "ingest":
-        chunks = []
         if args.force:
             print(
                 "⚠️  --force is True: All slugs will be reprocessed, even if already parsed."
@@ -84,28 +108,17 @@ def main():
         else:
             print("ℹ️  --force is False: Only unparsed slugs will be processed.")
             slugs_to_parse = st.filter_for(step="parsed", status=False)
-        for slug in tqdm(slugs_to_parse, desc="Parsing transcripts"):
-            tk = TranscriptKey.from_slug(slug)
-            html_path = tk.to_path(data_root="data")
-
-            try:
-                with open(html_path, "r", encoding="utf-8") as f:
-                    parser = Parser.from_html(f.read(), tk, st.get_url(tk.slug()))
-                    chunks.extend(parser.parse_html())
-                if not args.dry_run:
-                    st.mark_success(tk.slug(), "parsed")
-                else:
-                    print(f"🚫 Dry run: Would have marked {slug} as parsed.")
-            except Exception as e:
-                if not args.dry_run:
-                    st.mark_failure(tk.slug(), "parsed", str(e))
-                else:
-                    print(f"🚫 Dry run: Would have marked {slug} as failed.\n{e}")
+        chunks = record_parsed(
+            st,
+            parse_transcripts(st, slugs_to_parse, workers=args.workers),
+            dry_run=args.dry_run,
+        )
 
         processor = ChunkProcessor(chunks)
         if not args.dry_run:
             processor.embed()
             processor.upsert()
+            processor.export_metadata()
             for slug in processor.get_successful_slugs():
                 st.mark_success(slug, "embedded")
             for slug in processor.get_failed_slugs():
@@ -146,29 +159,22 @@ def main():
             print("No slugs to retry.")
             return
 
-        chunks = []
-        for slug in tqdm(slugs_to_retry, desc="Retrying failed embeddings"):
-            tk = TranscriptKey.from_slug(slug)
-            html_path = tk.to_path(data_root="data")
-
-            try:
-                with open(html_path, "r", encoding="utf-8") as f:
-                    parser = Parser.from_html(f.read(), tk, st.get_url(tk.slug()))
-                    chunks.extend(parser.parse_html())
-                if not args.dry_run:
-                    st.mark_success(tk.slug(), "parsed")
-                else:
-                    print(f"🚫 Dry run: Would have marked {slug} as parsed.")
-            except Exception as e:
-                if not args.dry_run:
-                    st.mark_failure(tk.slug(), "parsed", str(e))
-                else:
-                    print(f"🚫 Dry run: Would have marked {slug} as failed.\n{e}")
+        chunks = record_parsed(
+            st,
+            parse_transcripts(
+                st,
+                slugs_to_retry,
+                workers=args.workers,
+                desc="Retrying failed embeddings",
+            ),
+            dry_run=args.dry_run,
+        )
 
         processor = ChunkProcessor(chunks)
         if not args.dry_run:
             processor.embed()
             processor.upsert()
+            processor.export_metadata()
             for slug in processor.get_successful_slugs():
                 st.mark_success(slug, "embedded")
             for slug in processor.get_failed_slugs():
@@ -188,55 +194,91 @@ def main():
         chunks = []
         slugs_to_refresh = st.filter_for(step="html_saved", status=True)
 
-        for slug in tqdm(slugs_to_refresh, desc="Re-parsing HTML for metadata refresh"):
-            tk = TranscriptKey.from_slug(slug)
-            html_path = tk.to_path(data_root="data")
-            try:
-                with open(html_path, "r", encoding="utf-8") as f:
-                    parser = Parser.from_html(f.read(), tk, st.get_url(tk.slug()))
-                    chunks.extend(parser.parse_html())
-            except Exception as e:
-                print(f"⚠️ Failed to parse {slug}: {e}")
+        for result in parse_transcripts(
+            st,
+            slugs_to_refresh,
+            workers=args.workers,
+            desc="Re-parsing HTML for metadata refresh",
+        ):
+            if result.error is None:
+                chunks.extend(result.to_chunks())
+            else:
+                print(f"⚠️ Failed to parse {result.slug}: {result.error}")
 
         processor = ChunkProcessor(chunks)
         asyncio.run(processor.refresh_metadata_async(dry_run=args.dry_run))
+        processor.export_metadata(dry_run=args.dry_run)
+
+    elif args.step == "export_metadata":
+        chunks = []
+        slugs_to_export = st.filter_for(step="embedded", status=True)
+
+        for result in parse_transcripts(
+            st,
+            slugs_to_export,
+            workers=args.workers,
+            desc="Re-parsing HTML for metadata export",
+        ):
+            if result.error is None:
+                chunks.extend(result.to_chunks())
+            else:
+                print(f"⚠️ Failed to parse {result.slug}: {result.error}")
+
+        if args.dry_run:
+            print(f"🚫 Dry run: Would export metadata for {len(chunks)} chunks.")
+        else:
+            total = export_chunk_metadata(chunks)
+            print(f"🗂️  Exported metadata table ({total} chunks total).")
+
+    elif args.step == "materialize_highlights":
+        # Run after ingest: answers come from the embedded chunks
+        materializer = HighlightMaterializer(st)
+        slugs = st.filter_for(step="embedded", status=True)
+        work = materializer.pending(slugs, force=args.force)
+        print(
+            f"ℹ️  {len(work)} highlight answers to generate "
+            f"({len(slugs)} transcripts × {len(materializer.templates)} templates)."
+        )
+        if args.dry_run:
+            print(f"🚫 Dry run: Would have generated {len(work)} highlight answers.")
+        else:
+            asyncio.run(materializer.materialize(work))
+            for slug, template_id, error in materializer.failed:
+                print(f"⚠️ Failed to materialize {template_id} for {slug}: {error}")
+            total = materializer.export()
+            print(f"✨ Exported {total} highlight answers.")
+
+    elif args.step == "export_catalog":
+        missing = [
+            slug
+            for slug in st.filter_for(step="embedded", status=True)
+            if not st.data[slug].get("call_ts")
+        ]
+        if args.dry_run:
+            print(f"🚫 Dry run: Would have read call times for {len(missing)} slugs.")
+        else:
+            if missing:
+                for slug in backfill_call_ts(st, missing):
+                    print(f"⚠️ Failed to read call time for {slug}")
+            total = export_catalog(st)
+            print(f"📇 Exported catalog of {total} transcripts.")
 
     elif args.step == "extract_candidates":
         from collections import Counter
         from utils.text_util import split_sentences
 
         counts = Counter()
-        slug_url_pairs = [(slug, st.get_url(slug)) for slug in st.data.keys()]
-
-        def _process_transcript(pair):
-            slug, url = pair
-            tk = TranscriptKey.from_slug(slug)
-            html_path = tk.to_path(data_root="data")
-            local_counter = Counter()
-            try:
-                with open(html_path, "r", encoding="utf-8") as f:
-                    parser = Parser.from_html(f.read(), tk, url)
-                    chunks = parser.parse_html()
-            except Exception as e:
-                return local_counter
-            for chunk in chunks:
+        for result in parse_transcripts(
+            st,
+            list(st.data.keys()),
+            workers=args.workers,
+            desc="🔍 Scanning transcripts for filler candidate sentences...",
+        ):
+            for chunk in result.to_chunks():
                 for sent in split_sentences(chunk.text):
                     norm = sent.strip().rstrip(".!?").lower()
                     if len(norm.split()) <= 5:
-                        local_counter[norm] += 1
-            return local_counter
-
-        max_workers = min(32, (os.cpu_count() or 1) + 4)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = [
-                pool.submit(_process_transcript, pair) for pair in slug_url_pairs
-            ]
-            for fut in tqdm(
-                concurrent.futures.as_completed(futures),
-                total=len(futures),
-                desc="🔍 Scanning transcripts for filler candidate sentences...",
-            ):
-                counts.update(fut.result())
+                        counts[norm] += 1
 
         # Finally, print your top candidates
         print("\nTop filler candidates (count ≥ 20):")
@@ -246,49 +288,29 @@ def main():
             print(f"{cnt:4d}  {sentence}")
 
     elif args.step == "regenerate_snippets":
-        from utils.text_util import generate_snippet
-
         # File to record chunks that are all filler
         filler_log = open("data/all_filler_chunks.txt", "w", encoding="utf-8")
         all_chunks = []
 
-        def process_slug(slug):
-            tk = TranscriptKey.from_slug(slug)
-            html_path = tk.to_path(data_root="data")
-            try:
-                with open(html_path, "r", encoding="utf-8") as f:
-                    parser = Parser.from_html(f.read(), tk, st.get_url(slug))
-                    chunks = parser.parse_html()
-            except Exception as e:
-                return []
+        # Snippets are generated as transcripts are parsed
+        for result in parse_transcripts(
+            st, list(st.data.keys()), workers=args.workers, desc="Regenerating snippets"
+        ):
+            chunks = result.to_chunks()
             for chunk in chunks:
-                snippet = generate_snippet(chunk.text)
-                # attach regenerated snippet
-                chunk.snippet = snippet
-                if not snippet:
+                if not chunk.snippet:
                     # log slug and chunk identifier
                     filler_log.write(
-                        f"{slug}\t{chunk.primary_speakers[0]}\t{chunk.chunk_id}\n"
+                        f"{result.slug}\t{chunk.primary_speakers[0]}\t{chunk.chunk_id}\n"
                     )
-            return chunks
-
-        # Multithread processing
-        slugs = list(st.data.keys())
-        max_workers = min(32, (os.cpu_count() or 1) + 4)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = [pool.submit(process_slug, slug) for slug in slugs]
-            for fut in tqdm(
-                concurrent.futures.as_completed(futures),
-                total=len(futures),
-                desc="Regenerating snippets",
-            ):
-                all_chunks.extend(fut.result())
+            all_chunks.extend(chunks)
 
         filler_log.close()
 
         # Refresh metadata with new snippets
         processor = ChunkProcessor(all_chunks)
         asyncio.run(processor.refresh_metadata_async(dry_run=args.dry_run))
+        processor.export_metadata(dry_run=args.dry_run)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,14 @@ class Speaker(BaseModel):
     type: str  # "executive" | "analyst" | "operator" | "other"
     role: Optional[str] = None  # "CEO", "CFO", etc.
 
+    def to_payload(self) -> tuple:
+        return (self.name, self.type, self.role)
+
+    @classmethod
+    def from_payload(cls, payload: tuple) -> "Speaker":
+        name, type_, role = payload
+        return cls.model_construct(name=name, type=type_, role=role)
+
 
 class TranscriptChunk(BaseModel):
     chunk_id: str
@@ -25,3 +33,58 @@ class TranscriptChunk(BaseModel):
 
     def transcript_key_slug(self) -> str:
         return f"{self.company}-{self.quarter}-{self.year}".lower()
+
+    def to_payload(self) -> tuple:
+        """
+        The chunk as a flat tuple of plain values, for sending between
+        processes: smaller and quicker to pickle than the model itself.
+        """
+        return (
+            self.chunk_id,
+            self.url,
+            self.section,
+            self.company,
+            self.quarter,
+            self.year,
+            self.call_ts,
+            self.text,
+            self.snippet,
+            tuple(s.to_payload() for s in self.primary_speakers),
+            tuple(s.to_payload() for s in self.participants),
+            self.start_token,
+            self.end_token,
+        )
+
+    @classmethod
+    def from_payload(cls, payload: tuple) -> "TranscriptChunk":
+        """Rebuilds a chunk from `to_payload()`, skipping re-validation."""
+        (
+            chunk_id,
+            url,
+            section,
+            company,
+            quarter,
+            year,
+            call_ts,
+            text,
+            snippet,
+            primary_speakers,
+            participants,
+            start_token,
+            end_token,
+        ) = payload
+        return cls.model_construct(
+            chunk_id=chunk_id,
+            url=url,
+            section=section,
+            company=company,
+            quarter=quarter,
+            year=year,
+            call_ts=call_ts,
+            text=text,
+            snippet=snippet,
+            primary_speakers=[Speaker.from_payload(s) for s in primary_speakers],
+            participants=[Speaker.from_payload(s) for s in participants],
+            start_token=start_token,
+            end_token=end_token,
+        )
@@ -0,0 +1,118 @@
+import concurrent.futures
+import os
+
+from tqdm import tqdm
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from model import TranscriptChunk
+from parser import Parser
+from status_tracker import StatusTracker
+from utils.storage import Storage, TranscriptKey, get_storage
+
+# Parse processes unless PARSE_WORKERS or --workers says otherwise; 0 means
+# one per core
+PARSE_WORKERS = 0
+# Cap on transcripts handed to a worker per task
+PARSE_MAX_TASK_SIZE = 16
+
+# Per-process store, opened by the pool initializer
+_storage: Optional[Storage] = None
+
+
+class ParseResult(NamedTuple):
+    slug: str
+    call_ts: Optional[str]
+    # TranscriptChunk.to_payload() tuples
+    chunks: List[tuple]
+    error: Optional[str] = None
+
+    def to_chunks(self) -> List[TranscriptChunk]:
+        return [TranscriptChunk.from_payload(p) for p in self.chunks]
+
+
+def _init_worker(data_root: str):
+    global _storage
+    _storage = get_storage(data_root)
+
+
+def parse_one(job: Tuple[str, str]) -> ParseResult:
+    """Reads and parses one transcript in a worker; never raises."""
+    slug, url = job
+    tk = TranscriptKey.from_slug(slug)
+    try:
+        parser = Parser.from_html(_storage.read_html(tk), tk, url)
+        chunks = [c.to_payload() for c in parser.parse_html()]
+        return ParseResult(slug, parser.timestamp, chunks)
+    except Exception as e:
+        return ParseResult(slug, None, [], str(e))
+
+
+def default_workers() -> int:
+    # Read here rather than at import, after the entrypoint loads .env
+    return int(os.getenv("PARSE_WORKERS", PARSE_WORKERS)) or os.cpu_count() or 1
+
+
+def task_size(jobs: int, workers: int) -> int:
+    """
+    Transcripts per task: large enough to amortise the round trip to a
+    worker, small enough that every worker gets several tasks and a few
+    slow transcripts at the end don't leave the others idle.
+    """
+    return max(1, min(PARSE_MAX_TASK_SIZE, jobs // (workers * 4)))
+
+
+def parse_transcripts(
+    st: StatusTracker,
+    slugs: Sequence[str],
+    workers: Optional[int] = None,
+    data_root: str = "data",
+    desc: str = "Parsing transcripts",
+) -> Iterator[ParseResult]:
+    """
+    Parses stored transcripts on a process pool and yields their results in
+    `slugs` order. Workers read the HTML themselves and send back plain
+    chunk payloads; the manifest is only touched here, in the parent. With
+    one worker everything runs in this process. `workers` defaults to
+    default_workers().
+    """
+    jobs = [(slug, st.get_url(slug)) for slug in slugs]
+    workers = max(1, min(workers or default_workers(), len(jobs)))
+    if workers == 1:
+        _init_worker(data_root)
+        for job in tqdm(jobs, desc=desc):
+            yield parse_one(job)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(data_root,)
+    ) as pool:
+        results = pool.map(parse_one, jobs, chunksize=task_size(len(jobs), workers))
+        yield from tqdm(results, total=len(jobs), desc=desc)
+
+
+def record_parsed(
+    st: StatusTracker, results: Iterator[ParseResult], dry_run: bool = False
+) -> List[TranscriptChunk]:
+    """
+    Marks each transcript parsed or failed, saving the manifest once at the
+    end rather than after every slug. Returns the chunks that parsed.
+    """
+    chunks = []
+    with st.batched():
+        for result in results:
+            if result.error is None:
+                chunks.extend(result.to_chunks())
+            if dry_run:
+                if result.error is None:
+                    print(f"🚫 Dry run: Would have marked {result.slug} as parsed.")
+                else:
+                    print(
+                        f"🚫 Dry run: Would have marked {result.slug} as failed.\n"
+                        f"{result.error}"
+                    )
+            elif result.error is None:
+                st.data[result.slug]["call_ts"] = result.call_ts
+                st.mark_success(result.slug, "parsed")
+            else:
+                st.mark_failure(result.slug, "parsed", result.error)
+    return chunks
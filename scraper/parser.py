@@ -1,10 +1,12 @@
+import os
 import re
 import tiktoken
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from dateutil import parser as dateutil_parser
 from dateutil.tz import gettz
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from exceptions import PageFormatNotImplementedException, ParserInitializationError
 from utils.storage import TranscriptKey
@@ -12,6 +14,73 @@ from utils.text_util import generate_snippet
 from storage import save_unhandled_title
 from model import Speaker, TranscriptChunk
 
+# "full" builds a tree of the whole page. "fast" and "lxml" build only the
+# parts Parser reads, with html.parser or lxml as the tokenizer; lxml is
+# quicker but repairs broken markup differently from html.parser
+PARSER_MODE = os.getenv("PARSER_MODE", "full")
+STRAINED_FEATURES = {"fast": "html.parser", "lxml": "lxml"}
+
+# (phrase in the speaker line, role, type), most specific first
+SPEAKER_ROLES = [
+    ("president and chief executive officer", "President", "executive"),
+    ("chief executive officer", "CEO", "executive"),
+    ("chief technology officer", "CTO", "executive"),
+    ("chief financial officer", "CFO", "executive"),
+    ("chief operating officer", "COO", "executive"),
+    ("senior vice president", "SVP", "executive"),
+    ("vice president", "VP", "executive"),
+    ("analyst", "Analyst", "analyst"),
+    ("operator", "Operator", "operator"),
+    ("investor relations", "Investor Relations", "investor relations"),
+]
+
+
+@lru_cache(maxsize=4096)
+def classify_speaker(inner_text: str) -> Tuple[str, Optional[str]]:
+    """
+    (type, role) for a lowercased speaker line. The same few dozen lines
+    repeat across a transcript and the corpus, so results are cached. Role
+    is None for an executive whose title isn't in SPEAKER_ROLES.
+    """
+    for phrase, role, _type in SPEAKER_ROLES:
+        if phrase in inner_text:
+            return _type, role
+    if "chief" in inner_text and "officer" in inner_text:
+        return "executive", None
+    return "other", ""
+
+
+def has_speaker(p: Tag) -> bool:
+    """
+    Whether a paragraph has a <strong> (a speaker name) anywhere inside it.
+    Same answer as p.find("strong"), without setting up a search for every
+    paragraph in the transcript.
+    """
+    return any(d.name == "strong" for d in p.descendants)
+
+
+class TranscriptStrainer(SoupStrainer):
+    """
+    Limits the tree BeautifulSoup builds to the article body and the call's
+    date and time. The rest of the page (head, scripts, navigation, footer)
+    is still tokenized but never becomes Tag objects.
+    """
+
+    def allow_tag_creation(
+        self, nsprefix: Optional[str], name: str, attrs: Optional[Dict]
+    ) -> bool:
+        attrs = attrs or {}
+        if name == "div":
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            return "article-body" in classes
+        return (name, attrs.get("id")) in (("span", "date"), ("em", "time"))
+
+    def allow_string_creation(self, string: str) -> bool:
+        # Only called for text outside the kept elements
+        return False
+
 
 class Parser:
     def __init__(self, soup: BeautifulSoup, key: TranscriptKey, url: str):
@@ -33,9 +102,19 @@ class Parser:
         self.timestamp = self.parse_timestamp()
 
     @classmethod
-    def from_html(cls, html: str, key: TranscriptKey, url: str) -> "Parser":
+    def from_html(
+        cls, html: str, key: TranscriptKey, url: str, mode: Optional[str] = None
+    ) -> "Parser":
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            mode = mode or PARSER_MODE
+            if mode == "full":
+                soup = BeautifulSoup(html, "html.parser")
+            elif mode in STRAINED_FEATURES:
+                soup = BeautifulSoup(
+                    html, STRAINED_FEATURES[mode], parse_only=TranscriptStrainer()
+                )
+            else:
+                raise ValueError(f"Unknown PARSER_MODE {mode!r}")
             soup = cls.clean_ads(soup)
             if not soup.find("div", class_="article-body"):
                 raise ParserInitializationError(
@@ -60,48 +139,11 @@ class Parser:
     def parse_speaker(t: Tag) -> Speaker:
         name = t.strong.text
         inner_text = t.text.lower()
-        _type = ""
-        role = ""
-
-        if "president and chief executive officer" in inner_text:
-            role = "President"
-            _type = "executive"
-        elif "chief executive officer" in inner_text:
-            role = "CEO"
-            _type = "executive"
-        elif "chief technology officer" in inner_text:
-            role = "CTO"
-            _type = "executive"
-        elif "chief financial officer" in inner_text:
-            role = "CFO"
-            _type = "executive"
-        elif "chief operating officer" in inner_text:
-            role = "COO"
-            _type = "executive"
-        elif "senior vice president" in inner_text:
-            role = "SVP"
-            _type = "executive"
-        elif "vice president" in inner_text:
-            role = "VP"
-            _type = "executive"
-        elif "analyst" in inner_text:
-            role = "Analyst"
-            _type = "analyst"
-        elif "operator" in inner_text:
-            role = "Operator"
-            _type = "operator"
-        elif "investor relations" in inner_text:
-            role = "Investor Relations"
-            _type = "investor relations"
-        else:
-            if "chief" in inner_text and "officer" in inner_text:
-                title = t.em.text.strip()
-                # print(f"NEW SPEAKER TITLE: {inner_text}\nParsed title: {title}")
-                save_unhandled_title(inner_text)
-                role = title
-                _type = "executive"
-            else:
-                _type = "other"
+        _type, role = classify_speaker(inner_text)
+        if role is None:
+            role = t.em.text.strip()
+            # print(f"NEW SPEAKER TITLE: {inner_text}\nParsed title: {role}")
+            save_unhandled_title(inner_text)
         return Speaker(name=name, type=_type, role=role if role else "")
 
     def parse_speakers(self, speakers: List[Speaker]) -> List[Speaker]:
@@ -131,8 +173,10 @@ class Parser:
         self.participant_map = d
 
     def save_chunk(
-        self, current_speakers: List[Speaker], current_text: str
+        self, current_speakers: List[Speaker], current_text: List[str]
     ) -> TranscriptChunk:
+        # Paragraphs are collected and joined once; each is preceded by a space
+        text = "".join(" " + paragraph for paragraph in current_text)
         chunk = TranscriptChunk(
             chunk_id=self.get_chunk_id(
                 self.call_stages[self.current_step],
@@ -145,9 +189,9 @@ class Parser:
             year=str(self.year),
             primary_speakers=self.parse_speakers(current_speakers),
             participants=current_speakers,
-            text=current_text,
+            text=text,
             call_ts=self.timestamp,
-            snippet=generate_snippet(current_text),
+            snippet=generate_snippet(text),
         )
         self.chunks.append(chunk)
 
@@ -165,7 +209,7 @@ class Parser:
         article_body = self.soup.find("div", class_="article-body")
         self.populate_participant_map(article_body)
         current_speakers = []
-        current_text = ""
+        current_text = []
 
         """
         Start no 'current step'
@@ -189,19 +233,19 @@ class Parser:
                             break
                         if current_speakers:
                             self.save_chunk(current_speakers, current_text)
-                            current_text = ""
+                            current_text = []
                             current_speakers = []
 
                         self.current_step += 1
                         continue
 
                     if ele.name == "p":
-                        if ele.find("strong"):
+                        if has_speaker(ele):
                             # Change in speaker
                             # Save off chunk
                             if current_speakers:
                                 self.save_chunk(current_speakers, current_text)
-                                current_text = ""
+                                current_text = []
                                 current_speakers = []
 
                             # Get new speaker
@@ -219,7 +263,7 @@ class Parser:
                         if not current_speakers:
                             continue
 
-                        current_text = current_text + " " + ele.text
+                        current_text.append(ele.text)
                 case "qa":
                     if ele.name == "h2":
                         if "call participants" in ele.text.lower():
@@ -231,7 +275,7 @@ class Parser:
                     Split into full Q/A exchanges, add participants as they happen
                     """
                     if ele.name == "p":
-                        if ele.find("strong"):
+                        if has_speaker(ele):
                             current_speaker = self.parse_speaker(ele)
                             if "Duration:" in current_speaker.name:
                                 current_speaker = None
@@ -246,7 +290,7 @@ class Parser:
 
                                 current_speaker = None
                                 current_speakers = []
-                                current_text = ""
+                                current_text = []
                             else:
                                 if current_speaker.name not in [
                                     cs.name for cs in current_speakers
@@ -256,7 +300,7 @@ class Parser:
 
                         if not current_speakers:
                             continue
-                        current_text = current_text + " " + ele.text
+                        current_text.append(ele.text)
 
     def parse_html(self) -> List[TranscriptChunk]:
         self.iterate_elements()
@@ -0,0 +1,99 @@
+"""
+Per-transcript parse time for each Parser mode, and whether the fast modes
+produce the same chunks as the full parse.
+
+Runs over stored HTML (whichever HTML_STORAGE selects), or over the test
+pages in testdata/parser when nothing is stored. Times Parser.from_html plus
+chunking; token counting is left out, since it only sees chunk text and
+costs the same in every mode.
+
+Usage (from scraper/): python scripts/bench_parser.py [--limit 200] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from parser import Parser  # noqa: E402
+from utils.storage import TranscriptKey, get_storage  # noqa: E402
+
+MODES = ["full", "fast", "lxml"]
+
+
+def load_pages(data_root: str, limit: int) -> List[Tuple[TranscriptKey, str]]:
+    pages = []
+    for tk, html in get_storage(data_root).scan():
+        pages.append((tk, html))
+        if len(pages) >= limit:
+            return pages
+    if not pages:
+        print("No stored HTML found; using testdata/parser pages.")
+        for path in sorted((project_root / "testdata" / "parser").glob("*.html")):
+            pages.append((TranscriptKey.from_slug(path.stem), path.read_text()))
+    return pages
+
+
+def parse(tk: TranscriptKey, html: str, mode: str) -> List[dict]:
+    parser = Parser.from_html(html, tk, "", mode)
+    parser.iterate_elements()
+    return [c.model_dump() for c in parser.chunks]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark Parser modes")
+    arg_parser.add_argument("--data_root", default=str(project_root / "data"))
+    arg_parser.add_argument("--limit", type=int, default=200)
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="Parses per transcript and mode"
+    )
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.data_root, args.limit)
+    size = sum(len(html) for _, html in pages) / len(pages)
+    print(f"{len(pages)} transcripts, {size / 1000:.0f} KB of HTML on average\n")
+
+    timings: Dict[str, List[float]] = {mode: [] for mode in MODES}
+    mismatched: Dict[str, List[str]] = {mode: [] for mode in MODES}
+    failed = set()
+    for tk, html in pages:
+        try:
+            expected = parse(tk, html, "full")
+        except Exception:
+            failed.add(tk.slug())
+            continue
+        for mode in MODES:
+            runs = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                chunks = parse(tk, html, mode)
+                runs.append(time.perf_counter() - started)
+            timings[mode].append(min(runs))
+            if chunks != expected:
+                mismatched[mode].append(tk.slug())
+
+    baseline = statistics.median(timings["full"])
+    print(f"{'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8} {'mismatches':>11}")
+    for mode in MODES:
+        ts = sorted(timings[mode])
+        p50 = statistics.median(ts)
+        p95 = ts[min(len(ts) - 1, int(len(ts) * 0.95))]
+        print(
+            f"{mode:<6} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} "
+            f"{baseline / p50:>7.2f}x {len(mismatched[mode]):>11}"
+        )
+    if failed:
+        print(f"\n{len(failed)} transcripts don't parse in full mode; skipped.")
+    for mode in MODES:
+        for slug in mismatched[mode]:
+            print(f"⚠️ {mode} output differs for {slug}")
+
+
+if __name__ == "__main__":
+    main()
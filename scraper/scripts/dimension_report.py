@@ -0,0 +1,172 @@
+"""
+Recall-versus-latency report for Matryoshka-truncated embedding widths.
+
+For every golden query we pull a candidate pool (top `--pool` matches, with
+values) from the full-width index and merge the pools into one shared corpus.
+Each width is then evaluated by truncating and re-normalizing both the corpus
+and the query vectors (which is what `dimensions=` returns from the API),
+brute-forcing the top-k, and measuring recall@k against the full-width top-k.
+
+Live query latency per width is measured for any `--host WIDTH=URL` given,
+e.g. `--host 512=https://transcripts-v2-512d-xxxx.svc.pinecone.io`.
+
+Usage (from /scraper): python scripts/dimension_report.py --widths 1536 1024 512 256
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from datetime import datetime
+from dotenv import load_dotenv
+from openai import OpenAI
+from pathlib import Path
+from pinecone import Pinecone
+
+from common.embedding import EMBEDDING_MODEL, FULL_EMBEDDING_DIMENSIONS
+
+load_dotenv(dotenv_path=".env", override=False)
+load_dotenv(dotenv_path=".env.local", override=True)
+
+project_root = Path(__file__).resolve().parent.parent
+FULL_INDEX_HOST = "https://transcripts-v2-e38g0na.svc.aped-4627-b74a.pinecone.io"
+
+
+def truncate(vectors: np.ndarray, width: int) -> np.ndarray:
+    shortened = vectors[:, :width]
+    norms = np.linalg.norm(shortened, axis=1, keepdims=True)
+    return shortened / np.where(norms == 0, 1, norms)
+
+
+def top_k(queries: np.ndarray, corpus: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ corpus.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def percentile_ms(samples: list[float], q: float) -> float:
+    return float(np.percentile(np.array(samples) * 1000, q)) if samples else None
+
+
+def build_corpus(index, query_vectors: np.ndarray, pool: int):
+    ids, values = [], []
+    seen = set()
+    for q in query_vectors:
+        result = index.query(
+            vector=q.tolist(), top_k=pool, include_values=True, include_metadata=False
+        )
+        for match in result.matches:
+            if match.id in seen:
+                continue
+            seen.add(match.id)
+            ids.append(match.id)
+            values.append(match.values)
+    return ids, np.asarray(values, dtype=np.float32)
+
+
+def live_latency(host: str, query_vectors: np.ndarray, k: int, repeats: int):
+    pc = Pinecone(api_key=os.getenv("PINECONE_DEFAULT_API_KEY"))
+    index = pc.Index(host=host)
+    samples = []
+    for _ in range(repeats):
+        for q in query_vectors:
+            start = time.perf_counter()
+            index.query(vector=q.tolist(), top_k=k, include_metadata=False)
+            samples.append(time.perf_counter() - start)
+    return {
+        "p50_ms": percentile_ms(samples, 50),
+        "p95_ms": percentile_ms(samples, 95),
+        "queries": len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--queries",
+        default=str(project_root / "scripts" / "golden_queries.json"),
+        help="JSON list of golden queries",
+    )
+    parser.add_argument("--widths", type=int, nargs="+", default=[1536, 1024, 512, 256])
+    parser.add_argument("--k", type=int, default=8, help="Results per query")
+    parser.add_argument("--pool", type=int, default=100, help="Candidates per query")
+    parser.add_argument(
+        "--host",
+        action="append",
+        default=[],
+        help="WIDTH=URL of an index at that width, for live latency",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    oai_client = OpenAI()
+    response = oai_client.embeddings.create(input=queries, model=EMBEDDING_MODEL)
+    query_vectors = np.asarray(
+        [d.embedding for d in sorted(response.data, key=lambda d: d.index)],
+        dtype=np.float32,
+    )
+
+    pc = Pinecone(api_key=os.getenv("PINECONE_DEFAULT_API_KEY"))
+    full_index = pc.Index(host=os.getenv("PINECONE_HOST_URL", FULL_INDEX_HOST))
+    ids, corpus = build_corpus(full_index, query_vectors, args.pool)
+    print(f"📚 Corpus: {len(ids)} candidate chunks from {len(queries)} queries")
+
+    truth = top_k(
+        truncate(query_vectors, FULL_EMBEDDING_DIMENSIONS),
+        truncate(corpus, FULL_EMBEDDING_DIMENSIONS),
+        args.k,
+    )
+    hosts = dict(h.split("=", 1) for h in args.host)
+
+    results = []
+    for width in args.widths:
+        q, c = truncate(query_vectors, width), truncate(corpus, width)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            found = top_k(q, c, args.k)
+            timings.append((time.perf_counter() - start) / len(queries))
+        recalls = [
+            len(set(found[i]) & set(truth[i])) / args.k for i in range(len(queries))
+        ]
+        row = {
+            "width": width,
+            "recall_at_k": float(np.mean(recalls)),
+            "min_recall_at_k": float(np.min(recalls)),
+            "bytes_per_vector": width * 4,
+            "brute_force_ms_per_query": percentile_ms(timings, 50),
+        }
+        if str(width) in hosts:
+            row["live"] = live_latency(hosts[str(width)], q, args.k, args.repeats)
+        results.append(row)
+        print(
+            f"  {width:5d}d  recall@{args.k}={row['recall_at_k']:.3f}  "
+            f"min={row['min_recall_at_k']:.3f}  "
+            f"{row['bytes_per_vector']:5d} B/vec  "
+            f"{row['brute_force_ms_per_query']:.3f} ms/query"
+        )
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "model": EMBEDDING_MODEL,
+        "k": args.k,
+        "pool": args.pool,
+        "num_queries": len(queries),
+        "corpus_size": len(ids),
+        "results": results,
+    }
+    Path("data/logs").mkdir(parents=True, exist_ok=True)
+    ts = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
+    path = Path(f"data/logs/dimension_report_{ts}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Saved dimension report to {path}")
+
+
+if __name__ == "__main__":
+    main()
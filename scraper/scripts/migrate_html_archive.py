@@ -0,0 +1,73 @@
+"""
+Copy every transcript from the per-file layout (data/html/<company>/*.html)
+into the packed archive (data/archive/), checking each one reads back
+identically. The original files are left in place; once the pipeline runs
+with HTML_STORAGE=archive they can be removed.
+
+Usage (from scraper/): python scripts/migrate_html_archive.py [--dry_run]
+"""
+
+import argparse
+import sys
+
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.storage import ArchiveStorage, LocalStorage  # noqa: E402
+
+
+def migrate(data_root: str, dry_run: bool = False) -> dict:
+    local = LocalStorage(data_root)
+    archive = None if dry_run else ArchiveStorage(data_root)
+    stats = {"migrated": 0, "already_archived": 0, "mismatched": [], "html_bytes": 0}
+    try:
+        for tk, html in local.scan():
+            stats["html_bytes"] += len(html.encode("utf-8"))
+            if archive is None:
+                stats["migrated"] += 1
+                continue
+            if tk in archive and archive.read_html(tk) == html:
+                stats["already_archived"] += 1
+                continue
+            archive.write_html(tk, html)
+            if archive.read_html(tk) != html:
+                stats["mismatched"].append(tk.slug())
+            else:
+                stats["migrated"] += 1
+    finally:
+        if archive is not None:
+            archive.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack stored HTML into an archive")
+    parser.add_argument("--data_root", default=str(project_root / "data"))
+    parser.add_argument(
+        "--dry_run",
+        action="store_true",
+        help="Count what would be migrated without writing the archive",
+    )
+    args = parser.parse_args()
+
+    stats = migrate(args.data_root, dry_run=args.dry_run)
+    packs = sorted(Path(args.data_root, "archive").glob("pack-*.zst"))
+    packed_bytes = sum(p.stat().st_size for p in packs)
+    print(
+        f"{'Would migrate' if args.dry_run else 'Migrated'} {stats['migrated']} "
+        f"transcripts ({stats['already_archived']} already archived)."
+    )
+    print(f"HTML: {stats['html_bytes'] / 1e6:.1f} MB")
+    if not args.dry_run:
+        print(f"Archive: {packed_bytes / 1e6:.1f} MB in {len(packs)} pack file(s)")
+    if stats["mismatched"]:
+        print(f"⚠️ {len(stats['mismatched'])} transcripts didn't read back intact:")
+        for slug in stats["mismatched"]:
+            print(f"  - {slug}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
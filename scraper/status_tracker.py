@@ -1,4 +1,6 @@
 import json
+
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict
 from utils.storage import TranscriptKey
@@ -66,11 +68,42 @@ class StatusTracker:
         if self.autosave:
             self._save()
 
+    def mark_unchanged(self, slug: str):
+        """A refetch found the same HTML, so parse/embed results still hold."""
+        self.update(slug, "html_unchanged", True)
+
+    def mark_changed(self, slug: str):
+        """A refetch found new HTML; it has to be parsed and embedded again."""
+        if slug not in self.data:
+            raise ValueError(f"Slug not found: {slug}")
+        self.data[slug]["parsed"] = False
+        self.data[slug]["embedded"] = False
+        self.update(slug, "html_unchanged", False)
+
+    @contextmanager
+    def batched(self):
+        """Hold off autosaving until the block ends, then save once."""
+        autosave, self.autosave = self.autosave, False
+        try:
+            yield self
+        finally:
+            self.autosave = autosave
+            if autosave:
+                self._save()
+
     def filter_for(self, step: str, status: bool = False) -> list:
         return [
             slug for slug, fields in self.data.items() if fields.get(step) == status
         ]
 
+    def set_highlight(self, slug: str, template_id: str, record: dict):
+        # Not autosaved: highlights are written in bulk, call save() per batch
+        self.data[slug].setdefault("highlights", {})[template_id] = record
+        self._dirty = True
+
+    def get_highlights(self, slug: str) -> dict:
+        return self.data[slug].get("highlights", {})
+
     def get_url(self, slug: str) -> str:
         return self.data[slug]["url"]
 
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import sys
+import pytest
+
+from pathlib import Path
+
+# html_fetcher.py imports its siblings as top-level modules, as it does under main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from html_fetcher import AsyncHTMLFetcher  # noqa: E402
+from status_tracker import StatusTracker  # noqa: E402
+from utils.politeness import PermanentFetchError  # noqa: E402
+from utils.storage import TranscriptKey  # noqa: E402
+
+BASE = "https://www.fool.com/earnings/call-transcripts/2024/11/20"
+GOOD = f"{BASE}/nvidia-nvda-q3-2025-earnings-call-transcript/"
+UNDECODABLE = f"{BASE}/walmart-wmt-q3-2025-earnings-call-transcript/"
+UNWRITABLE = f"{BASE}/target-tgt-q3-2024-earnings-call-transcript/"
+MISSING = f"{BASE}/apple-aapl-q4-2024-earnings-call-transcript/"
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEFAULT_STORE_PATH", str(tmp_path / "url_store.json"))
+    monkeypatch.setenv("JSON_URLS_TO_SCRAPE", str(tmp_path / "urls_to_scrape.json"))
+    urls = [GOOD, UNDECODABLE, UNWRITABLE, MISSING]
+    st = StatusTracker(path=str(tmp_path / "manifest.json"))
+    for url in urls:
+        st.add(TranscriptKey.from_url(url), url)
+    f = AsyncHTMLFetcher(st, urls, data_root=str(tmp_path))
+
+    async def get(session, url):
+        if url == UNDECODABLE:
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        if url == MISSING:
+            raise PermanentFetchError("HTTP 404", 404)
+        return "<html>transcript</html>", {}
+
+    write_html = f.storage.write_html
+
+    def flaky_write(tk, html):
+        if tk.company == "tgt":
+            raise OSError("No space left on device")
+        write_html(tk, html)
+
+    monkeypatch.setattr(f, "get", get)
+    monkeypatch.setattr(f.storage, "write_html", flaky_write)
+    return f
+
+
+def test_one_bad_url_does_not_abort_the_run(fetcher, tmp_path):
+    asyncio.run(fetcher.fetch_async())
+
+    report = fetcher.get_report()
+    assert report["fetched"] == [GOOD]
+    assert set(report["failed"]) == {UNDECODABLE, UNWRITABLE, MISSING}
+    assert {d["url"] for d in report["dead_letters"]} == set(report["failed"])
+    assert report["total_urls"] == 4
+    assert "ended_at" in report
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["nvda-q3-2025"]["html_saved"] is True
+    assert manifest["tgt-q3-2024"]["html_saved"] is False
+    assert "No space left" in manifest["tgt-q3-2024"]["failed_at_step"]
+    assert "invalid start byte" in manifest["wmt-q3-2025"]["failed_at_step"]
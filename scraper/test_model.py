@@ -0,0 +1,40 @@
+import pickle
+
+from .model import Speaker, TranscriptChunk
+
+
+def make_chunk() -> TranscriptChunk:
+    ceo = Speaker(name="Jensen Huang", type="executive", role="CEO")
+    analyst = Speaker(name="Vivek Arya", type="analyst", role="Analyst")
+    chunk = TranscriptChunk(
+        chunk_id="nvda-q3-2025-qa-4",
+        url="https://www.fool.com/earnings/call-transcripts/2024/11/20/nvda/",
+        section="qa",
+        company="nvda",
+        quarter="q3",
+        year="2025",
+        call_ts="2024-11-20T17:00:00-05:00",
+        text=" Demand for Blackwell is incredible.",
+        snippet="Demand for Blackwell is incredible.",
+        primary_speakers=[ceo],
+        participants=[analyst, ceo],
+    )
+    chunk.start_token = 120
+    chunk.end_token = 127
+    return chunk
+
+
+def test_payload_roundtrip():
+    chunk = make_chunk()
+    payload = pickle.loads(pickle.dumps(chunk.to_payload()))
+    rebuilt = TranscriptChunk.from_payload(payload)
+    assert rebuilt == chunk
+    assert rebuilt.model_dump() == chunk.model_dump()
+    assert rebuilt.transcript_key_slug() == "nvda-q3-2025"
+
+
+def test_payload_is_plain_data():
+    payload = make_chunk().to_payload()
+    assert isinstance(payload, tuple)
+    # Unpickling it needs no project classes
+    assert b"model" not in pickle.dumps(payload)
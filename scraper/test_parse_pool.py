@@ -0,0 +1,122 @@
+import json
+import sys
+import pytest
+
+from pathlib import Path
+
+# parse_pool.py imports its siblings as top-level modules, as it does under main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import parse_pool  # noqa: E402
+from parse_pool import parse_transcripts, record_parsed  # noqa: E402
+from parser import Parser  # noqa: E402
+from status_tracker import StatusTracker  # noqa: E402
+from utils.storage import LocalStorage, TranscriptKey  # noqa: E402
+
+TESTDATA = Path(__file__).resolve().parent / "testdata" / "parser"
+PAGES = sorted(p.stem for p in TESTDATA.glob("*.html"))
+# Out of alphabetical order, with a page that has no Q&A section and a
+# transcript that was never stored
+SLUGS = ["wmt-q4-2023", "nvda-q3-2025", "aapl-q1-2020", "acme-q1-2024"]
+
+
+def golden(slug: str) -> dict:
+    return json.loads((TESTDATA / f"{slug}.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def offline_parser(tmp_path, monkeypatch):
+    # As in test_parser.py; forked workers inherit the patch and the cwd
+    monkeypatch.setattr(Parser, "tokenize", staticmethod(str.split))
+    monkeypatch.setenv("PARSER_MODE", "full")
+    monkeypatch.setenv("HTML_STORAGE", "local")
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def st(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    tracker = StatusTracker(path=str(tmp_path / "manifest.json"))
+    for slug in SLUGS:
+        tk = TranscriptKey.from_slug(slug)
+        tracker.add(tk, f"https://www.fool.com/{slug}/")
+        if slug in PAGES:
+            html = (TESTDATA / f"{slug}.html").read_text(encoding="utf-8")
+            storage.write_html(tk, html)
+    return tracker
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_come_back_in_order(st, tmp_path, workers):
+    results = list(parse_transcripts(st, SLUGS, workers, data_root=str(tmp_path)))
+
+    assert [r.slug for r in results] == SLUGS
+    by_slug = {r.slug: r for r in results}
+    for slug in (p.stem for p in TESTDATA.glob("*.json")):
+        assert by_slug[slug].error is None
+        assert by_slug[slug].call_ts == golden(slug)["call_ts"]
+        chunks = [c.model_dump() for c in by_slug[slug].to_chunks()]
+        assert chunks == golden(slug)["chunks"]
+    assert by_slug["wmt-q4-2023"].error == "Format not implemented"
+    assert by_slug["aapl-q1-2020"].error is not None
+    assert by_slug["aapl-q1-2020"].chunks == []
+
+
+def test_workers_default_to_env_read_at_call_time(monkeypatch):
+    monkeypatch.setenv("PARSE_WORKERS", "3")
+    assert parse_pool.default_workers() == 3
+    monkeypatch.setenv("PARSE_WORKERS", "0")
+    assert parse_pool.default_workers() >= 1
+
+
+def test_record_parsed_marks_and_saves_once(st, tmp_path, monkeypatch):
+    saves = []
+    save = st._save
+    monkeypatch.setattr(st, "_save", lambda: saves.append(1) or save())
+    results = parse_transcripts(st, SLUGS, 2, data_root=str(tmp_path))
+
+    chunks = record_parsed(st, results)
+
+    assert len(saves) == 1
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    for slug in (p.stem for p in TESTDATA.glob("*.json")):
+        assert manifest[slug]["parsed"] is True
+        assert manifest[slug]["call_ts"] == golden(slug)["call_ts"]
+    for slug in ("wmt-q4-2023", "aapl-q1-2020"):
+        assert manifest[slug]["parsed"] is False
+        assert manifest[slug]["failed_at_step"].startswith("parsed: ")
+    assert len(chunks) == sum(
+        len(golden(p.stem)["chunks"]) for p in TESTDATA.glob("*.json")
+    )
+
+
+def test_record_parsed_dry_run_leaves_manifest_alone(st, tmp_path):
+    before = (tmp_path / "manifest.json").read_text()
+    results = parse_transcripts(st, SLUGS, 1, data_root=str(tmp_path))
+    chunks = record_parsed(st, results, dry_run=True)
+    assert chunks
+    assert (tmp_path / "manifest.json").read_text() == before
+    assert not any(fields["parsed"] for fields in st.data.values())
+
+
+def test_batched_saves_once_at_the_end(tmp_path):
+    path = tmp_path / "manifest.json"
+    tracker = StatusTracker(path=str(path))
+    tracker.add(TranscriptKey.from_slug("nvda-q3-2025"), "https://www.fool.com/")
+    with tracker.batched():
+        tracker.mark_success("nvda-q3-2025", "parsed")
+        on_disk = json.loads(path.read_text())
+        assert on_disk["nvda-q3-2025"]["parsed"] is False
+    assert json.loads(path.read_text())["nvda-q3-2025"]["parsed"] is True
+    assert tracker.autosave is True
+
+
+def test_batched_saves_even_when_the_block_raises(tmp_path):
+    path = tmp_path / "manifest.json"
+    tracker = StatusTracker(path=str(path))
+    tracker.add(TranscriptKey.from_slug("nvda-q3-2025"), "https://www.fool.com/")
+    with pytest.raises(RuntimeError):
+        with tracker.batched():
+            tracker.mark_success("nvda-q3-2025", "parsed")
+            raise RuntimeError("worker died")
+    assert json.loads(path.read_text())["nvda-q3-2025"]["parsed"] is True
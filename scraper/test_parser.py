@@ -0,0 +1,100 @@
+import json
+import sys
+import pytest
+
+from pathlib import Path
+
+# parser.py imports its siblings as top-level modules, as it does under main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from exceptions import (  # noqa: E402
+    PageFormatNotImplementedException,
+    ParserInitializationError,
+)
+from parser import Parser, TranscriptStrainer, classify_speaker  # noqa: E402
+from utils.storage import TranscriptKey  # noqa: E402
+
+# Synthetic pages shaped like fool.com transcripts, each with the chunks the
+# html.parser parser produced for it before the fast modes were added
+TESTDATA = Path(__file__).resolve().parent / "testdata" / "parser"
+GOLDEN_SLUGS = sorted(p.stem for p in TESTDATA.glob("*.json"))
+MODES = ["full", "fast", "lxml"]
+
+
+@pytest.fixture(autouse=True)
+def offline_parser(tmp_path, monkeypatch):
+    # tiktoken downloads its encoding on first use; the goldens were made
+    # with whitespace tokens. Unhandled titles are logged under the cwd.
+    monkeypatch.setattr(Parser, "tokenize", staticmethod(str.split))
+    monkeypatch.chdir(tmp_path)
+
+
+def parse(slug: str, mode: str) -> Parser:
+    html = (TESTDATA / f"{slug}.html").read_text(encoding="utf-8")
+    return Parser.from_html(
+        html, TranscriptKey.from_slug(slug), f"https://www.fool.com/{slug}/", mode
+    )
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("slug", GOLDEN_SLUGS)
+def test_chunks_match_golden(slug, mode):
+    golden = json.loads((TESTDATA / f"{slug}.json").read_text(encoding="utf-8"))
+    parser = parse(slug, mode)
+    chunks = parser.parse_html()
+    assert parser.timestamp == golden["call_ts"]
+    assert [c.model_dump() for c in chunks] == golden["chunks"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_page_without_qa_is_rejected(mode):
+    with pytest.raises(PageFormatNotImplementedException):
+        parse("wmt-q4-2023", mode).parse_html()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_page_without_article_body_is_rejected(mode):
+    with pytest.raises(ParserInitializationError):
+        Parser.from_html(
+            "<html><body><p>Page not found</p></body></html>",
+            TranscriptKey("nvda", "q3", 2025),
+            "https://www.fool.com/",
+            mode,
+        )
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ParserInitializationError, match="PARSER_MODE"):
+        parse("nvda-q3-2025", "regex")
+
+
+def test_strained_tree_keeps_only_what_parser_reads():
+    soup = parse("nvda-q3-2025", "fast").soup
+    assert soup.find("script") is None and soup.find("nav") is None
+    assert [t.name for t in soup.contents if t.name] == ["span", "em", "div"]
+
+
+def test_unlisted_executive_title_is_logged():
+    parse("acme-q1-2024", "fast").parse_html()
+    logged = Path("data/unhandled_titles.txt").read_text(encoding="utf-8")
+    assert logged.startswith("marcus bell -- chief revenue officer")
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (
+            "jensen huang -- president and chief executive officer",
+            ("executive", "President"),
+        ),
+        ("sam lee -- bernstein -- analyst", ("analyst", "Analyst")),
+        (
+            "dana whitfield -- head of investor relations",
+            ("investor relations", "Investor Relations"),
+        ),
+        ("marcus bell -- chief revenue officer", ("executive", None)),
+        ("jordan park -- board member", ("other", "")),
+    ],
+)
+def test_classify_speaker(line, expected):
+    assert classify_speaker(line) == expected
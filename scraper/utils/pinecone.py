@@ -1,21 +1,30 @@
 from pinecone import Pinecone, ServerlessSpec
 from tqdm import tqdm
 
+from common.embedding import (
+    EMBEDDING_DIMENSIONS,
+    FULL_EMBEDDING_DIMENSIONS,
+    index_name_for,
+)
+
+DEFAULT_INDEX_HOST = "https://transcripts-v2-e38g0na.svc.aped-4627-b74a.pinecone.io"
+
 
 def get_index(pc: Pinecone):
-    index_name = "transcripts-v2"
+    index_name = index_name_for("transcripts-v2")
     if not pc.has_index(index_name):
         print("Index not found, creating new")
         pc.create_index(
             name=index_name,
             vector_type="dense",
-            dimension=1536,
+            dimension=EMBEDDING_DIMENSIONS,
             metric="cosine",
             spec=ServerlessSpec(cloud="aws", region="us-east-1"),
             deletion_protection="disabled",
             tags={"environment": "development"},
         )
-    index = pc.Index(
-        host="https://transcripts-v2-e38g0na.svc.aped-4627-b74a.pinecone.io"
-    )
+    if EMBEDDING_DIMENSIONS != FULL_EMBEDDING_DIMENSIONS:
+        # Reduced-width indexes are resolved by name rather than the pinned host
+        return pc.Index(name=index_name)
+    index = pc.Index(host=DEFAULT_INDEX_HOST)
     return index
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import random
+
+from aiolimiter import AsyncLimiter
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Requests per minute to any one host; the old blind sleeps averaged ~22
+FETCH_HOST_RPM = float(os.getenv("FETCH_HOST_RPM", "20"))
+# Requests in flight across all hosts
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+FETCH_MAX_ATTEMPTS = int(os.getenv("FETCH_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE_S = 2.0
+BACKOFF_CAP_S = 60.0
+
+# Throttling and server-side errors are worth another try; anything else
+# (404, 410, 403...) won't change by asking again
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class PermanentFetchError(Exception):
+    """A fetch that failed in a way retrying won't fix."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RetryableFetchError(Exception):
+    """A fetch that may succeed later; `retry_after` is the server's hint."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def is_retryable(status: int) -> bool:
+    return status in RETRYABLE_STATUSES
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header; the HTTP-date form is ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE_S,
+    cap: float = BACKOFF_CAP_S,
+    rng: random.Random = random,
+) -> float:
+    """
+    "Full jitter" exponential backoff for the given (0-based) retry: a random
+    delay up to base * 2**attempt, capped. The randomness keeps retries of
+    URLs that failed together from hitting the host together again.
+    """
+    return rng.uniform(0, min(cap, base * 2**attempt))
+
+
+class HostScheduler:
+    """
+    Politeness budget per host: a token bucket allowing `rpm` requests a
+    minute to each host (with no burst), shared by every task fetching from
+    it. Replaces sleeping a random 1.5-4 s before every request, so
+    requests to different hosts and retries don't wait on each other.
+    """
+
+    def __init__(self, rpm: float = FETCH_HOST_RPM):
+        self.rpm = rpm
+        self._limiters: Dict[str, AsyncLimiter] = {}
+
+    def limiter(self, url: str) -> AsyncLimiter:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._limiters:
+            # One token a slot, so requests are spaced evenly rather than bursty
+            self._limiters[host] = AsyncLimiter(max_rate=1, time_period=60 / self.rpm)
+        return self._limiters[host]
+
+    async def wait(self, url: str):
+        await self.limiter(url).acquire()
+
+
+async def sleep_before_retry(attempt: int, error: RetryableFetchError):
+    delay = backoff_delay(attempt)
+    if error.retry_after is not None:
+        delay = max(delay, error.retry_after)
+    await asyncio.sleep(delay)
@@ -8,10 +8,15 @@ def print_run_report(report):
     print("\n📊 Ingestion Report")
     print(f"  Total URLs: {report['total_urls']}")
     print(f"  ✅ Fetched: {len(report['fetched'])}")
+    if "unchanged" in report:
+        print(f"  🟰 Unchanged: {len(report['unchanged'])}")
     print(f"  ⏭️  Skipped: {len(report['skipped'])}")
     print(f"  ❌ Failed : {len(report['failed'])}")
     print(f"  ⏱️  Duration: {report['runtime_seconds']:.2f}s")
 
+    if report.get("dead_letters"):
+        print(f"  🪦 Dead letters: {len(report['dead_letters'])}")
+
     if report["failed"]:
         print("\n❌ Failures:")
         for url, err in report["failed"].items():
@@ -0,0 +1,44 @@
+import hashlib
+
+from typing import Dict, Mapping, Optional
+
+# Both clients decode these transparently
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def conditional_headers(entry: Optional[dict]) -> Dict[str, str]:
+    """
+    Request headers for refetching a URL whose URL store entry is `entry`:
+    the validators from the last fetch, so an unchanged page comes back as
+    a bodiless 304.
+    """
+    headers = {"Accept-Encoding": ACCEPT_ENCODING}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def response_validators(headers: Mapping[str, str]) -> Dict[str, str]:
+    """ETag and Last-Modified from a response, for the URL store entry."""
+    validators = {}
+    if headers.get("ETag"):
+        validators["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validators["last_modified"] = headers["Last-Modified"]
+    return validators
+
+
+def is_unchanged(entry: Optional[dict], html: str) -> bool:
+    """
+    Whether `html` is what was stored last time. Catches servers that ignore
+    the conditional headers and send the same page with a 200.
+    """
+    return bool(entry) and entry.get("content_hash") == content_hash(html)
@@ -1,7 +1,16 @@
+import json
+import mmap
 import os
 import re
+import threading
+import zstandard
 
 from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+ARCHIVE_ZSTD_LEVEL = 10
+# A new pack is started once the current one reaches this size
+PACK_MAX_BYTES = 256 * 1024 * 1024
 
 
 class TranscriptKey:
@@ -51,6 +60,10 @@ class Storage:
     def read_html(self, tk: TranscriptKey) -> str:
         pass
 
+    def scan(self) -> Iterator[Tuple[TranscriptKey, str]]:
+        """Every stored transcript, in the order cheapest to read."""
+        pass
+
 
 class LocalStorage(Storage):
     def __init__(self, data_root: str = "data"):
@@ -67,3 +80,130 @@ class LocalStorage(Storage):
         path = Path(tk.to_path(self.data_root))
         with open(path, "r", encoding="utf-8") as f:
             return f.read()
+
+    def scan(self) -> Iterator[Tuple[TranscriptKey, str]]:
+        for path in sorted(Path(self.data_root, "html").glob("*/*.html")):
+            tk = TranscriptKey.from_path(str(path))
+            yield tk, self.read_html(tk)
+
+
+class PackEntry(NamedTuple):
+    pack: int
+    offset: int
+    length: int
+
+
+class ArchiveStorage(Storage):
+    """
+    Transcripts as zstd frames appended to a few large pack files under
+    `<data_root>/archive/`, instead of one HTML file each. An append-only
+    index log (`index.jsonl`) maps each slug to its pack, offset and length;
+    rewriting a transcript appends a new frame and a new log line, and the
+    last line for a slug wins.
+
+    Reads go through a memory map per pack, so a lookup is a slice and a
+    decompress with no open/read/close. `scan` walks the packs in file
+    order, which turns a full-corpus pass into sequential reads.
+    """
+
+    def __init__(self, data_root: str = "data", level: Optional[int] = None):
+        super().__init__()
+        # Read here rather than at import, after the entrypoint loads .env
+        level = level or int(os.getenv("ARCHIVE_ZSTD_LEVEL", ARCHIVE_ZSTD_LEVEL))
+        self.root = Path(data_root, "archive")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.jsonl"
+        self.entries: Dict[str, PackEntry] = self._load_index()
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._maps: Dict[int, Tuple[object, mmap.mmap]] = {}
+        # Steps read from thread pools; remapping a grown pack isn't atomic
+        self._lock = threading.Lock()
+        self._stale: list = []
+        self._pack = self._last_pack()
+
+    def _load_index(self) -> Dict[str, PackEntry]:
+        entries = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    entries[record["slug"]] = PackEntry(
+                        record["pack"], record["offset"], record["length"]
+                    )
+        return entries
+
+    def pack_path(self, pack: int) -> Path:
+        return self.root / f"pack-{pack:05d}.zst"
+
+    def _last_pack(self) -> int:
+        packs = [int(p.stem.split("-")[1]) for p in self.root.glob("pack-*.zst")]
+        return max(packs, default=0)
+
+    def __contains__(self, tk: TranscriptKey) -> bool:
+        return tk.slug() in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def write_html(self, tk: TranscriptKey, html: str):
+        frame = self._compressor.compress(html.encode("utf-8"))
+        with open(self.pack_path(self._pack), "ab") as f:
+            offset = f.tell()
+            f.write(frame)
+        entry = PackEntry(self._pack, offset, len(frame))
+        if offset + len(frame) >= PACK_MAX_BYTES:
+            self._pack += 1
+        # The frame is written before the log line that points at it, so a
+        # crash in between leaves only unreferenced bytes
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"slug": tk.slug(), **entry._asdict()}) + "\n")
+        self.entries[tk.slug()] = entry
+
+    def _map(self, pack: int, end: int) -> mmap.mmap:
+        cached = self._maps.get(pack)
+        if cached is None or len(cached[1]) < end:
+            # Not mapped yet, or the pack has grown since it was mapped. The
+            # old map stays open for readers still slicing it.
+            f = open(self.pack_path(pack), "rb")
+            cached = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self._stale.extend(self._maps.get(pack, ()))
+            self._maps[pack] = cached
+        return cached[1]
+
+    def read_entry(self, entry: PackEntry) -> str:
+        with self._lock:
+            mm = self._map(entry.pack, entry.offset + entry.length)
+        frame = mm[entry.offset : entry.offset + entry.length]
+        return zstandard.ZstdDecompressor().decompress(frame).decode("utf-8")
+
+    def read_html(self, tk: TranscriptKey) -> str:
+        entry = self.entries.get(tk.slug())
+        if entry is None:
+            raise FileNotFoundError(f"{tk.slug()} is not in the archive")
+        return self.read_entry(entry)
+
+    def scan(self) -> Iterator[Tuple[TranscriptKey, str]]:
+        ordered = sorted(self.entries.items(), key=lambda item: item[1])
+        for slug, entry in ordered:
+            yield TranscriptKey.from_slug(slug), self.read_entry(entry)
+
+    def close(self):
+        for f, mm in self._maps.values():
+            mm.close()
+            f.close()
+        for handle in self._stale:
+            handle.close()
+        self._maps = {}
+        self._stale = []
+
+
+def get_storage(data_root: str = "data", kind: Optional[str] = None) -> Storage:
+    """The HTML store selected by `HTML_STORAGE` ("local" or "archive")."""
+    kind = kind or os.getenv("HTML_STORAGE", "local")
+    if kind == "archive":
+        return ArchiveStorage(data_root)
+    if kind == "local":
+        return LocalStorage(data_root)
+    raise ValueError(f"Unknown HTML_STORAGE {kind!r}")
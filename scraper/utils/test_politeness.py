@@ -0,0 +1,59 @@
+import asyncio
+import random
+import time
+
+from scraper.utils.politeness import (
+    HostScheduler,
+    RetryableFetchError,
+    backoff_delay,
+    is_retryable,
+    parse_retry_after,
+    sleep_before_retry,
+)
+
+
+def test_backoff_is_jittered_and_capped():
+    rng = random.Random(0)
+    delays = [backoff_delay(3, base=1, cap=5, rng=rng) for _ in range(200)]
+    assert all(0 <= d <= 5 for d in delays)
+    assert len(set(delays)) == len(delays)
+    assert all(0 <= backoff_delay(0, base=1, rng=rng) <= 1 for _ in range(50))
+
+
+def test_retryable_statuses():
+    assert is_retryable(429) and is_retryable(503)
+    assert not is_retryable(404) and not is_retryable(403)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_scheduler_spaces_requests_per_host():
+    scheduler = HostScheduler(rpm=600)  # one request per 0.1s per host
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(
+            *(scheduler.wait("https://www.fool.com/a") for _ in range(3)),
+            scheduler.wait("https://example.com/b"),
+        )
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.18 <= elapsed < 0.5
+    assert len(scheduler._limiters) == 2
+
+
+def test_retry_waits_at_least_retry_after(monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    error = RetryableFetchError("HTTP 429", 429, retry_after=90)
+    asyncio.run(sleep_before_retry(0, error))
+    assert slept == [90]
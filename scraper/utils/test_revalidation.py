@@ -0,0 +1,34 @@
+from scraper.utils.revalidation import (
+    conditional_headers,
+    content_hash,
+    is_unchanged,
+    response_validators,
+)
+
+
+def test_conditional_headers_from_stored_validators():
+    entry = {"etag": '"abc"', "last_modified": "Wed, 01 May 2024 10:00:00 GMT"}
+    headers = conditional_headers(entry)
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Wed, 01 May 2024 10:00:00 GMT"
+    assert "gzip" in headers["Accept-Encoding"]
+
+
+def test_first_fetch_is_unconditional():
+    assert set(conditional_headers(None)) == {"Accept-Encoding"}
+    assert set(conditional_headers({"status": "fetched"})) == {"Accept-Encoding"}
+
+
+def test_response_validators_keep_only_present_headers():
+    assert response_validators({"ETag": 'W/"1"', "Content-Type": "text/html"}) == {
+        "etag": 'W/"1"'
+    }
+    assert response_validators({}) == {}
+
+
+def test_unchanged_compares_content_hash():
+    entry = {"content_hash": content_hash("<html>same</html>")}
+    assert is_unchanged(entry, "<html>same</html>")
+    assert not is_unchanged(entry, "<html>edited</html>")
+    assert not is_unchanged({}, "<html>same</html>")
+    assert not is_unchanged(None, "<html>same</html>")
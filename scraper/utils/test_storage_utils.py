@@ -1,4 +1,12 @@
-from scraper.utils.storage import TranscriptKey, LocalStorage
+import pytest
+
+from scraper.utils import storage
+from scraper.utils.storage import (
+    ArchiveStorage,
+    LocalStorage,
+    TranscriptKey,
+    get_storage,
+)
 
 
 def test_transcriptkey_conversions():
@@ -20,3 +28,50 @@ def test_localstorage_roundtrip(tmp_path):
     assert store.read_html(tk) == "hello"
     saved = tmp_path / "html" / "msft" / "q2-2023.html"
     assert saved.exists() and saved.read_text(encoding="utf-8") == "hello"
+
+
+def test_archive_roundtrip_and_reopen(tmp_path):
+    tk = TranscriptKey("NVDA", "Q3", 2025)
+    archive = ArchiveStorage(data_root=str(tmp_path))
+    archive.write_html(tk, "<html>first</html>")
+    archive.write_html(tk, "<html>second</html>")
+    assert archive.read_html(tk) == "<html>second</html>"
+    archive.close()
+
+    # The index log is replayed on open; the last write for a slug wins
+    reopened = ArchiveStorage(data_root=str(tmp_path))
+    assert len(reopened) == 1 and tk in reopened
+    assert reopened.read_html(tk) == "<html>second</html>"
+    with pytest.raises(FileNotFoundError):
+        reopened.read_html(TranscriptKey("AAPL", "Q1", 2024))
+    reopened.close()
+
+
+def test_archive_reads_pages_appended_after_mapping(tmp_path):
+    archive = ArchiveStorage(data_root=str(tmp_path))
+    first, second = TranscriptKey("A", "Q1", 2024), TranscriptKey("B", "Q1", 2024)
+    archive.write_html(first, "one")
+    assert archive.read_html(first) == "one"
+    archive.write_html(second, "two")
+    assert archive.read_html(second) == "two"
+    archive.close()
+
+
+def test_archive_rolls_over_packs_and_scans_in_file_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "PACK_MAX_BYTES", 1)
+    archive = ArchiveStorage(data_root=str(tmp_path))
+    keys = [TranscriptKey("MSFT", f"Q{q}", 2024) for q in (4, 1, 3)]
+    for tk in keys:
+        archive.write_html(tk, f"<html>{tk.slug()}</html>")
+    assert len(list((tmp_path / "archive").glob("pack-*.zst"))) == 3
+    assert [tk.slug() for tk, _ in archive.scan()] == [tk.slug() for tk in keys]
+    assert all(html == f"<html>{tk.slug()}</html>" for tk, html in archive.scan())
+    archive.close()
+
+
+def test_get_storage_picks_backend(tmp_path, monkeypatch):
+    assert isinstance(get_storage(str(tmp_path)), LocalStorage)
+    monkeypatch.setenv("HTML_STORAGE", "archive")
+    assert isinstance(get_storage(str(tmp_path)), ArchiveStorage)
+    with pytest.raises(ValueError):
+        get_storage(str(tmp_path), kind="s3")